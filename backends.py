@@ -0,0 +1,477 @@
+import configparser
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, time
+from functools import lru_cache
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+MIGRATIONS_DIR = BASE_DIR / 'migrations'
+
+
+class StorageBackend:
+    """
+    Interfața comună a motoarelor de stocare.
+
+    Funcțiile din `database.py` (registru, utilizatori, servicii, aprobări) scriu SQL
+    standard cu parametri `?`; backend-ul furnizează conexiunea și fragmentele care
+    diferă între motoare (data curentă, limitarea rezultatelor, renumerotarea NrCrt,
+    inserarea în lot, rularea migrărilor).
+    """
+
+    name = None
+
+    @property
+    def migrations_dir(self):
+        return MIGRATIONS_DIR / self.name
+
+    def connect(self):
+        """Deschide o conexiune nouă (folosită de pool)."""
+        raise NotImplementedError
+
+    def sql_now(self):
+        """Expresia SQL pentru data și ora curentă."""
+        raise NotImplementedError
+
+    def sql_limit(self):
+        """Clauza adăugată după ORDER BY pentru a limita rezultatul la `?` rânduri."""
+        raise NotImplementedError
+
+    def sql_versiune_curenta(self):
+        """
+        Interogarea care returnează versiunea registrului: orice modificare confirmată
+        ulterior va avea VersiuneRand mai mare decât această valoare.
+        """
+        raise NotImplementedError
+
+    def sql_conditie_versiune(self):
+        """Condiția care selectează rândurile cu VersiuneRand mai mare decât versiunea `?`."""
+        raise NotImplementedError
+
+    def sql_luna(self, coloana):
+        """Expresia SQL pentru luna datei din `coloana`, ca text AAAA-LL."""
+        raise NotImplementedError
+
+    def sql_zi_saptamana(self, coloana):
+        """Expresia SQL pentru ziua săptămânii datei din `coloana` (1 = luni ... 7 = duminică)."""
+        raise NotImplementedError
+
+    def sql_ora(self, coloana):
+        """Expresia SQL pentru ora (0-23) din `coloana`; NULL dacă ora lipsește."""
+        raise NotImplementedError
+
+    def prepare_bulk_cursor(self, cursor):
+        """Pregătește cursorul pentru inserări în lot cu executemany."""
+
+    def inlocuieste_tabel(self, cursor, tabel, tabel_nou):
+        """
+        Pune rândurile din `tabel_nou` în locul celor din `tabel`. Nu confirmă tranzacția:
+        până la commit, celelalte conexiuni văd conținutul vechi al lui `tabel`. După
+        înlocuire `tabel_nou` poate conține rândurile vechi; apelantul îl golește, după
+        commit, cu `goleste_tabel`.
+        """
+        raise NotImplementedError
+
+    def goleste_tabel(self, cursor, tabel):
+        """Șterge toate rândurile din `tabel`."""
+        raise NotImplementedError
+
+    def obtine_blocare(self, cursor, resursa, durata):
+        """
+        Încearcă, fără să aștepte, să obțină blocarea exclusivă `resursa`, comună tuturor
+        proceselor care folosesc baza de date; returnează True dacă a obținut-o. Blocarea
+        nu ține de tranzacție: rămâne între commit-uri până la `elibereaza_blocare`, iar
+        dacă procesul se oprește fără s-o elibereze expiră după cel mult `durata` secunde.
+        Apelantul confirmă tranzacția imediat după apel.
+        """
+        raise NotImplementedError
+
+    def prelungeste_blocare(self, cursor, resursa, durata):
+        """
+        Verifică, în tranzacția curentă, că blocarea `resursa` este încă deținută de această
+        conexiune și o prelungește cu `durata` secunde. Dacă returnează False, alt proces a
+        preluat blocarea și scrierile protejate de ea trebuie anulate.
+        """
+        raise NotImplementedError
+
+    def elibereaza_blocare(self, cursor, resursa):
+        """Eliberează blocarea `resursa` obținută cu `obtine_blocare`."""
+        raise NotImplementedError
+
+    def reorder_nrcrt(self, cursor, de_la=None, start=1):
+        """
+        Renumerotează NrCrt în ordinea (DataInterventie, ID): rândurile cu
+        DataInterventie >= `de_la` (toate, fără `de_la`) primesc numerele începând cu
+        `start`. Sunt scrise doar rândurile al căror NrCrt se schimbă; returnează câte.
+        """
+        raise NotImplementedError
+
+    def ensure_migrations_table(self, cursor):
+        """Creează tabelul SchemaMigrations dacă nu există."""
+        raise NotImplementedError
+
+    def execute_script(self, cursor, sql, versiune):
+        """
+        Execută un script de migrare și îl înregistrează ca `versiune` în SchemaMigrations,
+        în aceeași tranzacție: la eroare, apelantul face rollback și migrarea nu rămâne
+        aplicată parțial.
+        """
+        raise NotImplementedError
+
+
+class SqlServerBackend(StorageBackend):
+    """SQL Server prin pyodbc și ODBC Driver 18 (backend-ul de producție)."""
+
+    name = 'sqlserver'
+
+    @lru_cache(maxsize=1)
+    def _connection_string(self):
+        """Construiește șirul de conexiune o singură dată per proces."""
+        # Încercăm să folosim variabilele de mediu mai întâi
+        host = os.getenv('DB_HOST')
+        port = os.getenv('DB_PORT')
+        database = os.getenv('DB_NAME')
+        user = os.getenv('DB_USER')
+        password = os.getenv('DB_PASSWORD')
+
+        # Dacă nu avem variabile de mediu, folosim config.ini
+        if not all([host, port, database, user, password]):
+            config = configparser.ConfigParser()
+            config.read(BASE_DIR / 'config.ini')
+
+            host = config['MySQL']['host']
+            port = config['MySQL']['port']
+            database = config['MySQL']['database']
+            user = config['MySQL']['user']
+            password = config['MySQL']['password']
+
+        return (
+            "DRIVER={ODBC Driver 18 for SQL Server};"
+            f"SERVER={host},{port};"
+            f"DATABASE={database};"
+            f"UID={user};"
+            f"PWD={password};"
+            "TrustServerCertificate=yes;"
+        )
+
+    def connect(self):
+        import pyodbc
+        return pyodbc.connect(self._connection_string())
+
+    def sql_now(self):
+        return "GETDATE()"
+
+    def sql_limit(self):
+        return "OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY"
+
+    def sql_versiune_curenta(self):
+        # Tranzacțiile încă deschise au versiuni >= MIN_ACTIVE_ROWVERSION; nu le sărim la citirea următoare
+        return "SELECT CAST(MIN_ACTIVE_ROWVERSION() AS BIGINT) - 1"
+
+    def sql_conditie_versiune(self):
+        return "VersiuneRand > CAST(CAST(? AS BIGINT) AS BINARY(8))"
+
+    def sql_luna(self, coloana):
+        return f"CONVERT(CHAR(7), {coloana}, 126)"
+
+    def sql_zi_saptamana(self, coloana):
+        # 1900-01-01 a fost luni; rezultatul nu depinde de SET DATEFIRST
+        return f"(DATEDIFF(day, '19000101', {coloana}) % 7 + 1)"
+
+    def sql_ora(self, coloana):
+        return f"DATEPART(hour, {coloana})"
+
+    def prepare_bulk_cursor(self, cursor):
+        # pyodbc trimite parametrii întregului lot într-un singur apel
+        cursor.fast_executemany = True
+
+    def inlocuieste_tabel(self, cursor, tabel, tabel_nou):
+        # Cele două tabele își schimbă numele: doar metadate, fără să copiem sau să golim
+        # ceva în tranzacție. Redenumirea ia Sch-M pe tabele doar până la commit-ul care
+        # urmează imediat; căutările deja pornite se termină pe indexul vechi, iar `tabel`
+        # nu este gol în niciun moment. Cheia și indexurile își păstrează numele, deci
+        # după un număr impar de înlocuiri IndexCautare are PK_IndexCautareNou.
+        vechi = f"{tabel}Vechi"
+        cursor.execute(f"""
+            EXEC sp_rename '{tabel}', '{vechi}';
+            EXEC sp_rename '{tabel_nou}', '{tabel}';
+            EXEC sp_rename '{vechi}', '{tabel_nou}';
+        """)
+
+    def goleste_tabel(self, cursor, tabel):
+        cursor.execute(f"TRUNCATE TABLE {tabel}")
+
+    def obtine_blocare(self, cursor, resursa, durata):
+        # Blocarea aparține sesiunii: serverul o eliberează când se închide conexiunea,
+        # deci nu are nevoie de o durată. NOCOUNT este restabilit pentru conexiunile din pool.
+        cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @rezultat INT;
+            EXEC @rezultat = sp_getapplock @Resource = ?, @LockMode = 'Exclusive',
+                @LockOwner = 'Session', @LockTimeout = 0;
+            SELECT @rezultat;
+            SET NOCOUNT OFF;
+        """, (resursa,))
+        return cursor.fetchone()[0] >= 0
+
+    def prelungeste_blocare(self, cursor, resursa, durata):
+        cursor.execute("SELECT APPLOCK_MODE('public', ?, 'Session')", (resursa,))
+        return cursor.fetchone()[0] == 'Exclusive'
+
+    def elibereaza_blocare(self, cursor, resursa):
+        cursor.execute("EXEC sp_releaseapplock @Resource = ?, @LockOwner = 'Session'", (resursa,))
+
+    def reorder_nrcrt(self, cursor, de_la=None, start=1):
+        # Dezactivăm IDENTITY dacă există
+        cursor.execute("""
+        IF EXISTS (SELECT 1 FROM sys.identity_columns
+                  WHERE object_id = OBJECT_ID('RegistruInterventii')
+                  AND name = 'NrCrt')
+        BEGIN
+            SET IDENTITY_INSERT RegistruInterventii OFF
+        END
+        """)
+
+        # Facem update-ul folosind ROW_NUMBER(), doar pentru rândurile care se schimbă
+        where = "WHERE DataInterventie >= ?" if de_la is not None else ""
+        params = [start] + ([de_la] if de_la is not None else [])
+        cursor.execute(f"""
+        WITH CTE AS (
+            SELECT NrCrt,
+                   ? - 1 + ROW_NUMBER() OVER (ORDER BY DataInterventie, ID) as NewNrCrt
+            FROM RegistruInterventii
+            {where}
+        )
+        UPDATE CTE
+        SET NrCrt = NewNrCrt
+        WHERE NrCrt IS NULL OR NrCrt <> NewNrCrt
+        """, params)
+        return cursor.rowcount
+
+    def ensure_migrations_table(self, cursor):
+        cursor.execute("""
+            IF OBJECT_ID('SchemaMigrations') IS NULL
+                CREATE TABLE SchemaMigrations (
+                    Versiune NVARCHAR(255) NOT NULL PRIMARY KEY,
+                    AplicataLa DATETIME NOT NULL DEFAULT GETDATE()
+                )
+        """)
+
+    def execute_script(self, cursor, sql, versiune):
+        # Împărțim scriptul în loturi după separatorul GO (ca în sqlcmd/SSMS); conexiunea
+        # pyodbc nu este în autocommit, deci loturile și înregistrarea sunt o singură tranzacție
+        for batch in re.split(r'^\s*GO\s*$', sql, flags=re.MULTILINE | re.IGNORECASE):
+            if batch.strip():
+                cursor.execute(batch)
+        cursor.execute("INSERT INTO SchemaMigrations (Versiune) VALUES (?)", (versiune,))
+
+
+def _adapt_time(value):
+    return value.strftime('%H:%M') if value.second == 0 else value.strftime('%H:%M:%S')
+
+
+def _convert_time(value):
+    # fromisoformat acceptă atât 'HH:MM' cât și 'HH:MM:SS' și este mult mai rapid decât strptime
+    return time.fromisoformat(value.decode())
+
+
+# SQLite nu are tipuri pentru dată/oră; le stocăm ca text ISO și le convertim după tipul declarat
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(time, _adapt_time)
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('DATETIME', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('TIME', _convert_time)
+
+
+# Numerotarea bazelor de date din memorie ale procesului
+_baze_memorie = itertools.count(1)
+
+
+class SqliteBackend(StorageBackend):
+    """
+    SQLite cu aceeași schemă ca SQL Server, pentru rulări locale, benchmark-uri și teste.
+    Schema este creată automat, din migrations/sqlite, la prima conexiune.
+    Cu `path=':memory:'` baza de date este partajată de conexiunile procesului.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self._keepalive = None
+        if self.path == ':memory:':
+            # Un nume nou pentru fiecare backend: id(self) poate fi refolosit cât timp baza
+            # unui backend anterior mai este deschisă
+            self._uri = f"file:appelcen_{next(_baze_memorie)}?mode=memory&cache=shared"
+        else:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._uri = None
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self._uri or self.path,
+            uri=self._uri is not None,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            timeout=30
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self._uri is None:
+            conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    def connect(self):
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    if self._uri is not None:
+                        # Baza din memorie există cât timp are cel puțin o conexiune deschisă
+                        self._keepalive = self._open()
+                    from migrate import aplica_migrari_conexiune
+                    conn = self._open()
+                    try:
+                        aplica_migrari_conexiune(conn, self)
+                    finally:
+                        conn.close()
+                    self._schema_ready = True
+        return self._open()
+
+    def sql_now(self):
+        return "datetime('now', 'localtime')"
+
+    def sql_limit(self):
+        return "LIMIT ?"
+
+    def sql_versiune_curenta(self):
+        return "SELECT Valoare FROM VersiuneRegistru WHERE ID = 1"
+
+    def sql_conditie_versiune(self):
+        return "VersiuneRand > ?"
+
+    def sql_luna(self, coloana):
+        return f"strftime('%Y-%m', {coloana})"
+
+    def sql_zi_saptamana(self, coloana):
+        # %w numără de la duminică (0)
+        return f"((CAST(strftime('%w', {coloana}) AS INTEGER) + 6) % 7 + 1)"
+
+    def sql_ora(self, coloana):
+        return f"CAST(strftime('%H', {coloana}) AS INTEGER)"
+
+    def inlocuieste_tabel(self, cursor, tabel, tabel_nou):
+        # În modul WAL cititorii văd conținutul vechi până la commit
+        cursor.execute(f"DELETE FROM {tabel}")
+        cursor.execute(f"INSERT INTO {tabel} SELECT * FROM {tabel_nou}")
+
+    def goleste_tabel(self, cursor, tabel):
+        cursor.execute(f"DELETE FROM {tabel}")
+
+    @staticmethod
+    def _detinator():
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def obtine_blocare(self, cursor, resursa, durata):
+        # SQLite nu are blocări cu nume: blocarea este un rând în Blocari, valabil până la
+        # ExpiraLa (zile iuliene), pe care alt proces îl poate prelua doar după expirare
+        cursor.execute("""
+            INSERT INTO Blocari (Resursa, Detinator, ExpiraLa)
+            VALUES (?, ?, julianday('now') + ? / 86400.0)
+            ON CONFLICT (Resursa) DO UPDATE
+            SET Detinator = excluded.Detinator, ExpiraLa = excluded.ExpiraLa
+            WHERE Blocari.ExpiraLa < julianday('now') OR Blocari.Detinator = excluded.Detinator
+        """, (resursa, self._detinator(), durata))
+        return cursor.rowcount == 1
+
+    def prelungeste_blocare(self, cursor, resursa, durata):
+        # UPDATE ia blocarea de scriere a bazei, deci verificarea și scrierile care urmează
+        # în aceeași tranzacție nu pot fi intercalate cu preluarea blocării de alt proces
+        cursor.execute("""
+            UPDATE Blocari SET ExpiraLa = julianday('now') + ? / 86400.0
+            WHERE Resursa = ? AND Detinator = ?
+        """, (durata, resursa, self._detinator()))
+        return cursor.rowcount == 1
+
+    def elibereaza_blocare(self, cursor, resursa):
+        cursor.execute(
+            "DELETE FROM Blocari WHERE Resursa = ? AND Detinator = ?",
+            (resursa, self._detinator())
+        )
+
+    def reorder_nrcrt(self, cursor, de_la=None, start=1):
+        where = "WHERE DataInterventie >= ?" if de_la is not None else ""
+        params = [start] + ([de_la] if de_la is not None else [])
+        cursor.execute(f"""
+        UPDATE RegistruInterventii
+        SET NrCrt = Numerotare.NewNrCrt
+        FROM (
+            SELECT ID,
+                   ? - 1 + ROW_NUMBER() OVER (ORDER BY DataInterventie, ID) as NewNrCrt
+            FROM RegistruInterventii
+            {where}
+        ) AS Numerotare
+        WHERE Numerotare.ID = RegistruInterventii.ID
+          AND (RegistruInterventii.NrCrt IS NULL OR RegistruInterventii.NrCrt <> Numerotare.NewNrCrt)
+        """, params)
+        return cursor.rowcount
+
+    def ensure_migrations_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS SchemaMigrations (
+                Versiune TEXT NOT NULL PRIMARY KEY,
+                AplicataLa DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+            )
+        """)
+
+    def execute_script(self, cursor, sql, versiune):
+        # executescript confirmă tranzacția deschisă și rulează apoi fiecare instrucțiune în
+        # autocommit; tranzacția explicită din script păstrează migrarea atomică
+        versiune = versiune.replace("'", "''")
+        cursor.executescript(
+            f"BEGIN;\n{sql}\n;\nINSERT INTO SchemaMigrations (Versiune) VALUES ('{versiune}');\nCOMMIT;"
+        )
+
+
+def _backend_from_config():
+    """Alege backend-ul din DB_BACKEND / SQLITE_PATH sau din secțiunea [Database] a config.ini."""
+    config = configparser.ConfigParser()
+    config.read(BASE_DIR / 'config.ini')
+    section = config['Database'] if config.has_section('Database') else {}
+
+    name = (os.getenv('DB_BACKEND') or section.get('backend') or SqlServerBackend.name).strip().lower()
+    if name == SqliteBackend.name:
+        path = os.getenv('SQLITE_PATH') or section.get('path') or str(BASE_DIR / 'data' / 'appelcen.sqlite3')
+        return SqliteBackend(path)
+    if name != SqlServerBackend.name:
+        logging.warning(f"Backend necunoscut '{name}', folosim SQL Server")
+    return SqlServerBackend()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Returnează backend-ul de stocare al procesului."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _backend_from_config()
+                logging.info(f"Backend de stocare: {_backend.name}")
+    return _backend
+
+
+def set_backend(backend):
+    """Înlocuiește backend-ul procesului (de ex. pentru benchmark-uri); închide conexiunile existente."""
+    global _backend
+    from db_pool import close_pool
+    with _backend_lock:
+        close_pool()
+        _backend = backend
@@ -0,0 +1,9 @@
+"""
+Benchmark-uri pentru registrul de intervenții.
+
+`generator` produce registre sintetice în formatul exportului istoric
+(`Registru de Interventii.csv`), iar `run` măsoară funcțiile din `database.py`
+și pregătirea tabelului din pagină pe o bază SQLite temporară:
+
+    python -m benchmarks.run --rows 1000 10000 100000
+"""
@@ -0,0 +1,186 @@
+import argparse
+import csv
+import random
+from datetime import date, timedelta
+
+# Antetul exportului istoric (păstrăm și denumirea DurataInterventiei)
+ANTET_CSV = ['NrCrt', 'DataInterventie', 'Zi', 'Solicitant', 'Solicitare', 'Ora',
+             'DurataInterventiei', 'PersonalITC', 'Observatii']
+
+ZILE_PRESCURTATE = ['L', 'Ma', 'Mi', 'J', 'V', 'S', 'D']
+
+# Personalul IT și ponderile aproximative din registrul real
+PERSONAL_ITC = [
+    ('constantin.dragomir', 52),
+    ('valentin.ene', 16),
+    ('corina.cervinschi', 10),
+    ('laurentiu.henegariu', 9),
+    ('virgil.ionita', 7),
+    ('gabriel.mertea', 2),
+    ('valentin.dinu', 1),
+]
+
+DEPARTAMENTE = [
+    'STIC', 'SITC', 'Logistica', 'Registratura', 'Tehnic', 'Operativa', 'Investitii',
+    'Achizitii', 'S.Achizitii', 'S.Financiar', 'Contabilitate', 'Resurse Umane', 'SRU',
+    'SSM', 'SMI', 'Mentenanta', 'Dispecerat', 'Organizare', 'Comunicare', 'SAP',
+    'Site ELCEN', 'Arhivă', 'Juridic', 'Metrologie', 'Producție',
+]
+
+PRENUME = [
+    'Florin', 'Luiza', 'Dragoș', 'Simona', 'Natalia', 'Mirela', 'Magda', 'Ioana', 'Camelia',
+    'Mădălina', 'Luminița', 'Ileana', 'Cosmin', 'Mircea', 'Carmen', 'Roxana', 'Oana', 'Viorel',
+    'Costel', 'Stelian', 'Alina', 'Gheorghe', 'Ștefan', 'Andreea', 'Elena', 'Mihai', 'Bogdan',
+]
+
+NUME = [
+    'Gheorghe', 'Popescu', 'Constantinescu', 'Matei', 'Roșca', 'Duran', 'Renga', 'Dinu',
+    'Diaconu', 'Ene', 'Leu', 'Petre', 'Boghiciu', 'Rădoi', 'Caracaș', 'Munteanu', 'Pislariu',
+    'Oprea', 'Olaru', 'Mitică', 'Mazilu', 'Livan', 'Mezei', 'Ionescu', 'Stănescu', 'Țurcanu',
+]
+
+# Solicitări tipice; {} se completează cu un obiect din lista asociată
+SOLICITARI = [
+    ('Postare creanțe pe site', None),
+    ('Configurare drepturi PC în AD, nume PC, update', None),
+    ('Probleme imprimantă {}', 'imprimanta'),
+    ('Deblocare multifuncțional {}', 'imprimanta'),
+    ('Instalare și configurare imprimantă {}', 'imprimanta'),
+    ('Schimbare toner {}', 'imprimanta'),
+    ('Deblocare PC', None),
+    ('Update {}', 'aplicatie'),
+    ('Reinstalare {}', 'aplicatie'),
+    ('Setări {}', 'aplicatie'),
+    ('Resetare parolă {}', 'aplicatie'),
+    ('Nu merge rețeaua', None),
+    ('Probleme mail', None),
+    ('Creare cont AD și mail', None),
+    ('Instalarea unui nou angajat', None),
+    ('Videoconferință', None),
+    ('Suport ședință', None),
+    ('Postare pe site {}', 'site'),
+    ('Actualizare pagină site - {}', 'site'),
+    ('Montare SSD și clonare', None),
+    ('Cartelă pontaj, introducere în sistem și acordare drepturi', None),
+    ('Rezolvare probleme SQL', None),
+    ('Ajutor format documente', None),
+]
+
+OBIECTE = {
+    'imprimanta': ['Lexmark', 'Xerox 5020', 'Samsung', 'HP LaserJet', 'Kyocera', 'UZR'],
+    'aplicatie': ['Regplus', 'Outlook', 'PontajElectronic', 'aplicația RU', 'S.O.', 'wscom',
+                  'OptimizeAgent', 'antivirus'],
+    'site': ['declarații', 'achiziții', 'Energie Electrică', 'anunțuri', 'rapoarte'],
+}
+
+OBSERVATII = [
+    'probleme priză rețea', 'rezolvat', 'înlocuit cablu', 'necesită piesă',
+    'escaladat la furnizor', 'telefonic', 'la distanță', 'revenire mâine',
+]
+
+# Durata (minute) și ponderile din registrul real; None = necompletată
+DURATE = [(15, 28), (30, 27), (60, 14), (None, 6), (10, 5), (20, 5), (120, 4),
+          (45, 3), (180, 2), (90, 1), (240, 1), (5, 1)]
+
+
+def _alege_ponderat(rng, optiuni):
+    valori, ponderi = zip(*optiuni)
+    return rng.choices(valori, weights=ponderi)[0]
+
+
+def _zile_lucratoare(start, end):
+    zile = []
+    zi = start
+    while zi <= end:
+        if zi.weekday() < 5:
+            zile.append(zi)
+        zi += timedelta(days=1)
+    return zile
+
+
+def _solicitant(rng):
+    r = rng.random()
+    if r < 0.05:
+        return ''
+    if r < 0.35:
+        return rng.choice(DEPARTAMENTE)
+    persoana = f"{rng.choice(PRENUME)} {rng.choice(NUME)}"
+    if r < 0.65:
+        return persoana
+    return f"{persoana}, {rng.choice(DEPARTAMENTE)}"
+
+
+def _solicitare(rng):
+    text, obiect = rng.choice(SOLICITARI)
+    if obiect:
+        text = text.format(rng.choice(OBIECTE[obiect]))
+    # Ca în registrul real, o parte din texte sunt scrise fără diacritice
+    if rng.random() < 0.4:
+        text = text.translate(_FARA_DIACRITICE)
+    return text
+
+
+_FARA_DIACRITICE = str.maketrans('ăâîșțşţĂÂÎȘȚŞŢ', 'aaistssAAISTST')
+
+
+def genereaza_randuri(n, seed=0, end=None, ani=5):
+    """
+    Generează `n` rânduri sintetice (dicționare cu coloanele din ANTET_CSV),
+    în ordine cronologică, pe zilele lucrătoare din ultimii `ani` ani până la `end`.
+    Rezultatul este determinist pentru același `seed`.
+    """
+    rng = random.Random(seed)
+    end = end or date(2024, 12, 31)
+    zile = _zile_lucratoare(end.replace(year=end.year - ani) + timedelta(days=1), end)
+
+    for i in range(n):
+        data = zile[i * len(zile) // n]
+        if rng.random() < 0.01:
+            # Intervenții ocazionale în weekend
+            data += timedelta(days=5 - data.weekday())
+
+        if rng.random() < 0.04:
+            ora = ''
+        else:
+            minute = rng.randrange(7 * 60 + 30, 16 * 60 + 30, 5)
+            ora = f"{minute // 60:02d}:{minute % 60:02d}"
+
+        durata = _alege_ponderat(rng, DURATE)
+        personal = _alege_ponderat(rng, PERSONAL_ITC)
+        if rng.random() < 0.03:
+            personal = f"{personal}, {_alege_ponderat(rng, PERSONAL_ITC)}"
+
+        yield {
+            'NrCrt': str(i + 1),
+            'DataInterventie': data.strftime('%d.%m.%Y'),
+            'Zi': ZILE_PRESCURTATE[data.weekday()],
+            'Solicitant': _solicitant(rng),
+            'Solicitare': _solicitare(rng),
+            'Ora': ora,
+            'DurataInterventiei': '' if durata is None else f"{float(durata):.1f}",
+            'PersonalITC': personal,
+            'Observatii': rng.choice(OBSERVATII) if rng.random() < 0.3 else '',
+        }
+
+
+def scrie_csv(path, n, seed=0, encoding='utf-8', **kwargs):
+    """Scrie un registru sintetic de `n` rânduri în formatul exportului istoric."""
+    with open(path, 'w', newline='', encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=ANTET_CSV, delimiter=';')
+        writer.writeheader()
+        for rand in genereaza_randuri(n, seed=seed, **kwargs):
+            writer.writerow(rand)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generează un registru de intervenții sintetic (CSV).")
+    parser.add_argument('file', help="fișierul CSV generat")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ani', type=int, default=5, help="numărul de ani acoperiți de registru")
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args()
+
+    scrie_csv(args.file, args.rows, seed=args.seed, encoding=args.encoding, ani=args.ani)
+    print(f"{args.rows} rânduri scrise în {args.file}")
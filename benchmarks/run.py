@@ -0,0 +1,358 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+# Randarea paginii (AppTest) semnează token-uri de sesiune; fără SESSION_SECRET folosim o cheie per proces
+os.environ.setdefault('SESSION_SECRET_DEV', '1')
+
+import database
+from backends import SqliteBackend, set_backend
+from benchmarks.generator import PERSONAL_ITC, scrie_csv
+
+REZULTATE_DIR = Path(__file__).resolve().parent / 'results'
+
+UTILIZATOR_BENCHMARK = 'bench.manager'
+PAROLA_BENCHMARK = 'benchmark'
+
+_BENCHMARKS = []
+
+
+def benchmark(nume, complet=False, repetari=None):
+    """
+    Înregistrează o funcție de benchmark. Funcția primește contextul rulării
+    și returnează numărul de rânduri procesate.
+    `complet=True` marchează benchmark-urile care încarcă tot registrul în memorie;
+    acestea sunt sărite peste pragul `--max-full-rows`.
+    """
+    def decorator(functie):
+        _BENCHMARKS.append({'nume': nume, 'functie': functie, 'complet': complet, 'repetari': repetari})
+        return functie
+    return decorator
+
+
+def _masoara(functie, context, repetari):
+    durate = []
+    randuri = None
+    for _ in range(repetari):
+        start = time.perf_counter()
+        randuri = functie(context)
+        durate.append(time.perf_counter() - start)
+    return {
+        'repetari': repetari,
+        'randuri': randuri,
+        'min': min(durate),
+        'mediana': statistics.median(durate),
+        'medie': statistics.mean(durate),
+        'max': max(durate),
+    }
+
+
+# --- Funcțiile din database.py ---
+
+@benchmark('get_interventii_pagina.prima_pagina')
+def _prima_pagina(context):
+    return len(database.get_interventii_pagina(page_size=50, include_total=True)['rows'])
+
+
+@benchmark('get_interventii_pagina.parcurgere_20_pagini')
+def _parcurgere(context):
+    cursor = None
+    randuri = 0
+    for _ in range(20):
+        pagina = database.get_interventii_pagina(page_size=50, cursor=cursor)
+        randuri += len(pagina['rows'])
+        cursor = pagina['next_cursor']
+        if cursor is None:
+            break
+    return randuri
+
+
+@benchmark('get_interventii_pagina.filtru_personal')
+def _filtru_personal(context):
+    filtre = {'personal_itc': PERSONAL_ITC[1][0]}
+    return len(database.get_interventii_pagina(page_size=50, include_total=True, filtre=filtre)['rows'])
+
+
+@benchmark('get_interventii_pagina.filtru_perioada')
+def _filtru_perioada(context):
+    filtre = {'data_start': context['ultima_data'] - timedelta(days=30), 'data_end': context['ultima_data']}
+    return len(database.get_interventii_pagina(page_size=50, include_total=True, filtre=filtre)['rows'])
+
+
+@benchmark('get_interventii_pagina.filtru_text')
+def _filtru_text(context):
+    filtre = {'text': 'imprimanta'}
+    return len(database.get_interventii_pagina(page_size=50, include_total=True, filtre=filtre)['rows'])
+
+
+@benchmark('cautare.cauta')
+def _cautare(context):
+    from cautare import cauta
+    return len(cauta('imprimanta lexmark'))
+
+
+@benchmark('cautare.reconstruire_index', repetari=1)
+def _reconstruire_index(context):
+    from cautare import actualizeaza_index
+    return actualizeaza_index(complet=True)
+
+
+@benchmark('get_statistici.fara_cache')
+def _statistici_fara_cache(context):
+    database.invalidate_statistici()
+    return database.get_statistici()['total']
+
+
+@benchmark('get_statistici.din_cache')
+def _statistici_din_cache(context):
+    return database.get_statistici()['total']
+
+
+@benchmark('aproba_interventie.lot_500')
+def _aprobare_lot(context):
+    # Fiecare repetare aprobă alte 500 de intervenții în așteptare
+    lot = context['in_asteptare'][:500]
+    del context['in_asteptare'][:500]
+    rezultate = database.aproba_interventie(lot, UTILIZATOR_BENCHMARK, 'Aprobat')
+    return len(rezultate) if isinstance(rezultate, dict) else 0
+
+
+@benchmark('adauga_interventie')
+def _adauga(context):
+    azi = context['ultima_data']
+    succes = database.adauga_interventie(
+        azi, 'Luni', 'Benchmark', 'Intervenție de test', '10:00', 15,
+        PERSONAL_ITC[0][0], '', 1
+    )
+    return 1 if succes else 0
+
+
+@benchmark('reorder_nrcrt.coada_30_zile')
+def _reorder_coada(context):
+    # O intervenție trecută în registru cu o lună întârziere: se renumerotează doar coada
+    data = context['ultima_data'] - timedelta(days=30)
+    database.adauga_interventie(
+        data, 'Luni', 'Benchmark', 'Intervenție întârziată', '10:00', 15,
+        PERSONAL_ITC[0][0], '', 1
+    )
+    return database.reorder_nrcrt()
+
+
+@benchmark('reorder_nrcrt.complet', repetari=1)
+def _reorder(context):
+    database.reorder_nrcrt(complet=True)
+    return context['randuri']
+
+
+# --- Pregătirea tabelului din pagină ---
+
+@benchmark('pagina.pregateste_tabel_pagina')
+def _tabel_pagina(context):
+    from pages._it_page import pregateste_tabel
+    return len(pregateste_tabel(context['pagina']))
+
+
+@benchmark('pagina.coada_aprobare')
+def _coada_aprobare(context):
+    # Calea folosită de pagină pentru șeful de birou: doar prima pagină din coada de aprobare
+    from pages._it_page import pregateste_tabel
+    coada = database.get_interventii_in_asteptare(page_size=25, include_total=True)
+    return len(pregateste_tabel(coada['rows']))
+
+
+# --- Exporturile (tot registrul, citit și scris pe loturi) ---
+
+@benchmark('export.csv', repetari=1)
+def _export_csv(context):
+    import export
+    with tempfile.TemporaryDirectory() as director:
+        return export.exporta('csv', Path(director) / 'registru.csv')
+
+
+@benchmark('export.parquet', repetari=1)
+def _export_parquet(context):
+    import export
+    with tempfile.TemporaryDirectory() as director:
+        return export.exporta('parquet', Path(director) / 'registru.parquet')
+
+
+@benchmark('pagina.randare_completa', complet=True, repetari=3)
+def _randare(context):
+    at = context['app_test']
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return context['randuri']
+
+
+def _pornire_app_test():
+    """Autentifică utilizatorul de benchmark într-un AppTest al aplicației."""
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(str(BASE_DIR / 'main.py'), default_timeout=600)
+    at.run()
+    at.text_input(key='username_input').input(UTILIZATOR_BENCHMARK)
+    at.text_input(key='password_input').input(PAROLA_BENCHMARK)
+    at.button[0].click().run()
+    return at
+
+
+def _pregateste_baza(director, randuri, seed):
+    """Creează o bază SQLite nouă, utilizatorii IT și importă registrul sintetic."""
+    backend = SqliteBackend(Path(director) / f'registru_{randuri}.sqlite3')
+    set_backend(backend)
+    database.invalidate_principal()
+    database.invalidate_username_map()
+    database.invalidate_statistici()
+
+    for username, _ in PERSONAL_ITC:
+        database.add_user(username, PAROLA_BENCHMARK, 1)
+    database.add_user(UTILIZATOR_BENCHMARK, PAROLA_BENCHMARK, 1)
+    with database.db_connection() as conn:
+        conn.execute("UPDATE Utilizatori SET EsteManager = 1 WHERE NumeUtilizator = ?", (UTILIZATOR_BENCHMARK,))
+        conn.commit()
+
+    fisier = scrie_csv(Path(director) / f'registru_{randuri}.csv', randuri, seed=seed)
+    start = time.perf_counter()
+    raport = database.import_interventii_csv(fisier, encoding='utf-8', status='In Asteptare')
+    durata = time.perf_counter() - start
+    if not raport or raport['importate'] != randuri:
+        raise RuntimeError(f"Importul registrului sintetic a eșuat: {raport}")
+    # În aplicație indexul de căutare este construit de firul de fundal
+    from cautare import actualizeaza_index
+    actualizeaza_index()
+
+    # Distribuția statusurilor din producție: majoritatea aprobate, câteva respinse
+    with database.db_connection() as conn:
+        conn.execute("""
+            UPDATE RegistruInterventii
+            SET Status = CASE WHEN ID % 10 < 7 THEN 'Aprobat' ELSE 'Respins' END,
+                DataAprobare = DataInterventie, AprobatDe = ?
+            WHERE ID % 10 < 8
+        """, (UTILIZATOR_BENCHMARK,))
+        conn.commit()
+        ultima_data = conn.execute("SELECT MAX(DataInterventie) FROM RegistruInterventii").fetchone()[0]
+        in_asteptare = [row[0] for row in conn.execute(
+            "SELECT NrCrt FROM RegistruInterventii WHERE Status = 'In Asteptare' ORDER BY NrCrt"
+        )]
+
+    rezultat_import = {
+        'repetari': 1, 'randuri': raport['importate'],
+        'min': durata, 'mediana': durata, 'medie': durata, 'max': durata,
+    }
+    context = {
+        'randuri': randuri,
+        'ultima_data': datetime.strptime(str(ultima_data), '%Y-%m-%d').date(),
+        'in_asteptare': in_asteptare,
+        'pagina': database.get_interventii_pagina(page_size=50)['rows'],
+    }
+    return context, rezultat_import
+
+
+def ruleaza(randuri_lista, repetari=5, seed=0, max_full_rows=1_000_000, randare=False, filtru=None):
+    """Rulează benchmark-urile pentru fiecare dimensiune a registrului și returnează rezultatele."""
+    rezultate = []
+    with tempfile.TemporaryDirectory(prefix='registru_bench_') as director:
+        for randuri in randuri_lista:
+            print(f"== {randuri} rânduri", flush=True)
+            context, rezultat_import = _pregateste_baza(director, randuri, seed)
+            rezultate.append(dict(rezultat_import, benchmark='import_interventii_csv', dimensiune=randuri))
+            print(f"  import_interventii_csv: {rezultat_import['min']:.3f}s", flush=True)
+
+            if randare and randuri <= max_full_rows:
+                context['app_test'] = _pornire_app_test()
+
+            for b in _BENCHMARKS:
+                if filtru and filtru not in b['nume']:
+                    continue
+                if b['complet'] and randuri > max_full_rows:
+                    continue
+                if b['nume'] == 'pagina.randare_completa' and 'app_test' not in context:
+                    continue
+                rezultat = _masoara(b['functie'], context, b['repetari'] or repetari)
+                rezultate.append(dict(rezultat, benchmark=b['nume'], dimensiune=randuri))
+                print(f"  {b['nume']}: mediana {rezultat['mediana'] * 1000:.2f} ms", flush=True)
+        set_backend(None)
+    return rezultate
+
+
+def _metadate(args):
+    try:
+        revizie = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        revizie = None
+    try:
+        import pandas
+        versiune_pandas = pandas.__version__
+    except ImportError:
+        versiune_pandas = None
+    return {
+        'revizie': revizie,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platforma': platform.platform(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': versiune_pandas,
+        'backend': SqliteBackend.name,
+        'argumente': vars(args),
+    }
+
+
+def compara(fisier_baza, rezultate):
+    """Afișează raportul dintre medianele curente și cele dintr-un fișier de rezultate anterior."""
+    with open(fisier_baza, encoding='utf-8') as f:
+        baza = {(r['benchmark'], r['dimensiune']): r for r in json.load(f)['rezultate']}
+    print(f"\nComparație cu {fisier_baza} (mediana curentă / mediana de referință):")
+    for r in rezultate:
+        vechi = baza.get((r['benchmark'], r['dimensiune']))
+        if vechi and vechi['mediana'] > 0:
+            print(f"  {r['dimensiune']:>10} {r['benchmark']:<45} {r['mediana'] / vechi['mediana']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru registrul de intervenții.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="dimensiunile registrului sintetic (de ex. 1000 10000 1000000 10000000)")
+    parser.add_argument('--repeat', type=int, default=5, help="repetări pentru fiecare benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-full-rows', type=int, default=1_000_000,
+                        help="peste acest număr de rânduri se sar benchmark-urile care încarcă tot registrul")
+    parser.add_argument('--render', action='store_true', help="include randarea completă a paginii (AppTest)")
+    parser.add_argument('--only', default=None, help="rulează doar benchmark-urile care conțin acest text")
+    parser.add_argument('--output', default=None, help="fișierul JSON cu rezultate")
+    parser.add_argument('--compare', default=None, help="fișier JSON anterior pentru comparație")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    rezultate = ruleaza(
+        args.rows,
+        repetari=args.repeat,
+        seed=args.seed,
+        max_full_rows=args.max_full_rows,
+        randare=args.render,
+        filtru=args.only
+    )
+
+    output = Path(args.output) if args.output else REZULTATE_DIR / f"rezultate_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': _metadate(args), 'rezultate': rezultate}, f, ensure_ascii=False, indent=2)
+    print(f"\nRezultate scrise în {output}")
+
+    if args.compare:
+        compara(args.compare, rezultate)
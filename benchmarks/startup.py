@@ -0,0 +1,169 @@
+import argparse
+import json
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.run import (
+    REZULTATE_DIR, UTILIZATOR_BENCHMARK, PAROLA_BENCHMARK, _metadate, _pregateste_baza, compara
+)
+from backends import set_backend
+
+# Modulele aplicației și dependențele măsurate separat (fiecare într-un proces nou)
+MODULE = [
+    'security_config', 'logging_config', 'metrics', 'session_tokens', 'cache', 'backends',
+    'db_pool', 'db_trace', 'database', 'db_executor', 'cautare', 'export',
+    'pages._it_page', 'streamlit', 'pandas', 'numpy',
+]
+# Modulele care nu trebuie să fie încărcate până la autentificare
+MODULE_DUPA_LOGIN = ['pandas', 'database', 'pages._it_page', 'pyodbc']
+
+_IMPORTTIME = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)')
+
+# Rulat într-un proces nou: prima randare (login), apoi autentificarea și pagina registrului
+_SCRIPT_RANDARE = r"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import_streamlit = time.perf_counter() - start
+
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+start = time.perf_counter()
+at.run()
+prima_randare = time.perf_counter() - start
+
+import db_pool
+incarcate = {m: m in sys.modules for m in json.loads(sys.argv[4])}
+conexiuni = db_pool.pool_metrics().get('connections_created', 0)
+
+at.text_input(key='username_input').input(sys.argv[2])
+at.text_input(key='password_input').input(sys.argv[3])
+start = time.perf_counter()
+at.button[0].click().run()
+login = time.perf_counter() - start
+erori = [str(e.value) for e in at.exception]
+
+print(json.dumps({
+    'import_streamlit_testing': import_streamlit,
+    'prima_randare': prima_randare,
+    'login_pana_la_registru': login,
+    'incarcate_la_login': incarcate,
+    'conexiuni_la_login': conexiuni,
+    'erori': erori,
+}))
+"""
+
+
+def _statistici(durate, **extra):
+    return dict({
+        'repetari': len(durate),
+        'min': min(durate),
+        'mediana': statistics.median(durate),
+        'medie': statistics.mean(durate),
+        'max': max(durate),
+    }, **extra)
+
+
+def cost_import(modul):
+    """Timpul cumulat (secunde) al importului `modul` într-un interpretor nou (-X importtime)."""
+    proces = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modul}'],
+        cwd=BASE_DIR, capture_output=True, text=True, env=dict(os.environ, LOG_CONSOLE='0')
+    )
+    if proces.returncode != 0:
+        return None
+    for linie in proces.stderr.splitlines():
+        potrivire = _IMPORTTIME.match(linie)
+        # Linia modulului cerut, la nivelul superior (fără indentare)
+        if potrivire and potrivire.group(4) == modul and len(potrivire.group(3)) <= 1:
+            return int(potrivire.group(2)) / 1_000_000
+    return None
+
+
+def masoara_randarea(sqlite_path):
+    """Rulează _SCRIPT_RANDARE într-un proces nou, pe baza SQLite pregătită."""
+    env = dict(
+        os.environ, DB_BACKEND='sqlite', SQLITE_PATH=str(sqlite_path), LOG_CONSOLE='0',
+        LOG_DIR=str(Path(sqlite_path).parent / 'logs'), SESSION_SECRET_DEV='1'
+    )
+    proces = subprocess.run(
+        [sys.executable, '-c', _SCRIPT_RANDARE, str(BASE_DIR / 'main.py'),
+         UTILIZATOR_BENCHMARK, PAROLA_BENCHMARK, json.dumps(MODULE_DUPA_LOGIN)],
+        cwd=BASE_DIR, capture_output=True, text=True, env=env
+    )
+    if proces.returncode != 0:
+        raise RuntimeError(f"Randarea a eșuat:\n{proces.stderr[-2000:]}")
+    return json.loads(proces.stdout.strip().splitlines()[-1])
+
+
+def ruleaza(repetari=5, randuri=1000, seed=0):
+    rezultate = []
+
+    print("== Cost import per modul (proces nou)", flush=True)
+    for modul in MODULE:
+        durate = [d for d in (cost_import(modul) for _ in range(repetari)) if d is not None]
+        if not durate:
+            print(f"  {modul}: indisponibil", flush=True)
+            continue
+        rezultate.append(_statistici(durate, benchmark=f'import.{modul}', dimensiune=None))
+        print(f"  {modul}: mediana {statistics.median(durate) * 1000:.1f} ms", flush=True)
+
+    print(f"== Prima randare ({randuri} rânduri în registru)", flush=True)
+    with tempfile.TemporaryDirectory(prefix='registru_startup_') as director:
+        _pregateste_baza(director, randuri, seed)
+        sqlite_path = Path(director) / f'registru_{randuri}.sqlite3'
+        set_backend(None)
+
+        masuratori = [masoara_randarea(sqlite_path) for _ in range(repetari)]
+
+    for camp in ('prima_randare', 'login_pana_la_registru'):
+        durate = [m[camp] for m in masuratori]
+        rezultate.append(_statistici(durate, benchmark=f'pornire.{camp}', dimensiune=randuri))
+        print(f"  {camp}: mediana {statistics.median(durate) * 1000:.1f} ms", flush=True)
+
+    ultima = masuratori[-1]
+    incarcate = [m for m, da in ultima['incarcate_la_login'].items() if da]
+    print(f"  module încărcate la login: {', '.join(incarcate) or 'niciunul'}; "
+          f"conexiuni la login: {ultima['conexiuni_la_login']}", flush=True)
+    if ultima['erori']:
+        print(f"  erori la randare: {ultima['erori']}", flush=True)
+    rezultate.append({
+        'benchmark': 'pornire.stare_login', 'dimensiune': randuri,
+        'incarcate_la_login': ultima['incarcate_la_login'],
+        'conexiuni_la_login': ultima['conexiuni_la_login'],
+    })
+    return rezultate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark de pornire: costul importurilor și timpul până la prima randare."
+    )
+    parser.add_argument('--repeat', type=int, default=5, help="repetări pentru fiecare măsurătoare")
+    parser.add_argument('--rows', type=int, default=1000, help="rândurile registrului pentru randarea după login")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="fișierul JSON cu rezultate")
+    parser.add_argument('--compare', default=None, help="fișier JSON anterior pentru comparație")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    rezultate = ruleaza(repetari=args.repeat, randuri=args.rows, seed=args.seed)
+
+    output = Path(args.output) if args.output else REZULTATE_DIR / f"pornire_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': _metadate(args), 'rezultate': rezultate}, f, ensure_ascii=False, indent=2)
+    print(f"\nRezultate scrise în {output}")
+
+    if args.compare:
+        compara(args.compare, [r for r in rezultate if 'mediana' in r])
@@ -0,0 +1,56 @@
+import threading
+import time
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Cache simplu în memorie, sigur pentru fire de execuție, cu expirare per intrare."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returnează valoarea din cache sau `default` dacă lipsește ori a expirat."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def invalidate(self, key=None):
+        """Elimină o intrare sau, fără cheie, golește tot cache-ul."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        """Returnează numărul de accesări găsite/ratate și dimensiunea cache-ului."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'ttl': self.ttl,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,361 @@
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from backends import get_backend
+from cache import TTLCache
+from database import db_connection
+
+# Ponderea unui termen după coloana în care apare (folosită la ordonarea rezultatelor)
+PONDERI_COLOANE = (('Solicitare', 3), ('Solicitant', 2), ('Observatii', 1))
+
+# Cuvinte prea frecvente ca să fie utile în căutare (deja fără diacritice)
+CUVINTE_IGNORATE = {
+    'si', 'in', 'de', 'la', 'pe', 'cu', 'din', 'pt', 'pentru', 'un', 'una', 'al', 'ale',
+    'sau', 'ca', 'care', 'se', 'mai',
+}
+
+LUNGIME_MINIMA_TERMEN = 2
+LUNGIME_MAXIMA_TERMEN = 64
+# Câți termeni din textul căutat sunt folosiți (restul sunt ignorați)
+MAX_TERMENI_CAUTARE = 6
+# Rânduri citite și reindexate într-o tranzacție
+LOT_INDEXARE = 1000
+# Intervalul maxim între două actualizări ale indexului făcute de firul de fundal
+INDEX_CAUTARE_REFRESH = float(os.getenv('INDEX_CAUTARE_REFRESH', '30'))
+# Blocarea care serializează actualizările indexului între procese și cât timp (secunde)
+# rămâne valabilă dacă procesul care o deține se oprește
+BLOCARE_INDEX = 'index_cautare'
+INDEX_CAUTARE_BLOCARE = float(os.getenv('INDEX_CAUTARE_BLOCARE', '300'))
+
+_TERMEN = re.compile(r'[a-z0-9]+')
+
+_actualizare_lock = threading.Lock()
+_pornire_lock = threading.Lock()
+_indexare_pornita = False
+_modificari = threading.Event()
+# Starea indexului este recitită periodic: alt proces sau o migrare o poate reseta
+_stare_index_cache = TTLCache(ttl=float(os.getenv('INDEX_CAUTARE_STARE_TTL', '30')))
+
+
+def normalizeaza(text):
+    """Litere mici, fără diacritice: 'Rețea' și 'Reţea' devin 'retea'."""
+    descompus = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in descompus if not unicodedata.combining(c))
+
+
+def tokenizeaza(text):
+    """Împarte textul în termeni normalizați, fără cuvintele ignorate."""
+    if not text:
+        return []
+    return [
+        termen[:LUNGIME_MAXIMA_TERMEN]
+        for termen in _TERMEN.findall(normalizeaza(text))
+        if len(termen) >= LUNGIME_MINIMA_TERMEN and termen not in CUVINTE_IGNORATE
+    ]
+
+
+def termeni_rand(solicitant, solicitare, observatii):
+    """Termenii unei intervenții și ponderea fiecăruia (aparițiile ponderate după coloană)."""
+    valori = {'Solicitant': solicitant, 'Solicitare': solicitare, 'Observatii': observatii}
+    ponderi = Counter()
+    for coloana, pondere in PONDERI_COLOANE:
+        for termen in tokenizeaza(valori[coloana]):
+            ponderi[termen] += pondere
+    return ponderi
+
+
+def termeni_cautare(text):
+    """Termenii distincți din textul căutat, în ordinea apariției."""
+    return list(dict.fromkeys(tokenizeaza(text)))[:MAX_TERMENI_CAUTARE]
+
+
+def _termeni_lot(rows):
+    return [
+        (termen, row[0], min(pondere, 32767))
+        for row in rows
+        for termen, pondere in termeni_rand(row[1], row[2], row[3]).items()
+    ]
+
+
+def _reindexeaza_lot(cursor, rows):
+    ids = [row[0] for row in rows]
+    cursor.execute(
+        f"DELETE FROM IndexCautare WHERE ID IN ({', '.join('?' * len(ids))})",
+        ids
+    )
+    params = _termeni_lot(rows)
+    if params:
+        cursor.executemany("INSERT INTO IndexCautare (Termen, ID, Pondere) VALUES (?, ?, ?)", params)
+
+
+def _citeste_loturi(cursor, conditie='', params=()):
+    """Rândurile registrului care îndeplinesc `conditie`, pe loturi, în ordinea ID."""
+    # Citim pe loturi, după ID, ca să nu ținem deschis un rezultat cât timp scriem
+    query = f"""
+        SELECT ID, Solicitant, Solicitare, Observatii
+        FROM RegistruInterventii
+        WHERE ID > ? {f'AND {conditie}' if conditie else ''}
+        ORDER BY ID
+        {get_backend().sql_limit()}
+    """
+    ultimul_id = 0
+    while True:
+        cursor.execute(query, [ultimul_id, *params, LOT_INDEXARE])
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        yield rows
+        ultimul_id = rows[-1][0]
+
+
+def _pastreaza_blocarea(cursor):
+    """Prelungește blocarea indexului în tranzacția care urmează să scrie în index."""
+    if not get_backend().prelungeste_blocare(cursor, BLOCARE_INDEX, INDEX_CAUTARE_BLOCARE):
+        raise RuntimeError("Blocarea indexului de căutare a fost preluată de alt proces")
+
+
+def _reconstruieste(conn, cursor, versiune):
+    """
+    Construiește indexul complet în IndexCautareNou și îl mută apoi în IndexCautare
+    într-o singură tranzacție: căutările folosesc indexul vechi până la final.
+    """
+    backend = get_backend()
+    # Resturile unei reconstruiri întrerupte
+    _pastreaza_blocarea(cursor)
+    backend.goleste_tabel(cursor, 'IndexCautareNou')
+    conn.commit()
+
+    indexate = 0
+    for rows in _citeste_loturi(cursor):
+        _pastreaza_blocarea(cursor)
+        params = _termeni_lot(rows)
+        if params:
+            cursor.executemany("INSERT INTO IndexCautareNou (Termen, ID, Pondere) VALUES (?, ?, ?)", params)
+        conn.commit()
+        indexate += len(rows)
+
+    _pastreaza_blocarea(cursor)
+    backend.inlocuieste_tabel(cursor, 'IndexCautare', 'IndexCautareNou')
+    cursor.execute("UPDATE IndexCautareStare SET Versiune = ? WHERE ID = 1", (versiune,))
+    conn.commit()
+
+    # Tabelul de lucru poate conține acum indexul vechi
+    backend.goleste_tabel(cursor, 'IndexCautareNou')
+    conn.commit()
+    return indexate
+
+
+def _actualizeaza(conn, cursor, complet):
+    backend = get_backend()
+    conditie_versiune = backend.sql_conditie_versiune()
+
+    # Starea este citită după obținerea blocării: alt proces poate tocmai fi construit indexul
+    cursor.execute("SELECT Versiune FROM IndexCautareStare WHERE ID = 1")
+    token = cursor.fetchone()[0]
+    cursor.execute(backend.sql_versiune_curenta())
+    versiune = cursor.fetchone()[0]
+
+    if complet or token is None:
+        return _reconstruieste(conn, cursor, versiune)
+    if versiune <= token:
+        return 0
+
+    _pastreaza_blocarea(cursor)
+    cursor.execute(
+        f"DELETE FROM IndexCautare WHERE ID IN "
+        f"(SELECT ID FROM RegistruInterventiiSterse WHERE {conditie_versiune})",
+        (token,)
+    )
+    conn.commit()
+
+    indexate = 0
+    for rows in _citeste_loturi(cursor, conditie_versiune, [token]):
+        _pastreaza_blocarea(cursor)
+        _reindexeaza_lot(cursor, rows)
+        conn.commit()
+        indexate += len(rows)
+
+    _pastreaza_blocarea(cursor)
+    cursor.execute("UPDATE IndexCautareStare SET Versiune = ? WHERE ID = 1", (versiune,))
+    conn.commit()
+    return indexate
+
+
+def actualizeaza_index(complet=False):
+    """
+    Aduce indexul de căutare la zi cu registrul: reindexează rândurile inserate sau
+    modificate după versiunea indexată (VersiuneRand) și elimină rândurile șterse.
+    Cu `complet=True`, sau dacă indexul nu a fost construit încă, reconstruiește tot
+    indexul. Actualizările sunt serializate între procese printr-o blocare în baza de
+    date; dacă alt proces actualizează indexul, nu face nimic și returnează None.
+    Altfel returnează numărul de rânduri indexate.
+    """
+    backend = get_backend()
+
+    with _actualizare_lock, db_connection() as conn:
+        if not conn:
+            raise ConnectionError("Nu s-a putut obține conexiunea la baza de date")
+
+        cursor = conn.cursor()
+        backend.prepare_bulk_cursor(cursor)
+
+        obtinuta = backend.obtine_blocare(cursor, BLOCARE_INDEX, INDEX_CAUTARE_BLOCARE)
+        conn.commit()
+        if not obtinuta:
+            logging.info("Indexul de căutare este actualizat de alt proces")
+            return None
+        try:
+            indexate = _actualizeaza(conn, cursor, complet)
+        finally:
+            # Scrierile neconfirmate ale unei actualizări întrerupte nu trebuie confirmate odată cu eliberarea
+            conn.rollback()
+            backend.elibereaza_blocare(cursor, BLOCARE_INDEX)
+            conn.commit()
+
+    # Paginile acestui proces folosesc indexul imediat, fără să aștepte expirarea cache-ului
+    _stare_index_cache.set('construit', True)
+    if indexate:
+        logging.info(f"Index de căutare actualizat: {indexate} intervenții reindexate")
+    return indexate
+
+
+def _indexeaza_periodic():
+    while True:
+        # Semnalele primite în timpul actualizării declanșează încă o trecere
+        _modificari.clear()
+        try:
+            actualizeaza_index()
+        except Exception as e:
+            logging.error(f"Eroare la actualizarea indexului de căutare: {str(e)}")
+        _modificari.wait(INDEX_CAUTARE_REFRESH)
+
+
+def porneste_indexare():
+    """
+    Pornește firul de fundal care ține indexul la zi: la fiecare modificare semnalată
+    și cel puțin o dată la INDEX_CAUTARE_REFRESH secunde (acoperă modificările făcute
+    din afara aplicației). Poate fi apelată la fiecare rerun; pornește o singură dată
+    per proces.
+    """
+    global _indexare_pornita
+    with _pornire_lock:
+        if _indexare_pornita:
+            return
+        _indexare_pornita = True
+    threading.Thread(target=_indexeaza_periodic, name='index_cautare', daemon=True).start()
+
+
+def semnaleaza_modificari():
+    """Cere firului de indexare să preia imediat modificările registrului (nu așteaptă)."""
+    _modificari.set()
+
+
+def index_disponibil():
+    """
+    True dacă indexul a fost construit (altfel căutarea folosește LIKE). Starea este
+    păstrată în cache INDEX_CAUTARE_STARE_TTL secunde.
+    """
+    construit = _stare_index_cache.get('construit')
+    if construit is not None:
+        return construit
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return False
+            cursor = conn.cursor()
+            cursor.execute("SELECT Versiune FROM IndexCautareStare WHERE ID = 1")
+            rand = cursor.fetchone()
+            construit = rand is not None and rand[0] is not None
+            _stare_index_cache.set('construit', construit)
+            return construit
+
+    except Exception as e:
+        logging.error(f"Eroare la citirea stării indexului de căutare: {str(e)}")
+        return False
+
+
+def conditie_cautare(text):
+    """
+    Condiția SQL (pe RegistruInterventii.ID) care selectează intervențiile ce conțin
+    toți termenii căutați, fiecare ca prefix al unui cuvânt. Returnează (sql, params)
+    sau (None, []) dacă textul nu conține termeni indexabili.
+    """
+    termeni = termeni_cautare(text)
+    if not termeni:
+        return None, []
+    conditii = ["ID IN (SELECT ID FROM IndexCautare WHERE Termen LIKE ?)"] * len(termeni)
+    return f"({' AND '.join(conditii)})", [f"{termen}%" for termen in termeni]
+
+
+def cauta(text, limit=50):
+    """
+    Caută intervențiile care conțin toți termenii din `text` (fără diacritice,
+    ca prefix de cuvânt). Returnează o listă de dicționare {ID, NrCrt, Scor}, ordonată
+    după relevanță: potrivirile exacte contează dublu față de cele pe prefix, iar
+    termenii din Solicitare mai mult decât cei din Solicitant și Observatii.
+    Fără `limit` returnează toate potrivirile.
+    """
+    termeni = termeni_cautare(text)
+    if not termeni:
+        return []
+
+    subinterogari = []
+    params = []
+    for i, termen in enumerate(termeni):
+        subinterogari.append(f"""
+            (SELECT ID, SUM(CASE WHEN Termen = ? THEN 2 * Pondere ELSE Pondere END) AS Scor
+             FROM IndexCautare
+             WHERE Termen LIKE ?
+             GROUP BY ID) t{i}""")
+        params.extend([termen, f"{termen}%"])
+
+    join = subinterogari[0] + "".join(
+        f"\n            JOIN {sub} ON t{i}.ID = t0.ID"
+        for i, sub in enumerate(subinterogari[1:], start=1)
+    )
+    scor = " + ".join(f"t{i}.Scor" for i in range(len(termeni)))
+    query = f"""
+        SELECT r.ID, r.NrCrt, {scor} AS Scor
+        FROM {join}
+        JOIN RegistruInterventii r ON r.ID = t0.ID
+        ORDER BY Scor DESC, r.DataInterventie DESC, r.NrCrt DESC
+        {get_backend().sql_limit() if limit else ''}
+    """
+    if limit:
+        params.append(limit)
+
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return []
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [{'ID': row[0], 'NrCrt': row[1], 'Scor': row[2]} for row in cursor.fetchall()]
+
+    except Exception as e:
+        logging.error(f"Eroare la căutarea în registru: {str(e)}")
+        return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indexul de căutare al registrului de intervenții.")
+    parser.add_argument('--rebuild', action='store_true', help="reconstruiește tot indexul")
+    parser.add_argument('--cauta', default=None, help="afișează rezultatele pentru un text")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.cauta:
+        for rezultat in cauta(args.cauta):
+            print(f"NrCrt {rezultat['NrCrt']}: scor {rezultat['Scor']}")
+    else:
+        start = time.perf_counter()
+        indexate = actualizeaza_index(complet=args.rebuild)
+        if indexate is None:
+            print("Indexul este actualizat acum de alt proces; reîncercați după ce termină")
+        else:
+            print(f"{indexate} intervenții indexate în {time.perf_counter() - start:.2f}s")
@@ -1,49 +1,41 @@
-import pyodbc
-import configparser
+from contextlib import contextmanager
 from datetime import datetime
 import hashlib
 import os
-from pathlib import Path
 import logging
-from utils import normalize_username
+import threading
+import time
+from backends import get_backend
+from db_pool import get_pool
+from cache import TTLCache
+from metrics import masoara, AUTENTIFICARI
+from db_trace import urmareste, ConexiuneUrmarita
 
 def get_db_connection():
-    """Creează și returnează o conexiune la baza de date."""
+    """Creează și returnează o conexiune nouă la baza de date (folosită de pool)."""
     try:
-        # Încercăm să folosim variabilele de mediu mai întâi
-        host = os.getenv('DB_HOST')
-        port = os.getenv('DB_PORT')
-        database = os.getenv('DB_NAME')
-        user = os.getenv('DB_USER')
-        password = os.getenv('DB_PASSWORD')
-
-        # Dacă nu avem variabile de mediu, folosim config.ini
-        if not all([host, port, database, user, password]):
-            config = configparser.ConfigParser()
-            config_path = Path(__file__).parent / 'config.ini'
-            config.read(config_path)
-            
-            host = config['MySQL']['host']
-            port = config['MySQL']['port']
-            database = config['MySQL']['database']
-            user = config['MySQL']['user']
-            password = config['MySQL']['password']
-
-        conn_str = (
-            "DRIVER={ODBC Driver 18 for SQL Server};"
-            f"SERVER={host},{port};"
-            f"DATABASE={database};"
-            f"UID={user};"
-            f"PWD={password};"
-            "TrustServerCertificate=yes;"
-        )
-        
-        logging.info("Încercare de conectare la baza de date")
-        return pyodbc.connect(conn_str)
+        backend = get_backend()
+        logging.info(f"Încercare de conectare la baza de date ({backend.name})")
+        return backend.connect()
     except Exception as e:
         logging.error(f"Eroare la conectarea la baza de date: {str(e)}")
         return None
 
+@contextmanager
+def db_connection():
+    """
+    Împrumută o conexiune din pool-ul procesului și o returnează la ieșire.
+    Produce None dacă nu s-a putut obține o conexiune.
+    """
+    with get_pool(get_db_connection).connection() as conn:
+        # Interogările sunt urmărite (durată, rânduri, interogări lente; vezi db_trace)
+        conn = urmareste(conn)
+        try:
+            yield conn
+        finally:
+            if isinstance(conn, ConexiuneUrmarita):
+                conn.incheie()
+
 def hash_password(password):
     """Creează un hash pentru parolă folosind SHA-256 cu salt."""
     if not password:
@@ -66,248 +58,614 @@ def hash_password(password):
         salted_password = password_str + salt
         
         # Creăm hash-ul
-        hashed = hashlib.sha256(salted_password.encode()).hexdigest()
-        logging.info(f"Hash creat pentru parolă: {hashed}")
-        return hashed
+        return hashlib.sha256(salted_password.encode()).hexdigest()
         
     except Exception as e:
         logging.error(f"Eroare la crearea hash-ului parolei: {str(e)}")
         return None
 
-def normalize_username(username):
+def _cheie_username(username):
+    """Cheia de căutare a unui username: fără puncte și cu litere mici (ca NumeUtilizatorCheie)."""
+    return (username or '').replace('.', '').strip().lower()
+
+# Harta username-urilor din baza de date, încărcată o singură dată și reîmprospătată
+# la modificări: cheie fără puncte -> NumeUtilizator (plus potrivirile exacte).
+_username_map = None
+_username_map_loaded_at = 0.0
+_username_map_lock = threading.Lock()
+USERNAME_MAP_TTL = float(os.getenv('USERNAME_MAP_TTL', '600'))
+# Intervalul minim între reîncărcările declanșate de un username necunoscut
+USERNAME_MAP_MIN_REFRESH = float(os.getenv('USERNAME_MAP_MIN_REFRESH', '30'))
+
+def _incarca_username_map():
+    """Citește toate username-urile și construiește harta de rezolvare."""
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("Nu s-a putut obține conexiunea la baza de date")
+        
+        cursor = conn.cursor()
+        cursor.execute("SELECT NumeUtilizator FROM Utilizatori")
+        usernames = [row[0] for row in cursor.fetchall()]
+    
+    exacte = {}
+    chei = {}
+    for username in usernames:
+        exacte[username.strip().lower()] = username
+        chei.setdefault(_cheie_username(username), username)
+    logging.info(f"Harta username-urilor încărcată: {len(usernames)} utilizatori")
+    return {'exacte': exacte, 'chei': chei}
+
+def _get_username_map(force=False):
+    global _username_map, _username_map_loaded_at
+    cerut_la = time.monotonic()
+    if not force and _username_map is not None and cerut_la - _username_map_loaded_at < USERNAME_MAP_TTL:
+        return _username_map
+    
+    with _username_map_lock:
+        # Alt fir de execuție a reîncărcat harta cât am așteptat după lock
+        if _username_map is not None and _username_map_loaded_at >= cerut_la:
+            return _username_map
+        try:
+            _username_map = _incarca_username_map()
+            _username_map_loaded_at = time.monotonic()
+        except Exception as e:
+            logging.error(f"Eroare la încărcarea hărții username-urilor: {str(e)}")
+            if _username_map is None:
+                return {'exacte': {}, 'chei': {}}
+    return _username_map
+
+def invalidate_username_map():
+    """Forțează reîncărcarea hărții username-urilor la următoarea rezolvare."""
+    global _username_map_loaded_at
+    _username_map_loaded_at = 0.0
+
+def resolve_username(username):
     """
-    Normalizează username-ul pentru a se potrivi cu formatul din baza de date.
-    Caută username-ul ignorând punctele și apoi returnează formatul corect din baza de date.
+    Returnează NumeUtilizator din baza de date pentru un login cu sau fără puncte
+    (de ex. 'laurentiuhenegariu' -> 'laurentiu.henegariu'), sau None dacă nu există.
+    Rezolvarea se face în memorie; baza de date este citită doar la reîncărcarea hărții.
     """
-    conn = None
-    cursor = None
-    try:
-        conn = get_db_connection()
+    if not username:
+        return None
+    
+    username_map = _get_username_map()
+    gasit = username_map['exacte'].get(username.strip().lower()) or username_map['chei'].get(_cheie_username(username))
+    if gasit or time.monotonic() - _username_map_loaded_at < USERNAME_MAP_MIN_REFRESH:
+        return gasit
+    
+    # Utilizator necunoscut: poate a fost adăugat din alt proces, reîncărcăm harta
+    username_map = _get_username_map(force=True)
+    return username_map['exacte'].get(username.strip().lower()) or username_map['chei'].get(_cheie_username(username))
+
+# Faptele despre utilizator (ID, serviciu, rol) se schimbă rar, dar sunt citite de mai
+# multe ori la fiecare rerun; le păstrăm în cache per utilizator, cu expirare.
+_principal_cache = TTLCache(ttl=float(os.getenv('PRINCIPAL_CACHE_TTL', '300')))
+_NECUNOSCUT = object()
+
+def _fetch_principal(username):
+    """
+    Citește utilizatorul și serviciul lui într-o singură interogare,
+    căutând după cheia indexată NumeUtilizatorCheie (username-ul fără puncte).
+    Returnează (principal, hash_parola) sau (None, None) dacă utilizatorul nu există.
+    """
+    query = """
+        SELECT u.ID, u.NumeUtilizator, u.Parola, u.ServiciuID, s.Nume AS Serviciu, u.EsteManager
+        FROM Utilizatori u
+        LEFT JOIN Servicii s ON u.ServiciuID = s.ID
+        WHERE u.NumeUtilizatorCheie = ?
+        ORDER BY CASE WHEN u.NumeUtilizator = ? THEN 0 ELSE 1 END
+    """
+    
+    with db_connection() as conn:
         if not conn:
-            logging.warning(f"Nu s-a putut obține conexiunea la baza de date în normalize_username pentru {username}")
-            return username
-            
-        cursor = conn.cursor()
-        
-        # Căutăm username-ul ignorând punctele
-        clean_username = username.replace('.', '')
-        query = """
-            SELECT NumeUtilizator 
-            FROM Utilizatori 
-            WHERE REPLACE(NumeUtilizator, '.', '') = ?
-        """
-        
-        logging.info(f"Căutăm username: {username}, curățat: {clean_username}")
-        cursor.execute(query, (clean_username,))
-        result = cursor.fetchone()
-        
-        if result:
-            logging.info(f"Am găsit un username potrivit în baza de date: {result[0]}")
-            return result[0]
-            
-        # Dacă nu găsim nimic, returnăm username-ul original
-        logging.info(f"Nu am găsit un username potrivit pentru {username}")
-        return username
+            raise ConnectionError("Nu s-a putut obține conexiunea la baza de date")
         
+        cursor = conn.cursor()
+        cursor.execute(query, (_cheie_username(username), username))
+        row = cursor.fetchone()
+    
+    if not row:
+        return None, None
+    
+    principal = {
+        'user_id': row[0],
+        'username': row[1],
+        'serviciu_id': row[3],
+        'serviciu': row[4],
+        'este_manager': row[5] == 1,
+        'este_it': row[4] == 'IT',
+    }
+    return principal, row[2]
+
+@masoara
+def load_principal(username, refresh=False):
+    """
+    Returnează datele utilizatorului (ID, username din baza de date, serviciu, rol de șef)
+    sau None dacă utilizatorul nu există. Rezultatul este păstrat în cache.
+    """
+    if not username:
+        return None
+    
+    key = _cheie_username(username)
+    if not refresh:
+        cached = _principal_cache.get(key, _NECUNOSCUT)
+        if cached is not _NECUNOSCUT:
+            return cached
+        # Un username care nu apare în hartă nu există în baza de date; nu mai interogăm
+        if resolve_username(username) is None:
+            return None
+    
+    try:
+        principal, _ = _fetch_principal(username)
     except Exception as e:
-        logging.error(f"Eroare în normalize_username: {str(e)}")
-        return username
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        # Nu păstrăm în cache erorile, ca următorul apel să reîncerce
+        logging.error(f"Eroare la încărcarea datelor utilizatorului {username}: {str(e)}")
+        return None
+    
+    _principal_cache.set(key, principal)
+    return principal
+
+def invalidate_principal(username=None):
+    """Elimină din cache datele unui utilizator sau, fără argument, ale tuturor."""
+    _principal_cache.invalidate(_cheie_username(username) if username else None)
+
+def normalize_username(username):
+    """
+    Normalizează username-ul pentru a se potrivi cu formatul din baza de date.
+    Caută username-ul ignorând punctele și apoi returnează formatul corect din baza de date.
+    """
+    # Dacă nu găsim nimic, returnăm username-ul original
+    return resolve_username(username) or username
 
+@masoara
 def verify_credentials(username, password=None):
     """Verifică credențialele utilizatorului în baza de date."""
-    conn = None
-    cursor = None
     try:
-        logging.info("\n=== Începe verificarea credențialelor ===")
-        logging.info(f"Username primit: {username}")
-        logging.info(f"Parolă primită: {'[NONE]' if password is None else '[SET]'}")
-        
-        conn = get_db_connection()
-        if not conn:
-            logging.error("Nu s-a putut realiza conexiunea la baza de date")
-            return {'success': False, 'message': 'Eroare la conectarea la baza de date'}
-        
-        cursor = conn.cursor()
-        
-        # Mai întâi găsim utilizatorul pentru a verifica dacă există
-        find_user_query = """
-            SELECT u.ID, u.NumeUtilizator, u.Parola, s.Nume as Serviciu, u.EsteManager
-            FROM Utilizatori u
-            JOIN Servicii s ON u.ServiciuID = s.ID
-            WHERE u.NumeUtilizator = ?
-        """
-        
-        normalized_username = normalize_username(username)
-        logging.info(f"Username normalizat: {normalized_username}")
-        
-        cursor.execute(find_user_query, (normalized_username,))
-        user = cursor.fetchone()
-        
-        if not user:
-            logging.info("Utilizatorul nu a fost găsit în baza de date")
-            return {'success': False, 'message': 'Credențiale invalide'}
-            
-        logging.info(f"Utilizator găsit: ID={user[0]}, Username={user[1]}")
-            
-        # Dacă verificăm doar username-ul (pentru sesiune), returnăm success
+        # Dacă verificăm doar username-ul (pentru sesiune), ne ajunge principalul din cache
         if password is None:
-            logging.info("Verificare doar username pentru sesiune")
-            return {
-                'success': True,
-                'user_id': user[0],
-                'username': user[1],
-                'serviciu': user[3],
-                'este_manager': user[4] == 1
-            }
+            principal = load_principal(username)
+            if not principal:
+                logging.info(f"Utilizatorul {username} nu a fost găsit în baza de date")
+                return {'success': False, 'message': 'Credențiale invalide'}
+            return dict(principal, success=True)
+        
+        # La autentificare citim mereu din baza de date și reîmprospătăm cache-ul
+        principal, stored_password = _fetch_principal(username)
+        _principal_cache.set(_cheie_username(username), principal)
+        
+        if not principal:
+            logging.info(f"Utilizatorul {username} nu a fost găsit în baza de date")
+            AUTENTIFICARI.inc(result='failure')
+            return {'success': False, 'message': 'Credențiale invalide'}
         
         # Verificăm dacă parola introdusă este goală
         if not password:
             logging.warning("Parola introdusă este goală")
+            AUTENTIFICARI.inc(result='failure')
             return {'success': False, 'message': 'Parola invalidă'}
             
         # Comparăm parola introdusă cu cea din baza de date
-        stored_password = user[2].strip() if user[2] else ''
+        stored_password = stored_password.strip() if stored_password else ''
         hashed_input_password = hash_password(password)
         
-        logging.info("\n=== Verificare parolă ===")
-        logging.info(f"Hash pentru parola corectă '12345': {hash_password('12345')}")
-        logging.info(f"Hash pentru parola introdusă: {hashed_input_password}")
-        logging.info(f"Hash stocat în baza de date: {stored_password}")
-        
         if not hashed_input_password:
             logging.error("Nu s-a putut genera hash-ul pentru parola introdusă")
+            AUTENTIFICARI.inc(result='error')
             return {'success': False, 'message': 'Eroare la procesarea parolei'}
             
         if hashed_input_password != stored_password:
-            logging.info("\nPAROLĂ INVALIDĂ!")
-            logging.info(f"Hash-urile nu se potrivesc:")
-            logging.info(f"Hash parola introdusă : {hashed_input_password}")
-            logging.info(f"Hash stocat în DB    : {stored_password}")
+            logging.info(f"Parolă invalidă pentru utilizatorul {principal['username']}")
+            AUTENTIFICARI.inc(result='failure')
             return {'success': False, 'message': 'Credențiale invalide'}
         
-        logging.info("\n=== Autentificare reușită ===")
-        logging.info(f"User ID: {user[0]}")
-        logging.info(f"Username: {user[1]}")
-        logging.info(f"Serviciu: {user[3]}")
-        logging.info(f"Este manager: {user[4] == 1}")
-        
-        return {
-            'success': True,
-            'user_id': user[0],
-            'username': user[1],
-            'serviciu': user[3],
-            'este_manager': user[4] == 1
-        }
+        logging.debug(
+            f"Credențiale verificate: ID={principal['user_id']}, Username={principal['username']}, "
+            f"Serviciu={principal['serviciu']}, Manager={principal['este_manager']}"
+        )
+        AUTENTIFICARI.inc(result='success')
+        return dict(principal, success=True)
         
     except Exception as e:
         logging.error(f"Eroare în timpul verificării credențialelor: {str(e)}")
+        if password is not None:
+            AUTENTIFICARI.inc(result='error')
         return {'success': False, 'message': f'Eroare de conectare: {str(e)}'}
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
+@masoara
 def get_user_service(username):
     """Obține serviciul asociat unui utilizator."""
-    conn = None
-    cursor = None
+    principal = load_principal(username)
+    if principal:
+        return principal['serviciu']
+    logging.info(f"Nu am găsit serviciul pentru utilizator {username}")
+    return None
+
+# Variantele de scriere ale statusului inițial întâlnite în registru
+STATUSURI_IN_ASTEPTARE = ('In Asteptare', 'In asteptare', 'in asteptare')
+# Aceeași condiție cu literali, ca în indexul IX_RegistruInterventii_InAsteptare
+# (un index parțial/filtrat nu este folosit pentru o condiție cu parametri)
+_CONDITIE_IN_ASTEPTARE = "Status IN ({})".format(', '.join(f"'{s}'" for s in STATUSURI_IN_ASTEPTARE))
+
+# Coloanele citite din registru, în ordinea afișării
+COLOANE_REGISTRU = """
+    NrCrt,
+    DataInterventie,
+    Zi,
+    Solicitant,
+    Solicitare,
+    Ora,
+    DurataInterventie,
+    PersonalITC,
+    Observatii,
+    Status,
+    DataAprobare,
+    AprobatDe
+"""
+
+COLOANE_REGISTRU_LISTA = [c.strip() for c in COLOANE_REGISTRU.split(',')]
+
+# Numărul de rânduri citite odată din cursor și dimensiunea unui lot de `iter_interventii` (exporturi)
+FETCH_CHUNK = int(os.getenv('DB_FETCH_CHUNK', '5000'))
+
+# Coloanele cu puține valori distincte, păstrate ca pandas Categorical
+COLOANE_CATEGORIALE = ('Zi', 'PersonalITC', 'Status')
+
+def _coloane_din_cursor(cursor, chunk_size=None):
+    """Citește rezultatul cursorului în loturi, direct în liste per coloană."""
+    columns = [column[0] for column in cursor.description]
+    valori = [[] for _ in columns]
+    while True:
+        rows = cursor.fetchmany(chunk_size or FETCH_CHUNK)
+        if not rows:
+            break
+        # Transpunem lotul: un singur extend per coloană, fără dicționare per rând
+        for coloana, lot in zip(valori, zip(*rows)):
+            coloana.extend(lot)
+    return columns, valori
+
+def cadru_registru(columns, valori):
+    """
+    Construiește DataFrame-ul tipizat al registrului din coloanele citite cu
+    `_coloane_din_cursor`: DataInterventie și DataAprobare ca datetime64, DurataInterventie
+    și NrCrt ca întregi (Int32/Int64, cu <NA> pentru valorile lipsă), Zi/PersonalITC/Status
+    categoriale și Ora categorială, cu text 'HH:MM:SS'.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    date = {}
+    for nume, coloana in zip(columns, valori):
+        if nume in ('DataInterventie', 'DataAprobare'):
+            date[nume] = pd.DatetimeIndex(coloana)
+        elif nume == 'Ora':
+            # Puține valori distincte: doar categoriile sunt transformate în text
+            ora = pd.Categorical(coloana)
+            date[nume] = ora.rename_categories(ora.categories.astype(str))
+        elif nume == 'DurataInterventie':
+            date[nume] = pd.array(coloana, dtype='Int32')
+        elif nume == 'ID':
+            date[nume] = np.fromiter(coloana, dtype=np.int64, count=len(coloana))
+        elif nume == 'NrCrt':
+            date[nume] = pd.array(coloana, dtype='Int64')
+        elif nume in COLOANE_CATEGORIALE:
+            date[nume] = pd.Categorical(coloana)
+        else:
+            date[nume] = np.array(coloana, dtype=object)
+    return pd.DataFrame(date, columns=columns, copy=False)
+
+def cadru_registru_gol():
+    coloane = ['ID'] + COLOANE_REGISTRU_LISTA
+    return cadru_registru(coloane, [[] for _ in coloane])
+
+def _pagina_goala():
+    """Rezultatul unei citiri de pagină eșuate: un cadru gol, fără cursor și fără total."""
+    return {'rows': cadru_registru_gol(), 'next_cursor': None, 'total': None}
+
+def _conditie_keyset(cursor):
+    """
+    Construiește condiția WHERE care selectează rândurile de după `cursor`
+    în ordinea (DataInterventie DESC, Ora DESC, NrCrt DESC).
+    Ora poate lipsi (NULL); în ordinea descrescătoare aceste rânduri vin ultimele în ziua lor.
+    """
+    data, ora, nr_crt = cursor
+    if ora is None:
+        return (
+            "(DataInterventie < ? OR (DataInterventie = ? AND Ora IS NULL AND NrCrt < ?))",
+            [data, data, nr_crt]
+        )
+    return (
+        "(DataInterventie < ? OR (DataInterventie = ? AND "
+        "(Ora < ? OR Ora IS NULL OR (Ora = ? AND NrCrt < ?))))",
+        [data, data, ora, ora, nr_crt]
+    )
+
+def _escape_like(text):
+    """Escapează caracterele speciale pentru LIKE (folosit cu ESCAPE '\\')."""
+    return (
+        text.replace('\\', '\\\\')
+            .replace('%', '\\%')
+            .replace('_', '\\_')
+            .replace('[', '\\[')
+    )
+
+def _conditii_filtre(filtre):
+    """
+    Traduce filtrele din pagină în condiții SQL parametrizate.
+
+    Chei acceptate în `filtre` (toate opționale):
+    - `personal_itc`: numele exact din coloana PersonalITC;
+    - `data_start`, `data_end`: intervalul (inclusiv) pentru DataInterventie;
+    - `text`: text căutat în Solicitant, Solicitare și Observatii, prin indexul de
+      căutare (fără diacritice, pe prefix de cuvânt; vezi `cautare.py`). Indexul este
+      actualizat de firul de fundal din `cautare.py`, nu la interogare.
+    """
+    conditii = []
+    params = []
+    if not filtre:
+        return conditii, params
+    
+    if filtre.get('personal_itc'):
+        conditii.append("PersonalITC = ?")
+        params.append(filtre['personal_itc'])
+    if filtre.get('data_start'):
+        conditii.append("DataInterventie >= ?")
+        params.append(filtre['data_start'])
+    if filtre.get('data_end'):
+        conditii.append("DataInterventie <= ?")
+        params.append(filtre['data_end'])
+    if filtre.get('text'):
+        from cautare import conditie_cautare, index_disponibil
+        conditie, params_cautare = conditie_cautare(filtre['text'])
+        if conditie and index_disponibil():
+            conditii.append(conditie)
+            params.extend(params_cautare)
+        else:
+            # Textul nu conține termeni indexabili (de ex. o singură literă) sau indexul
+            # nu a fost construit încă
+            pattern = f"%{_escape_like(filtre['text'].strip())}%"
+            conditii.append(
+                "(Solicitant LIKE ? ESCAPE '\\' OR Solicitare LIKE ? ESCAPE '\\'"
+                " OR Observatii LIKE ? ESCAPE '\\')"
+            )
+            params.extend([pattern, pattern, pattern])
+    return conditii, params
+
+@masoara
+def get_interventii_pagina(page_size=50, cursor=None, include_total=False, filtre=None):
+    """
+    Obține o pagină din registru, folosind paginare keyset pe (DataInterventie, Ora, NrCrt).
+
+    `cursor` este valoarea `next_cursor` a paginii anterioare (None pentru prima pagină),
+    iar `filtre` sunt aplicate direct în interogare (vezi `_conditii_filtre`).
+    Returnează un dicționar cu `rows` (DataFrame tipizat, vezi `cadru_registru`),
+    `next_cursor` (None pe ultima pagină) și `total` (numărul de intervenții care
+    corespund filtrelor, doar dacă `include_total` este setat).
+    """
+    rezultat = {'rows': None, 'next_cursor': None, 'total': None}
     try:
-        conn = get_db_connection()
-        if not conn:
-            logging.error("Nu s-a putut obține conexiunea la baza de date")
-            return None
-        
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT s.Nume
-            FROM Utilizatori u
-            JOIN Servicii s ON u.ServiciuID = s.ID
-            WHERE u.NumeUtilizator = ?
+        conditii_filtre, params_filtre = _conditii_filtre(filtre)
+        conditii = list(conditii_filtre)
+        params = list(params_filtre)
+        if cursor is not None:
+            conditie, params_cursor = _conditie_keyset(cursor)
+            conditii.append(conditie)
+            params.extend(params_cursor)
+        where = f"WHERE {' AND '.join(conditii)}" if conditii else ""
+        
+        # Citim un rând în plus ca să știm dacă mai există o pagină
+        query = f"""
+            SELECT {COLOANE_REGISTRU}
+            FROM RegistruInterventii
+            {where}
+            ORDER BY DataInterventie DESC, Ora DESC, NrCrt DESC
+            {get_backend().sql_limit()}
         """
         
-        # Normalizăm username-ul
-        normalized_username = normalize_username(username)
-        logging.info(f"Obținem serviciul pentru username normalizat: {normalized_username}")
-        
-        cursor.execute(query, (normalized_username,))
-        result = cursor.fetchone()
-        
-        if result:
-            logging.info(f"Am găsit serviciul {result[0]} pentru utilizator {normalized_username}")
-            return result[0]
-        logging.info(f"Nu am găsit serviciul pentru utilizator {normalized_username}")
-        return None
+        with db_connection() as conn:
+            if not conn:
+                return _pagina_goala()
+            
+            cursor_db = conn.cursor()
+            cursor_db.execute(query, params + [page_size + 1])
+            columns, valori = _coloane_din_cursor(cursor_db)
+            
+            if include_total:
+                where_filtre = f"WHERE {' AND '.join(conditii_filtre)}" if conditii_filtre else ""
+                cursor_db.execute(f"SELECT COUNT(*) FROM RegistruInterventii {where_filtre}", params_filtre)
+                rezultat['total'] = cursor_db.fetchone()[0]
+        
+        if len(valori[0]) > page_size:
+            valori = [coloana[:page_size] for coloana in valori]
+            # Cursorul păstrează valorile citite din baza de date, nu cele din DataFrame
+            ultimul = dict(zip(columns, (coloana[-1] for coloana in valori)))
+            rezultat['next_cursor'] = (ultimul['DataInterventie'], ultimul['Ora'], ultimul['NrCrt'])
+        rezultat['rows'] = cadru_registru(columns, valori)
+        return rezultat
         
     except Exception as e:
-        logging.error(f"Eroare la obținerea serviciului: {str(e)}")
-        return None
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
-def get_interventii():
-    """Obține toate intervențiile din registru."""
+        logging.error(f"Eroare la obținerea paginii de intervenții: {str(e)}")
+        return _pagina_goala()
+
+@masoara
+def get_interventii_in_asteptare(page_size=25, cursor=None, include_total=False):
+    """
+    Obține o pagină din coada de aprobare: intervențiile în așteptare, cele mai vechi
+    primele, cu paginare keyset pe (DataInterventie, ID).
+
+    `cursor` este valoarea `next_cursor` a paginii anterioare (None pentru prima pagină).
+    Returnează un dicționar cu `rows` (DataFrame tipizat, vezi `cadru_registru`),
+    `next_cursor` (None pe ultima pagină) și `total` (toate intervențiile în așteptare,
+    doar dacă `include_total` este setat).
+    """
+    rezultat = {'rows': None, 'next_cursor': None, 'total': None}
     try:
-        conn = get_db_connection()
-        if not conn:
-            return []
-        
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT 
-                NrCrt,
-                DataInterventie,
-                Zi,
-                Solicitant,
-                Solicitare,
-                Ora,
-                DurataInterventie,
-                PersonalITC,
-                Observatii,
-                Status,
-                DataAprobare,
-                AprobatDe
+        conditii = [_CONDITIE_IN_ASTEPTARE]
+        params = []
+        if cursor is not None:
+            # Prima condiție permite căutarea în index de la data cursorului
+            conditii.append("DataInterventie >= ? AND (DataInterventie > ? OR ID > ?)")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+        
+        # Citim un rând în plus ca să știm dacă mai există o pagină
+        query = f"""
+            SELECT ID, {COLOANE_REGISTRU}
             FROM RegistruInterventii
-            ORDER BY DataInterventie DESC, Ora DESC
+            WHERE {' AND '.join(conditii)}
+            ORDER BY DataInterventie, ID
+            {get_backend().sql_limit()}
         """
         
-        cursor.execute(query)
-        columns = [column[0] for column in cursor.description]
-        results = []
+        with db_connection() as conn:
+            if not conn:
+                return _pagina_goala()
+            
+            cursor_db = conn.cursor()
+            cursor_db.execute(query, params + [page_size + 1])
+            columns, valori = _coloane_din_cursor(cursor_db)
+            
+            if include_total:
+                cursor_db.execute(f"SELECT COUNT(*) FROM RegistruInterventii WHERE {_CONDITIE_IN_ASTEPTARE}")
+                rezultat['total'] = cursor_db.fetchone()[0]
+        
+        if len(valori[0]) > page_size:
+            valori = [coloana[:page_size] for coloana in valori]
+            rezultat['next_cursor'] = (
+                valori[columns.index('DataInterventie')][-1], valori[columns.index('ID')][-1]
+            )
+        rezultat['rows'] = cadru_registru(columns, valori)
+        return rezultat
         
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
+    except Exception as e:
+        logging.error(f"Eroare la obținerea cozii de aprobare: {str(e)}")
+        return _pagina_goala()
+
+def iter_interventii(filtre=None, chunk_size=None):
+    """
+    Generează registrul (cu `filtre`, ca în `get_interventii_pagina`) în loturi de cel mult
+    `chunk_size` rânduri (DataFrame-uri tipizate, vezi `cadru_registru`), în ordinea
+    numerotării: (DataInterventie, ID).
+    Fiecare lot este citit cu o interogare keyset separată, deci conexiunea nu rămâne
+    ocupată între loturi. Spre deosebire de celelalte funcții, erorile sunt propagate,
+    ca un export incomplet să nu pară reușit.
+    """
+    chunk_size = chunk_size or FETCH_CHUNK
+    conditii_filtre, params_filtre = _conditii_filtre(filtre)
+    ultimul = None
+    while True:
+        conditii = list(conditii_filtre)
+        params = list(params_filtre)
+        if ultimul is not None:
+            conditii.append("(DataInterventie > ? OR (DataInterventie = ? AND ID > ?))")
+            params.extend([ultimul[0], ultimul[0], ultimul[1]])
+        where = f"WHERE {' AND '.join(conditii)}" if conditii else ""
+        query = f"""
+            SELECT ID, {COLOANE_REGISTRU}
+            FROM RegistruInterventii
+            {where}
+            ORDER BY DataInterventie, ID
+            {get_backend().sql_limit()}
+        """
+        with db_connection() as conn:
+            if not conn:
+                raise ConnectionError("Nu s-a putut obține conexiunea la baza de date")
+            cursor = conn.cursor()
+            cursor.execute(query, params + [chunk_size])
+            columns, valori = _coloane_din_cursor(cursor, chunk_size)
+
+        randuri = len(valori[0])
+        if not randuri:
+            return
+        yield cadru_registru(columns, valori)
+        if randuri < chunk_size:
+            return
+        ultimul = (valori[columns.index('DataInterventie')][-1], valori[columns.index('ID')][-1])
+
+# Statisticile sunt cerute la fiecare rerun cu aceleași filtre; le păstrăm scurt timp în cache
+_statistici_cache = TTLCache(ttl=float(os.getenv('STATISTICI_CACHE_TTL', '60')))
+
+def _cheie_filtre(filtre):
+    return tuple(sorted((k, v) for k, v in (filtre or {}).items() if v))
+
+def invalidate_statistici():
+    """Golește cache-ul de statistici (apelat după fiecare modificare a registrului)."""
+    _statistici_cache.invalidate()
+
+@masoara
+def get_statistici(filtre=None):
+    """
+    Calculează în baza de date statisticile registrului pentru filtrele date
+    (aceleași filtre ca `get_interventii_pagina`), cu un singur GROUP BY Status, PersonalITC.
+    Fără filtre, statisticile sunt citite din agregatele RaportLunar.
+
+    Returnează totalurile (`total`, `aprobate`, `in_asteptare`, `respinse`, `durata_totala`)
+    și, în `detalii`, câte un rând pentru fiecare combinație status / personal IT.
+    """
+    cheie = _cheie_filtre(filtre)
+    statistici = _statistici_cache.get(cheie)
+    if statistici is not None:
+        return statistici
+    
+    statistici = {
+        'total': 0,
+        'aprobate': 0,
+        'in_asteptare': 0,
+        'respinse': 0,
+        'durata_totala': 0,
+        'detalii': []
+    }
+    try:
+        conditii, params = _conditii_filtre(filtre)
+        if conditii:
+            query = f"""
+                SELECT Status, PersonalITC, COUNT(*) AS NrInterventii, SUM(DurataInterventie) AS DurataTotala
+                FROM RegistruInterventii
+                WHERE {' AND '.join(conditii)}
+                GROUP BY Status, PersonalITC
+            """
+        else:
+            # Fără filtre citim agregatele lunare ținute la zi de triggere (rapoarte.py)
+            query = """
+                SELECT Status, NULLIF(PersonalITC, ''), SUM(NrInterventii), SUM(DurataTotala)
+                FROM RaportLunar
+                GROUP BY Status, PersonalITC
+            """
+        
+        with db_connection() as conn:
+            if not conn:
+                return statistici
             
-        return results
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        
+        for status, personal_itc, numar, durata in rows:
+            durata = durata or 0
+            statistici['total'] += numar
+            statistici['durata_totala'] += durata
+            if status == 'Aprobat':
+                statistici['aprobate'] += numar
+            elif status == 'Respins':
+                statistici['respinse'] += numar
+            elif status in STATUSURI_IN_ASTEPTARE:
+                statistici['in_asteptare'] += numar
+            statistici['detalii'].append({
+                'Status': status,
+                'PersonalITC': personal_itc,
+                'NrInterventii': numar,
+                'DurataTotala': durata
+            })
+        
+        _statistici_cache.set(cheie, statistici)
+        return statistici
         
     except Exception as e:
-        logging.error(f"Eroare la obținerea intervențiilor: {str(e)}")
-        return []
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
+        logging.error(f"Eroare la calcularea statisticilor: {str(e)}")
+        return statistici
 
+@masoara
 def adauga_interventie(data_interventie, zi, solicitant, solicitare, ora, durata, personal_itc, observatii, serviciu_id):
     """Adaugă o nouă intervenție în registru."""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return False
-        
-        cursor = conn.cursor()
-        
         # Validăm lungimea textului pentru solicitare
         if len(solicitare) > 1000:
             logging.warning("Textul solicitării este prea lung (maxim 1000 caractere)")
@@ -340,254 +698,284 @@ def adauga_interventie(data_interventie, zi, solicitant, solicitare, ora, durata
             'In Asteptare'      # Status initial
         )
         
-        cursor.execute(query, params)
-        conn.commit()
+        with db_connection() as conn:
+            if not conn:
+                return False
+            
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            conn.commit()
+        
+        invalidate_statistici()
+        semnaleaza_index_cautare()
         return True
         
     except Exception as e:
         logging.error(f"Eroare la adăugarea intervenției: {str(e)}")
         return False
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
 
+# Datele de referință (personalul IT, serviciile) se schimbă rar și sunt cerute la fiecare rerun;
+# cache-ul este golit explicit la orice modificare a utilizatorilor sau serviciilor
+_referinte_cache = TTLCache(ttl=float(os.getenv('REFERINTE_CACHE_TTL', '300')))
+
+def invalidate_referinte():
+    """Golește cache-ul datelor de referință (apelat după modificarea utilizatorilor sau serviciilor)."""
+    _referinte_cache.invalidate()
+
+def referinte_cache_stats():
+    """Accesările găsite/ratate ale cache-ului datelor de referință."""
+    return _referinte_cache.stats()
+
+@masoara
 def get_servicii():
     """Obține lista tuturor serviciilor."""
+    servicii = _referinte_cache.get('servicii')
+    if servicii is not None:
+        return dict(servicii)
     try:
-        conn = get_db_connection()
-        if not conn:
-            return {}
-        
-        cursor = conn.cursor()
-        
-        query = "SELECT ID, Nume FROM Servicii ORDER BY Nume"
-        cursor.execute(query)
+        with db_connection() as conn:
+            if not conn:
+                return {}
+            
+            cursor = conn.cursor()
+            
+            query = "SELECT ID, Nume FROM Servicii ORDER BY Nume"
+            cursor.execute(query)
+            
+            servicii = {row[1]: row[0] for row in cursor.fetchall()}
         
-        return {row.Nume: row.ID for row in cursor.fetchall()}
+        _referinte_cache.set('servicii', servicii)
+        return dict(servicii)
         
     except Exception as e:
         logging.error(f"Eroare la obținerea serviciilor: {str(e)}")
         return {}
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
 
+@masoara
 def is_sef_birou(username):
     """Verifică dacă utilizatorul este șef de birou."""
+    principal = load_principal(username)
+    return bool(principal and principal['este_manager'])
+
+# Numărul maxim de NrCrt trimise într-o singură instrucțiune (SQL Server acceptă cel mult 2100 de parametri)
+_LOT_APROBARE = 1000
+
+def _aproba_interventii(nr_crts, approved_by, action):
+    """
+    Aprobă sau respinge mai multe intervenții într-o singură tranzacție.
+    Doar intervențiile aflate încă în așteptare sunt actualizate.
+
+    Returnează rezultatul pentru fiecare NrCrt: 'actualizat', 'deja_procesat',
+    'negasit' sau, dacă tranzacția a eșuat, 'eroare'.
+    """
+    nr_crts = list(dict.fromkeys(int(nr) for nr in nr_crts))
+    rezultate = {nr: 'negasit' for nr in nr_crts}
+    if not nr_crts:
+        return rezultate
+    
+    logging.info(f"Procesare în lot: {len(nr_crts)} intervenții, acțiune {action}, de {approved_by}")
+    statusuri = ', '.join('?' for _ in STATUSURI_IN_ASTEPTARE)
     try:
-        conn = get_db_connection()
-        if not conn:
-            logging.warning("Nu s-a putut obține conexiunea în is_sef_birou")
-            return False
-        
-        cursor = conn.cursor()
-        normalized_username = normalize_username(username)
-        
-        query = """
-            SELECT EsteManager
-            FROM Utilizatori
-            WHERE NumeUtilizator = ?
-        """
-        
-        logging.info(f"Verificare rol șef pentru utilizatorul {normalized_username}")
-        cursor.execute(query, (normalized_username,))
-        result = cursor.fetchone()
+        with db_connection() as conn:
+            if not conn:
+                logging.error("Nu s-a putut realiza conexiunea la baza de date")
+                return {nr: 'eroare' for nr in nr_crts}
+            
+            cursor = conn.cursor()
+            for i in range(0, len(nr_crts), _LOT_APROBARE):
+                lot = nr_crts[i:i + _LOT_APROBARE]
+                lista = ', '.join('?' for _ in lot)
+                
+                cursor.execute(
+                    f"SELECT NrCrt, Status FROM RegistruInterventii WHERE NrCrt IN ({lista})",
+                    lot
+                )
+                in_asteptare = []
+                for nr, status in cursor.fetchall():
+                    if status in STATUSURI_IN_ASTEPTARE:
+                        in_asteptare.append(nr)
+                    else:
+                        rezultate[nr] = 'deja_procesat'
+                if not in_asteptare:
+                    continue
+                
+                lista = ', '.join('?' for _ in in_asteptare)
+                cursor.execute(f"""
+                    UPDATE RegistruInterventii
+                    SET Status = ?,
+                        DataAprobare = {get_backend().sql_now()},
+                        AprobatDe = ?
+                    WHERE NrCrt IN ({lista}) AND Status IN ({statusuri})
+                """, [action, approved_by] + in_asteptare + list(STATUSURI_IN_ASTEPTARE))
+                
+                if cursor.rowcount == len(in_asteptare):
+                    rezultate.update({nr: 'actualizat' for nr in in_asteptare})
+                    continue
+                
+                # Altcineva a procesat între timp o parte din intervenții; verificăm care sunt ale noastre
+                cursor.execute(
+                    f"SELECT NrCrt, Status, AprobatDe FROM RegistruInterventii WHERE NrCrt IN ({lista})",
+                    in_asteptare
+                )
+                for nr, status, aprobat_de in cursor.fetchall():
+                    rezultate[nr] = 'actualizat' if status == action and aprobat_de == approved_by else 'deja_procesat'
+            
+            conn.commit()
         
-        if result and result[0] == 1:
-            logging.info(f"Utilizatorul {normalized_username} ESTE șef de birou")
-            return True
-        else:
-            logging.info(f"Utilizatorul {normalized_username} NU este șef de birou")
-            return False
+        invalidate_statistici()
+        actualizate = sum(1 for r in rezultate.values() if r == 'actualizat')
+        logging.info(f"Lot finalizat: {actualizate} din {len(nr_crts)} intervenții actualizate")
+        return rezultate
         
     except Exception as e:
-        logging.error(f"Eroare la verificarea rolului: {str(e)}")
-        return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        logging.error(f"Eroare la procesarea în lot a intervențiilor: {str(e)}")
+        return {nr: 'eroare' for nr in nr_crts}
 
+@masoara
 def aproba_interventie(nr_crt, approved_by, action='Aprobat'):
-    """Aprobă sau respinge o intervenție direct în baza de date."""
+    """
+    Aprobă sau respinge o intervenție direct în baza de date.
+
+    Dacă `nr_crt` este o listă de numere, toate sunt procesate într-o singură
+    tranzacție și se returnează rezultatul per NrCrt (vezi `_aproba_interventii`).
+    """
+    if isinstance(nr_crt, (list, tuple, set)):
+        return _aproba_interventii(nr_crt, approved_by, action)
+    
     try:
-        conn = get_db_connection()
-        if not conn:
-            logging.error("Nu s-a putut realiza conexiunea la baza de date")
-            return False
-        
-        cursor = conn.cursor()
-        logging.info("\n=== Aprobare intervenție ===")
-        logging.info(f"Nr. crt: {nr_crt}")
-        logging.info(f"Aprobat de: {approved_by}")
-        logging.info(f"Acțiune: {action}")
-        
-        # Facem update direct în baza de date
-        query = """
-            UPDATE RegistruInterventii 
-            SET Status = ?, 
-                DataAprobare = GETDATE(), 
-                AprobatDe = ? 
-            WHERE NrCrt = ?
-        """
-        
-        cursor.execute(query, (action, approved_by, nr_crt))
-        
-        # Verificăm câte rânduri au fost afectate
-        rows_affected = cursor.rowcount
-        logging.info(f"Rânduri afectate: {rows_affected}")
-        
-        if rows_affected > 0:
-            conn.commit()
-            logging.info("Tranzacție finalizată cu succes")
-            return True
+        with db_connection() as conn:
+            if not conn:
+                logging.error("Nu s-a putut realiza conexiunea la baza de date")
+                return False
             
-        logging.info("Nu s-a găsit intervenția pentru actualizare")
-        return False
+            cursor = conn.cursor()
+            logging.info("\n=== Aprobare intervenție ===")
+            logging.info(f"Nr. crt: {nr_crt}")
+            logging.info(f"Aprobat de: {approved_by}")
+            logging.info(f"Acțiune: {action}")
+            
+            # Facem update direct în baza de date
+            query = f"""
+                UPDATE RegistruInterventii 
+                SET Status = ?, 
+                    DataAprobare = {get_backend().sql_now()}, 
+                    AprobatDe = ? 
+                WHERE NrCrt = ?
+            """
+            
+            cursor.execute(query, (action, approved_by, nr_crt))
+            
+            # Verificăm câte rânduri au fost afectate
+            rows_affected = cursor.rowcount
+            logging.info(f"Rânduri afectate: {rows_affected}")
+            
+            if rows_affected > 0:
+                conn.commit()
+                invalidate_statistici()
+                logging.info("Tranzacție finalizată cu succes")
+                return True
+                
+            logging.info("Nu s-a găsit intervenția pentru actualizare")
+            return False
         
     except Exception as e:
         logging.error(f"Eroare la procesarea intervenției: {str(e)}")
         return False
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
-            logging.info("Conexiune închisă")
 
+@masoara
 def sterge_toate_interventiile():
     """Șterge toate intervențiile din baza de date."""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return False
-        
-        cursor = conn.cursor()
+        with db_connection() as conn:
+            if not conn:
+                return False
+            
+            cursor = conn.cursor()
+            
+            query = "DELETE FROM RegistruInterventii"
+            cursor.execute(query)
+            conn.commit()
         
-        query = "DELETE FROM RegistruInterventii"
-        cursor.execute(query)
-        conn.commit()
+        invalidate_statistici()
         return True
         
     except Exception as e:
         logging.error(f"Eroare la ștergerea intervențiilor: {str(e)}")
         return False
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
-
-def import_interventii_csv(file_path):
-    """Importă intervenții din fișier CSV."""
+
+def semnaleaza_index_cautare():
+    """Cere firului de indexare să preia intervențiile noi; scrierea nu așteaptă reindexarea."""
+    from cautare import semnaleaza_modificari
+    semnaleaza_modificari()
+
+@masoara
+def import_interventii_csv(file_path, **kwargs):
+    """
+    Importă intervenții din fișier CSV (formatul exportului istoric, separat cu `;`).
+    Returnează raportul importului sau False în caz de eroare; vezi `import_csv.importa_registru_csv`.
+    """
     try:
-        import pandas as pd
-        from datetime import datetime
-        
-        # Citim CSV-ul
-        df = pd.read_csv(file_path)
-        
-        conn = get_db_connection()
-        if not conn:
-            return False
-        
-        cursor = conn.cursor()
-        
-        # Pregătim query-ul de inserare
-        query = """
-            INSERT INTO RegistruInterventii 
-            (DataInterventie, Zi, Solicitant, Solicitare, Ora, 
-            DurataInterventie, PersonalITC, Observatii, ServiciuID, Status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        # Iterăm prin fiecare rând și inserăm în baza de date
-        for _, row in df.iterrows():
-            try:
-                # Convertim data în format corect
-                data = pd.to_datetime(row['DataInterventie']).strftime('%Y-%m-%d')
-                ora = pd.to_datetime(row['Ora']).strftime('%H:%M')
-                
-                params = (
-                    data,                   # DataInterventie
-                    row['Zi'],             # Zi
-                    row['Solicitant'],     # Solicitant
-                    row['Solicitare'],     # Solicitare
-                    ora,                   # Ora
-                    int(row['DurataInterventie']), # DurataInterventie
-                    row['PersonalITC'],    # PersonalITC
-                    row['Observatii'] if 'Observatii' in row else None,  # Observatii
-                    int(row['ServiciuID']), # ServiciuID
-                    'In Asteptare'         # Status initial
-                )
-                
-                cursor.execute(query, params)
-                
-            except Exception as e:
-                logging.error(f"Eroare la importul rândului: {str(e)}")
-                continue
-        
-        conn.commit()
-        return True
+        from import_csv import importa_registru_csv
+        return importa_registru_csv(file_path, **kwargs)
         
     except Exception as e:
         logging.error(f"Eroare la importul din CSV: {str(e)}")
         return False
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
-
-def reorder_nrcrt():
-    """Reordonează NrCrt să înceapă de la 1 și să crească cu 1."""
-    conn = get_db_connection()
-    if not conn:
-        return
-    
-    cursor = conn.cursor()
-    
-    try:
-        # Dezactivăm IDENTITY dacă există
-        cursor.execute("""
-        IF EXISTS (SELECT 1 FROM sys.identity_columns 
-                  WHERE object_id = OBJECT_ID('RegistruInterventii') 
-                  AND name = 'NrCrt')
-        BEGIN
-            SET IDENTITY_INSERT RegistruInterventii OFF
-        END
-        """)
-        
-        # Facem update-ul folosind ROW_NUMBER()
-        cursor.execute("""
-        WITH CTE AS (
-            SELECT NrCrt,
-                   ROW_NUMBER() OVER (ORDER BY DataInterventie, ID) as NewNrCrt
-            FROM RegistruInterventii
-        )
-        UPDATE CTE
-        SET NrCrt = NewNrCrt
-        """)
-        
-        conn.commit()
-        logging.info("NrCrt a fost reordonat cu succes!")
+
+@masoara
+def reorder_nrcrt(complet=False):
+    """
+    Repară numerotarea NrCrt (de la 1, fără goluri, în ordinea DataInterventie, ID).
+
+    NrCrt este alocat la inserare din tabelul AlocareNrCrt; inserările cu dată în trecut,
+    ștergerile și schimbările de dată marchează acolo data de la care numerotarea nu mai
+    este la zi (RenumerotareDeLa). Implicit este renumerotată doar coada registrului de la
+    acea dată, iar cu `complet=True` tot registrul. În ambele cazuri sunt scrise doar rândurile
+    al căror NrCrt se schimbă. Returnează numărul de rânduri renumerotate sau None la eroare.
+    """
+    with db_connection() as conn:
+        if not conn:
+            return None
         
-        # Verificăm rezultatul
-        cursor.execute("SELECT MIN(NrCrt) as Min, MAX(NrCrt) as Max, COUNT(*) as Total FROM RegistruInterventii")
-        result = cursor.fetchone()
-        logging.info(f"Verificare: Min={result[0]}, Max={result[1]}, Total={result[2]}")
+        cursor = conn.cursor()
         
-    except Exception as e:
-        logging.error(f"Eroare la reordonarea NrCrt: {str(e)}")
-        conn.rollback()
-    finally:
-        cursor.close()
-        conn.close()
+        try:
+            # Blocăm contorul: inserările așteaptă până la sfârșitul renumerotării
+            cursor.execute("UPDATE AlocareNrCrt SET Ultimul = Ultimul WHERE ID = 1")
+            cursor.execute("SELECT RenumerotareDeLa FROM AlocareNrCrt WHERE ID = 1")
+            de_la = cursor.fetchone()[0]
+            
+            if complet:
+                de_la, start = None, 1
+            elif de_la is None:
+                conn.commit()
+                logging.info("Numerotarea NrCrt este la zi")
+                return 0
+            else:
+                cursor.execute("SELECT COUNT(*) FROM RegistruInterventii WHERE DataInterventie < ?", (de_la,))
+                start = cursor.fetchone()[0] + 1
+            
+            renumerotate = get_backend().reorder_nrcrt(cursor, de_la, start)
+            
+            cursor.execute("""
+                UPDATE AlocareNrCrt
+                SET Ultimul = (SELECT COALESCE(MAX(NrCrt), 0) FROM RegistruInterventii),
+                    UltimaData = (SELECT MAX(DataInterventie) FROM RegistruInterventii),
+                    RenumerotareDeLa = NULL
+                WHERE ID = 1
+            """)
+            conn.commit()
+            
+            if complet:
+                logging.info(f"NrCrt renumerotat complet: {renumerotate} rânduri modificate")
+            else:
+                logging.info(f"NrCrt renumerotat de la {de_la}: {renumerotate} rânduri modificate")
+            return renumerotate
+            
+        except Exception as e:
+            logging.error(f"Eroare la reordonarea NrCrt: {str(e)}")
+            conn.rollback()
+            return None
 
 def format_username(username):
     """Formatează username-ul în formatul corect (nume.prenume)"""
@@ -602,34 +990,40 @@ def format_username(username):
         return f"{parts[0].lower()}.{'.'.join(parts[1:]).lower()}"
     return username.lower()
 
+@masoara
 def add_user(username, password, serviciu_id):
     """Adaugă un utilizator nou în baza de date."""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return False, "Eroare la conectarea la baza de date"
-        
-        cursor = conn.cursor()
-        
         # Formatăm username-ul în formatul corect
         formatted_username = format_username(username)
         logging.info(f"Formatăm username-ul din {username} în {formatted_username}")
         
-        # Verificăm dacă username-ul există deja
-        cursor.execute("SELECT COUNT(*) FROM Utilizatori WHERE NumeUtilizator = ?", (formatted_username,))
-        if cursor.fetchone()[0] > 0:
-            return False, "Utilizatorul există deja"
-        
-        # Hash-uim parola
-        hashed_password = hash_password(password)
-        
-        # Adăugăm utilizatorul
-        cursor.execute("""
-            INSERT INTO Utilizatori (NumeUtilizator, Parola, ServiciuID)
-            VALUES (?, ?, ?)
-        """, (formatted_username, hashed_password, serviciu_id))
+        with db_connection() as conn:
+            if not conn:
+                return False, "Eroare la conectarea la baza de date"
+            
+            cursor = conn.cursor()
+            
+            # Verificăm dacă username-ul există deja
+            cursor.execute("SELECT COUNT(*) FROM Utilizatori WHERE NumeUtilizator = ?", (formatted_username,))
+            if cursor.fetchone()[0] > 0:
+                return False, "Utilizatorul există deja"
+            
+            # Hash-uim parola
+            hashed_password = hash_password(password)
+            
+            # Adăugăm utilizatorul
+            cursor.execute("""
+                INSERT INTO Utilizatori (NumeUtilizator, Parola, ServiciuID)
+                VALUES (?, ?, ?)
+            """, (formatted_username, hashed_password, serviciu_id))
+            
+            conn.commit()
         
-        conn.commit()
+        # Un eventual rezultat negativ din cache pentru acest username nu mai este valid
+        invalidate_principal(formatted_username)
+        invalidate_username_map()
+        invalidate_referinte()
         logging.info(f"Am adăugat un utilizator nou {formatted_username} cu ID-ul serviciului {serviciu_id}")
         
         return True, "Utilizator adăugat cu succes"
@@ -637,72 +1031,106 @@ def add_user(username, password, serviciu_id):
     except Exception as e:
         logging.error(f"Eroare la adăugarea utilizatorului: {str(e)}")
         return False, f"Eroare la adăugarea utilizatorului: {str(e)}"
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
 
+@masoara
 def get_personal_it():
-    """Obține lista personalului IT din baza de date."""
+    """Obține lista personalului IT (din cache-ul datelor de referință)."""
+    personal_it = _referinte_cache.get('personal_it')
+    if personal_it is not None:
+        return list(personal_it)
     try:
-        conn = get_db_connection()
-        if not conn:
-            logging.error("Nu s-a putut obține conexiunea la baza de date")
-            return []
-        
-        cursor = conn.cursor()
-        query = """
-            SELECT NumeUtilizator
-            FROM Utilizatori
-            WHERE ServiciuID = (SELECT ID FROM Servicii WHERE Nume = 'IT')
-            ORDER BY NumeUtilizator
-        """
-        
-        cursor.execute(query)
-        personal_it = [row[0] for row in cursor.fetchall()]
+        with db_connection() as conn:
+            if not conn:
+                logging.error("Nu s-a putut obține conexiunea la baza de date")
+                return []
+            
+            cursor = conn.cursor()
+            query = """
+                SELECT NumeUtilizator
+                FROM Utilizatori
+                WHERE ServiciuID = (SELECT ID FROM Servicii WHERE Nume = 'IT')
+                ORDER BY NumeUtilizator
+            """
+            
+            cursor.execute(query)
+            personal_it = [row[0] for row in cursor.fetchall()]
         
-        logging.info(f"Lista personal IT obținută din baza de date: {personal_it}")
-        return personal_it
+        logging.debug(f"Lista personal IT obținută din baza de date: {personal_it}")
+        _referinte_cache.set('personal_it', personal_it)
+        return list(personal_it)
         
     except Exception as e:
         logging.error(f"Eroare la obținerea listei personalului IT: {str(e)}")
         return []
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
 
-def is_it_personal(username):
-    """Verifică dacă utilizatorul face parte din serviciul IT."""
+# Lista sesiunilor revocate este citită cel mult o dată la SESIUNI_REVOCATE_TTL secunde
+# per proces; o revocare făcută în alt proces devine vizibilă după cel mult acest interval
+_sesiuni_revocate_cache = TTLCache(ttl=float(os.getenv('SESIUNI_REVOCATE_TTL', '30')))
+
+@masoara
+def get_sesiuni_revocate():
+    """Returnează mulțimea ID-urilor sesiunilor revocate și încă neexpirate."""
+    revocate = _sesiuni_revocate_cache.get('revocate')
+    if revocate is not None:
+        return revocate
+    
     try:
-        conn = get_db_connection()
-        if not conn:
-            logging.error("Nu s-a putut obține conexiunea la baza de date")
-            return False
+        with db_connection() as conn:
+            if not conn:
+                return frozenset()
+            
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT SessionID FROM SesiuniRevocate WHERE Expira > {get_backend().sql_now()}")
+            revocate = frozenset(row[0] for row in cursor.fetchall())
         
-        cursor = conn.cursor()
-        query = """
-            SELECT COUNT(*)
-            FROM Utilizatori u
-            JOIN Servicii s ON u.ServiciuID = s.ID
-            WHERE u.NumeUtilizator = ? AND s.Nume = 'IT'
-        """
+        _sesiuni_revocate_cache.set('revocate', revocate)
+        return revocate
         
-        cursor.execute(query, normalize_username(username))
-        count = cursor.fetchone()[0]
+    except Exception as e:
+        logging.error(f"Eroare la citirea sesiunilor revocate: {str(e)}")
+        return frozenset()
+
+@masoara
+def revoca_sesiune(session_id, expira):
+    """Revocă o sesiune până la `expira` (momentul expirării token-ului ei)."""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return False
+            
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO SesiuniRevocate (SessionID, Expira)
+                SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM SesiuniRevocate WHERE SessionID = ?)
+                """,
+                (session_id, expira, session_id)
+            )
+            # Rândurile expirate nu mai sunt necesare
+            cursor.execute(f"DELETE FROM SesiuniRevocate WHERE Expira <= {get_backend().sql_now()}")
+            conn.commit()
         
-        return count > 0
+        _sesiuni_revocate_cache.invalidate()
+        return True
         
     except Exception as e:
-        logging.error(f"Eroare la verificarea serviciului IT pentru {username}: {str(e)}")
+        logging.error(f"Eroare la revocarea sesiunii: {str(e)}")
         return False
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
+
+@masoara
+def is_it_personal(username):
+    """Verifică dacă utilizatorul face parte din serviciul IT."""
+    principal = load_principal(username)
+    return bool(principal and principal['este_it'])
 
 if __name__ == "__main__":
-    reorder_nrcrt()
+    import argparse
+    parser = argparse.ArgumentParser(description="Repară numerotarea NrCrt a registrului.")
+    parser.add_argument('--complet', action='store_true', help="renumerotează tot registrul")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    renumerotate = reorder_nrcrt(complet=args.complet)
+    if renumerotate is None:
+        raise SystemExit("Renumerotarea NrCrt a eșuat")
+    print(f"Rânduri renumerotate: {renumerotate}")
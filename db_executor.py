@@ -0,0 +1,128 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class ExecutorBusyError(Exception):
+    """Toate locurile din coada executorului sunt ocupate."""
+
+
+# Citirile unei pagini rulează pe un set fix de fire, partajat de toate sesiunile Streamlit
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', os.getenv('DB_POOL_SIZE', '10')))
+# Numărul maxim de cereri acceptate simultan (în execuție + în așteptare)
+DB_EXECUTOR_MAX_PENDING = int(os.getenv('DB_EXECUTOR_MAX_PENDING', str(DB_EXECUTOR_WORKERS * 4)))
+# Timpul implicit după care rezultatul unei citiri nu mai este așteptat
+DB_QUERY_TIMEOUT = float(os.getenv('DB_QUERY_TIMEOUT', '10'))
+
+_executor = None
+_sloturi = None
+_lock = threading.Lock()
+_metrics = {
+    'submitted': 0,
+    'completed': 0,
+    'failed': 0,
+    'timeouts': 0,
+    'rejected': 0,
+}
+
+
+def _get_executor():
+    global _executor, _sloturi
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _sloturi = threading.BoundedSemaphore(DB_EXECUTOR_MAX_PENDING)
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_EXECUTOR_WORKERS,
+                    thread_name_prefix='db'
+                )
+                logging.info(f"Executor pentru baza de date creat ({DB_EXECUTOR_WORKERS} fire)")
+    return _executor
+
+
+def _contorizeaza(cheie):
+    with _lock:
+        _metrics[cheie] += 1
+
+
+def submit(functie, *args, **kwargs):
+    """
+    Trimite `functie(*args, **kwargs)` pe firele executorului și returnează un Future.
+    Ridică ExecutorBusyError dacă nu se eliberează un loc în `DB_QUERY_TIMEOUT` secunde.
+    """
+    executor = _get_executor()
+    if not _sloturi.acquire(timeout=DB_QUERY_TIMEOUT):
+        _contorizeaza('rejected')
+        raise ExecutorBusyError(f"Executorul are deja {DB_EXECUTOR_MAX_PENDING} cereri în curs")
+
+    def ruleaza():
+        try:
+            return functie(*args, **kwargs)
+        finally:
+            _sloturi.release()
+
+    _contorizeaza('submitted')
+    try:
+        return executor.submit(ruleaza)
+    except Exception:
+        _sloturi.release()
+        raise
+
+
+def run_concurrent(cereri, timeouts=None, implicite=None, timeout=None):
+    """
+    Rulează în paralel citirile independente ale unei pagini.
+
+    `cereri` este un dicționar {nume: funcție fără argumente} (de ex. functools.partial).
+    Fiecare cerere are timpul maxim `timeouts[nume]` (implicit `timeout` sau DB_QUERY_TIMEOUT),
+    măsurat de la pornirea tuturor cererilor. Returnează {nume: rezultat}; pentru cererile
+    care au depășit timpul sau au eșuat se folosește `implicite[nume]` (implicit None).
+    O cerere depășită nu este întreruptă: își termină execuția pe firul ei, dar
+    rezultatul este ignorat.
+    """
+    timeouts = timeouts or {}
+    implicite = implicite or {}
+    timeout = DB_QUERY_TIMEOUT if timeout is None else timeout
+
+    start = time.monotonic()
+    futures = {}
+    rezultate = {}
+    for nume, functie in cereri.items():
+        try:
+            futures[nume] = submit(functie)
+        except ExecutorBusyError as e:
+            logging.warning(f"Cererea '{nume}' nu a putut fi pornită: {str(e)}")
+            rezultate[nume] = implicite.get(nume)
+
+    for nume, future in futures.items():
+        ramas = start + timeouts.get(nume, timeout) - time.monotonic()
+        try:
+            rezultate[nume] = future.result(timeout=max(ramas, 0))
+            _contorizeaza('completed')
+        except FutureTimeoutError:
+            _contorizeaza('timeouts')
+            logging.warning(f"Cererea '{nume}' a depășit {timeouts.get(nume, timeout)} secunde")
+            rezultate[nume] = implicite.get(nume)
+        except Exception as e:
+            _contorizeaza('failed')
+            logging.error(f"Eroare în cererea '{nume}': {str(e)}")
+            rezultate[nume] = implicite.get(nume)
+
+    return rezultate
+
+
+def shutdown_executor(wait=True):
+    """Oprește executorul procesului; următoarea cerere creează unul nou."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def executor_metrics():
+    """Metricile executorului (cereri trimise, terminate, eșuate, depășite, respinse)."""
+    with _lock:
+        return dict(_metrics)
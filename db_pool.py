@@ -0,0 +1,227 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    """Nu s-a putut obține o conexiune din pool în timpul alocat."""
+
+
+class ConnectionPool:
+    """
+    Pool de conexiuni reutilizabile, partajat de tot procesul.
+
+    - numărul de conexiuni deschise simultan este limitat la `max_size`;
+    - la preluare, conexiunile care au stat nefolosite mai mult de
+      `health_check_interval` secunde sunt verificate cu un `SELECT 1`;
+    - conexiunile nefolosite mai mult de `max_idle` secunde sunt închise.
+    """
+
+    def __init__(self, factory, max_size=10, timeout=10.0, max_idle=300.0,
+                 health_check_interval=30.0):
+        self._factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()  # (conexiune, momentul eliberării)
+        self._size = 0        # conexiuni deschise (libere + împrumutate)
+        self._cond = threading.Condition()
+
+        self._metrics = {
+            'checkouts': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+            'health_check_failures': 0,
+            'idle_evictions': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception as e:
+            logging.warning(f"Eroare la închiderea conexiunii din pool: {str(e)}")
+        # Condition folosește un RLock: apelul din _evict_idle, cu lock-ul deja luat, nu se blochează
+        with self._cond:
+            self._metrics['connections_closed'] += 1
+
+    def _evict_idle(self, now):
+        """Închide conexiunile libere care au depășit `max_idle`. Apelat cu lock-ul luat."""
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._metrics['idle_evictions'] += 1
+            self._close(conn)
+
+    def _is_healthy(self, conn):
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            return True
+        except Exception as e:
+            logging.warning(f"Conexiune invalidă detectată în pool: {str(e)}")
+            return False
+        finally:
+            if cursor:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def acquire(self):
+        """Preia o conexiune din pool; deschide una nouă dacă nu există liberă și nu s-a atins limita."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while True:
+            conn = None
+            last_used = None
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    self._evict_idle(now)
+                    if self._idle:
+                        # LIFO: conexiunea cea mai recent folosită are cele mai mari șanse să fie validă
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Nicio conexiune disponibilă după {self.timeout} secunde"
+                        )
+                    self._cond.wait(remaining)
+
+            if conn is not None:
+                if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+                    with self._cond:
+                        self._size -= 1
+                        self._metrics['health_check_failures'] += 1
+                        self._cond.notify()
+                    self._close(conn)
+                    continue
+            else:
+                try:
+                    conn = self._factory()
+                except Exception:
+                    conn = None
+                if conn is None:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    return None
+                with self._cond:
+                    self._metrics['connections_created'] += 1
+
+            waited = time.monotonic() - start
+            with self._cond:
+                self._metrics['checkouts'] += 1
+                self._metrics['wait_time_total'] += waited
+                self._metrics['wait_time_max'] = max(self._metrics['wait_time_max'], waited)
+            return conn
+
+    def release(self, conn, discard=False):
+        """Returnează conexiunea în pool. Tranzacțiile rămase deschise sunt anulate."""
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception as e:
+                logging.warning(f"Conexiunea nu a putut fi resetată, va fi închisă: {str(e)}")
+                discard = True
+
+        with self._cond:
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if discard:
+            self._close(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager care împrumută o conexiune și o returnează la ieșire.
+        Produce None dacă nu s-a putut deschide o conexiune.
+        """
+        conn = self.acquire()
+        if conn is None:
+            yield None
+            return
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            # Nu știm în ce stare a rămas conexiunea; nu o refolosim
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def close_all(self):
+        """Închide toate conexiunile libere (cele împrumutate se închid la returnare)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        """Returnează metricile pool-ului."""
+        with self._cond:
+            stats = dict(self._metrics)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['max_size'] = self.max_size
+        checkouts = stats['checkouts']
+        stats['wait_time_avg'] = stats['wait_time_total'] / checkouts if checkouts else 0.0
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(factory):
+    """Returnează pool-ul procesului, creându-l la primul apel."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    factory,
+                    max_size=int(os.getenv('DB_POOL_SIZE', '10')),
+                    timeout=float(os.getenv('DB_POOL_TIMEOUT', '10')),
+                    max_idle=float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+                    health_check_interval=float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30')),
+                )
+                logging.info(f"Pool de conexiuni creat (dimensiune maximă {_pool.max_size})")
+    return _pool
+
+
+def close_pool():
+    """Închide pool-ul procesului; următorul `get_pool` va crea unul nou."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+def pool_metrics():
+    """Metricile pool-ului procesului sau un dicționar gol dacă nu a fost încă creat."""
+    return _pool.stats() if _pool is not None else {}
@@ -0,0 +1,305 @@
+import argparse
+import atexit
+import datetime
+import decimal
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+# Urmărirea interogărilor (DB_TRACE=0 o dezactivează complet)
+DB_TRACE = os.getenv('DB_TRACE', '1') == '1'
+# Pragul (ms, execuție + citire) peste care interogarea ajunge în logul de interogări lente
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '500'))
+# Fișierul în care este scris rezumatul procesului la oprire (gol = nu se scrie)
+DB_TRACE_SUMMARY_FILE = os.getenv('DB_TRACE_SUMMARY_FILE', '')
+# Lungimea maximă a textului SQL păstrat în log și în rezumat
+LUNGIME_MAXIMA_SQL = 2000
+
+# Logger-ul dedicat: logging_config îl scrie în logs/slow_queries.log
+slow_log = logging.getLogger('slow_query')
+
+_SPATII = re.compile(r'\s+')
+_SIR = re.compile(r"N?'(?:[^']|'')*'")
+_NUMAR = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTA = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+_rezumat = {}
+_lock = threading.Lock()
+_amprente = {}
+
+
+def amprenta(sql):
+    """
+    Forma normalizată a interogării și un hash scurt al ei: spațiile comprimate, literalii
+    înlocuiți cu ?, listele IN (?, ?, ...) reduse la (?...). Interogările care diferă doar
+    prin valori sau prin numărul de parametri au aceeași amprentă.
+    """
+    rezultat = _amprente.get(sql)
+    if rezultat is None:
+        normalizat = _SPATII.sub(' ', sql).strip()
+        normalizat = _SIR.sub('?', normalizat)
+        normalizat = _NUMAR.sub('?', normalizat)
+        normalizat = _LISTA.sub('(?...)', normalizat)
+        rezultat = (hashlib.sha1(normalizat.encode()).hexdigest()[:12], normalizat[:LUNGIME_MAXIMA_SQL])
+        if len(_amprente) < 10000:
+            _amprente[sql] = rezultat
+    return rezultat
+
+
+def _redacteaza(valoare):
+    """Textul (care poate conține parole, nume, solicitări) este înlocuit cu tipul și lungimea."""
+    if valoare is None or isinstance(valoare, (bool, int, float, decimal.Decimal)):
+        return valoare
+    if isinstance(valoare, (datetime.date, datetime.time)):
+        return valoare.isoformat()
+    if isinstance(valoare, (str, bytes, bytearray)):
+        return f"<{type(valoare).__name__}:{len(valoare)}>"
+    return f"<{type(valoare).__name__}>"
+
+
+def parametri_redactati(params):
+    if params is None:
+        return []
+    if isinstance(params, (list, tuple)):
+        return [_redacteaza(p) for p in params]
+    return [_redacteaza(params)]
+
+
+def _apelant():
+    """Prima funcție din afara acestui modul de pe stivă (ex. get_interventii_pagina)."""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    return frame.f_code.co_name if frame is not None else '?'
+
+
+def _inregistreaza(urma):
+    """Adaugă o execuție terminată în rezumatul procesului și, dacă e lentă, în logul dedicat."""
+    total_ms = (urma['execute_s'] + urma['fetch_s']) * 1000
+    with _lock:
+        agregat = _rezumat.get(urma['fingerprint'])
+        if agregat is None:
+            agregat = _rezumat[urma['fingerprint']] = {
+                'fingerprint': urma['fingerprint'],
+                'sql': urma['sql'],
+                'functii': {},
+                'apeluri': 0,
+                'erori': 0,
+                'lente': 0,
+                'randuri': 0,
+                'execute_s': 0.0,
+                'fetch_s': 0.0,
+                'max_ms': 0.0,
+            }
+        agregat['apeluri'] += 1
+        agregat['functii'][urma['functie']] = agregat['functii'].get(urma['functie'], 0) + 1
+        agregat['randuri'] += urma['randuri']
+        agregat['execute_s'] += urma['execute_s']
+        agregat['fetch_s'] += urma['fetch_s']
+        agregat['max_ms'] = max(agregat['max_ms'], total_ms)
+        if urma['eroare']:
+            agregat['erori'] += 1
+        if total_ms >= DB_SLOW_QUERY_MS:
+            agregat['lente'] += 1
+
+    if urma['eroare']:
+        slow_log.warning(
+            f"Eroare după {total_ms:.1f} ms în {urma['functie']}: {urma['eroare']}",
+            extra={'campuri': urma}
+        )
+    elif total_ms >= DB_SLOW_QUERY_MS:
+        slow_log.warning(
+            f"Interogare lentă ({total_ms:.1f} ms, {urma['randuri']} rânduri) în {urma['functie']}",
+            extra={'campuri': urma}
+        )
+
+
+class CursorUrmarit:
+    """
+    Învelește cursorul DB-API: măsoară execuția și citirea rezultatului fiecărei interogări.
+    O urmă este închisă la următoarea execuție, la închiderea cursorului sau la returnarea
+    conexiunii în pool.
+    """
+
+    def __init__(self, cursor):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_urma', None)
+
+    def __getattr__(self, nume):
+        return getattr(self._cursor, nume)
+
+    def __setattr__(self, nume, valoare):
+        # ex. fast_executemany, setat de backend pe cursorul real
+        setattr(self._cursor, nume, valoare)
+
+    def _incheie(self):
+        urma = self._urma
+        if urma is not None:
+            object.__setattr__(self, '_urma', None)
+            _inregistreaza(urma)
+
+    def _executa(self, metoda, sql, params, randuri_parametri):
+        self._incheie()
+        fingerprint, normalizat = amprenta(sql)
+        urma = {
+            'fingerprint': fingerprint,
+            'sql': normalizat,
+            'params': randuri_parametri,
+            'functie': _apelant(),
+            'randuri': 0,
+            'execute_s': 0.0,
+            'fetch_s': 0.0,
+            'eroare': None,
+        }
+        start = time.perf_counter()
+        try:
+            if params is None:
+                metoda(sql)
+            else:
+                metoda(sql, params)
+        except Exception as e:
+            urma['execute_s'] = time.perf_counter() - start
+            urma['eroare'] = f"{type(e).__name__}: {str(e)[:500]}"
+            _inregistreaza(urma)
+            raise
+        urma['execute_s'] = time.perf_counter() - start
+        object.__setattr__(self, '_urma', urma)
+        return self
+
+    def execute(self, sql, params=None):
+        return self._executa(self._cursor.execute, sql, params, parametri_redactati(params))
+
+    def executemany(self, sql, seq_params):
+        seq_params = list(seq_params)
+        self._executa(self._cursor.executemany, sql, seq_params, f"<{len(seq_params)} seturi>")
+        # Rândurile scrise, nu citite
+        self._urma['randuri'] = len(seq_params)
+        return self
+
+    def _citire(self, metoda, *args):
+        start = time.perf_counter()
+        rezultat = metoda(*args)
+        if self._urma is not None:
+            self._urma['fetch_s'] += time.perf_counter() - start
+            if isinstance(rezultat, list):
+                self._urma['randuri'] += len(rezultat)
+            elif rezultat is not None:
+                self._urma['randuri'] += 1
+        return rezultat
+
+    def fetchone(self):
+        return self._citire(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._citire(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._citire(self._cursor.fetchall)
+
+    def __iter__(self):
+        while True:
+            rand = self.fetchone()
+            if rand is None:
+                return
+            yield rand
+
+    def close(self):
+        self._incheie()
+        self._cursor.close()
+
+
+class ConexiuneUrmarita:
+    """Învelește conexiunea pentru ca fiecare cursor creat să fie urmărit."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._cursoare = []
+
+    def __getattr__(self, nume):
+        return getattr(self._conn, nume)
+
+    def cursor(self, *args, **kwargs):
+        cursor = CursorUrmarit(self._conn.cursor(*args, **kwargs))
+        self._cursoare.append(cursor)
+        return cursor
+
+    def incheie(self):
+        """Închide urmele rămase deschise (apelat la returnarea conexiunii)."""
+        for cursor in self._cursoare:
+            cursor._incheie()
+        self._cursoare.clear()
+
+
+def urmareste(conn):
+    """Învelește conexiunea dacă urmărirea este activă."""
+    if conn is None or not DB_TRACE:
+        return conn
+    return ConexiuneUrmarita(conn)
+
+
+def rezumat():
+    """Statisticile procesului per amprentă, ordonate după timpul total."""
+    with _lock:
+        valori = [dict(a, functii=dict(a['functii'])) for a in _rezumat.values()]
+    for agregat in valori:
+        agregat['total_s'] = agregat['execute_s'] + agregat['fetch_s']
+        agregat['medie_ms'] = agregat['total_s'] * 1000 / agregat['apeluri']
+    return sorted(valori, key=lambda a: a['total_s'], reverse=True)
+
+
+def scrie_rezumat(path=None):
+    """Scrie rezumatul procesului ca JSON (implicit în DB_TRACE_SUMMARY_FILE). Returnează calea."""
+    path = path or DB_TRACE_SUMMARY_FILE
+    if not path:
+        return None
+    if '{pid}' in path:
+        path = path.format(pid=os.getpid())
+    date = {
+        'pid': os.getpid(),
+        'generat': datetime.datetime.now().isoformat(timespec='seconds'),
+        'prag_lent_ms': DB_SLOW_QUERY_MS,
+        'interogari': rezumat(),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(date, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _scrie_la_oprire():
+    try:
+        scrie_rezumat()
+    except Exception as e:
+        logging.error(f"Eroare la scrierea rezumatului interogărilor: {str(e)}")
+
+
+if DB_TRACE_SUMMARY_FILE:
+    atexit.register(_scrie_la_oprire)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Afișează un rezumat de interogări scris de db_trace.")
+    parser.add_argument('fisiere', nargs='+', help="rezumate JSON (pot fi din mai multe procese)")
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    # Combinăm rezumatele mai multor procese
+    combinat = {}
+    for fisier in args.fisiere:
+        with open(fisier, encoding='utf-8') as f:
+            for agregat in json.load(f)['interogari']:
+                tinta = combinat.setdefault(agregat['fingerprint'], dict(agregat, apeluri=0, erori=0,
+                                            lente=0, randuri=0, total_s=0.0, max_ms=0.0))
+                for camp in ('apeluri', 'erori', 'lente', 'randuri', 'total_s'):
+                    tinta[camp] += agregat[camp]
+                tinta['max_ms'] = max(tinta['max_ms'], agregat['max_ms'])
+
+    for agregat in sorted(combinat.values(), key=lambda a: a['total_s'], reverse=True)[:args.top]:
+        print(f"{agregat['fingerprint']}  {agregat['total_s']:8.3f}s  {agregat['apeluri']:6d} apeluri  "
+              f"max {agregat['max_ms']:8.1f} ms  {agregat['randuri']:8d} rânduri  "
+              f"{agregat['lente']} lente  {agregat['erori']} erori")
+        print(f"    {', '.join(agregat['functii'])}: {agregat['sql'][:160]}")
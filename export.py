@@ -0,0 +1,196 @@
+import argparse
+import csv
+import logging
+import time
+from pathlib import Path
+import pandas as pd
+from database import iter_interventii
+
+# Antetul exportului istoric 'Registru de Interventii.csv'
+ANTET_CSV = ['NrCrt', 'DataInterventie', 'Zi', 'Solicitant', 'Solicitare', 'Ora',
+             'DurataInterventiei', 'PersonalITC', 'Observatii']
+
+# Zilele, prescurtate ca în exportul istoric
+ZILE_PRESCURTATE = {
+    'Luni': 'L',
+    'Marți': 'Ma',
+    'Miercuri': 'Mi',
+    'Joi': 'J',
+    'Vineri': 'V',
+    'Sâmbătă': 'S',
+    'Duminică': 'D'
+}
+
+# Coloanele exporturilor XLSX și Parquet
+COLOANE_EXPORT = ['NrCrt', 'DataInterventie', 'Zi', 'Solicitant', 'Solicitare', 'Ora',
+                  'DurataInterventie', 'PersonalITC', 'Observatii', 'Status',
+                  'DataAprobare', 'AprobatDe']
+
+# cp1250 are doar variantele cu sedilă ale lui ș și ț
+_SEDILA = str.maketrans('șțȘȚ', 'şţŞŢ')
+
+
+def _ora(lot):
+    """Coloana Ora a lotului ca text 'HH:MM' (<NA> dacă lipsește)."""
+    return lot['Ora'].str.slice(0, 5)
+
+
+def _data_text(data, format):
+    """Formatează datele lotului; un lot are puține zile distincte, deci formatăm doar categoriile."""
+    data = data.astype('category')
+    return data.cat.rename_categories(data.cat.categories.strftime(format))
+
+
+def _cu_sedila(text):
+    """Înlocuiește ș și ț cu variantele cu sedilă, pe toată coloana."""
+    for litera, sedila in zip('șțȘȚ', 'şţŞŢ'):
+        text = text.str.replace(litera, sedila, regex=False)
+    return text
+
+
+def _lot_csv(lot, sedila):
+    """Lotul în formatul exportului istoric, calculat pe coloane."""
+    durata = lot['DurataInterventie']
+    coloane = {
+        'NrCrt': lot['NrCrt'],
+        'DataInterventie': _data_text(lot['DataInterventie'], '%d.%m.%Y'),
+        # Coloanele categoriale sunt transformate doar pe categorii
+        'Zi': lot['Zi'].map(lambda zi: ZILE_PRESCURTATE.get(zi, zi)),
+        'Solicitant': lot['Solicitant'],
+        'Solicitare': lot['Solicitare'],
+        'Ora': _ora(lot),
+        'DurataInterventiei': (durata.astype(str) + '.0').where(durata.notna(), ''),
+        'PersonalITC': lot['PersonalITC'],
+        'Observatii': lot['Observatii'],
+    }
+    if sedila:
+        for coloana in ('Zi', 'PersonalITC'):
+            coloane[coloana] = coloane[coloana].map(lambda v: v.translate(_SEDILA), na_action='ignore')
+        for coloana in ('Solicitant', 'Solicitare', 'Observatii'):
+            coloane[coloana] = _cu_sedila(coloane[coloana])
+    return pd.DataFrame(coloane)
+
+
+def exporta_csv(path, loturi, encoding='cp1250'):
+    """Scrie loturile în formatul exportului istoric (`;`, date zz.ll.aaaa, zile prescurtate)."""
+    sedila = encoding.lower() in ('cp1250', 'windows-1250')
+    randuri = 0
+    with open(path, 'w', newline='', encoding=encoding, errors='replace') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(ANTET_CSV)
+        for lot in loturi:
+            _lot_csv(lot, sedila).to_csv(f, sep=';', header=False, index=False, lineterminator='\r\n')
+            randuri += len(lot)
+    return randuri
+
+
+def exporta_xlsx(path, loturi):
+    """Scrie loturile într-un fișier Excel, în modul write-only al openpyxl (rândurile nu rămân în memorie)."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Registru")
+    sheet.append(COLOANE_EXPORT)
+
+    def celula(valoare, format_numar):
+        cell = WriteOnlyCell(sheet, value=valoare)
+        cell.number_format = format_numar
+        return cell
+
+    formate = {'DataInterventie': 'DD.MM.YYYY', 'DataAprobare': 'DD.MM.YYYY HH:MM'}
+    randuri = 0
+    for lot in loturi:
+        # openpyxl scrie rând cu rând; valorile lipsă (NaT, <NA>) devin None
+        lot = lot[COLOANE_EXPORT].assign(Ora=_ora(lot)).astype(object)
+        lot = lot.where(lot.notna(), None)
+        for rand in lot.itertuples(index=False, name=None):
+            sheet.append([
+                celula(valoare, formate[coloana]) if coloana in formate and valoare is not None else valoare
+                for coloana, valoare in zip(COLOANE_EXPORT, rand)
+            ])
+        randuri += len(lot)
+    workbook.save(path)
+    return randuri
+
+
+def exporta_parquet(path, loturi):
+    """Scrie loturile într-un fișier Parquet, câte un row group pentru fiecare lot."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('NrCrt', pa.int64()),
+        ('DataInterventie', pa.date32()),
+        ('Zi', pa.string()),
+        ('Solicitant', pa.string()),
+        ('Solicitare', pa.string()),
+        ('Ora', pa.string()),
+        ('DurataInterventie', pa.int32()),
+        ('PersonalITC', pa.string()),
+        ('Observatii', pa.string()),
+        ('Status', pa.string()),
+        ('DataAprobare', pa.timestamp('s')),
+        ('AprobatDe', pa.string()),
+    ])
+    randuri = 0
+    with pq.ParquetWriter(str(path), schema, compression='snappy') as writer:
+        for lot in loturi:
+            lot = lot[COLOANE_EXPORT].assign(Ora=_ora(lot))
+            writer.write_table(pa.Table.from_pandas(lot, schema=schema, preserve_index=False))
+            randuri += len(lot)
+    return randuri
+
+
+FORMATE = {
+    'csv': exporta_csv,
+    'xlsx': exporta_xlsx,
+    'parquet': exporta_parquet,
+}
+
+# Tipul MIME al fiecărui format, pentru descărcarea din pagină
+TIPURI_MIME = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def exporta(format, path, filtre=None, chunk_size=None):
+    """
+    Exportă registrul (cu filtrele din pagină) în `path`, în formatul `format`
+    ('csv', 'xlsx' sau 'parquet'). Rândurile sunt citite din baza de date și scrise
+    în loturi de `chunk_size`, deci memoria folosită nu depinde de numărul de rânduri.
+    Returnează numărul de rânduri exportate.
+    """
+    if format not in FORMATE:
+        raise ValueError(f"Format de export necunoscut: {format}")
+    start = time.perf_counter()
+    randuri = FORMATE[format](path, iter_interventii(filtre, chunk_size=chunk_size))
+    logging.info(f"Export {format} în {path}: {randuri} intervenții în {time.perf_counter() - start:.2f}s")
+    return randuri
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportă registrul de intervenții.")
+    parser.add_argument('output', help="fișierul generat")
+    parser.add_argument('--format', choices=sorted(FORMATE), default=None,
+                        help="implicit, după extensia fișierului")
+    parser.add_argument('--personal-itc', default=None)
+    parser.add_argument('--de-la', default=None, help="data de început (aaaa-ll-zz)")
+    parser.add_argument('--pana-la', default=None, help="data de sfârșit (aaaa-ll-zz)")
+    parser.add_argument('--text', default=None, help="text căutat")
+    parser.add_argument('--chunk-size', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from datetime import date
+    filtre = {
+        'personal_itc': args.personal_itc,
+        'data_start': date.fromisoformat(args.de_la) if args.de_la else None,
+        'data_end': date.fromisoformat(args.pana_la) if args.pana_la else None,
+        'text': args.text,
+    }
+    format = args.format or Path(args.output).suffix.lstrip('.').lower()
+    randuri = exporta(format, args.output, filtre, chunk_size=args.chunk_size)
+    print(f"{randuri} intervenții exportate în {args.output}")
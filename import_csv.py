@@ -0,0 +1,252 @@
+import argparse
+import csv
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from backends import get_backend
+from database import db_connection, invalidate_statistici, semnaleaza_index_cautare
+
+# Abrevierile zilelor din exportul istoric -> denumirile folosite în aplicație
+ZILE_ABREVIERI = {
+    'L': 'Luni',
+    'MA': 'Marți',
+    'MI': 'Miercuri',
+    'J': 'Joi',
+    'V': 'Vineri',
+    'S': 'Sâmbătă',
+    'D': 'Duminică'
+}
+ZILE_SAPTAMANA = ['Luni', 'Marți', 'Miercuri', 'Joi', 'Vineri', 'Sâmbătă', 'Duminică']
+
+# Denumiri alternative ale coloanelor din fișierele CSV
+ALIAS_COLOANE = {
+    'DurataInterventiei': 'DurataInterventie',
+    'Observații': 'Observatii',
+}
+
+INSERT_QUERY = """
+    INSERT INTO RegistruInterventii
+    (DataInterventie, Zi, Solicitant, Solicitare, Ora,
+    DurataInterventie, PersonalITC, Observatii, ServiciuID, Status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+class RandInvalid(Exception):
+    """Rândul din CSV nu poate fi importat; mesajul este motivul respingerii."""
+
+def _parse_data(valoare):
+    valoare = valoare.strip()
+    if not valoare:
+        raise RandInvalid("lipsește data intervenției")
+    for fmt in ('%d.%m.%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(valoare, fmt).date()
+        except ValueError:
+            continue
+    raise RandInvalid(f"dată invalidă: {valoare}")
+
+def _parse_ora(valoare):
+    valoare = valoare.strip()
+    if not valoare:
+        return None
+    # Exportul conține și ore de forma '13:00:00 AM'; sufixul contează doar pentru orele 1-12
+    parti = valoare.upper().split()
+    sufix = parti[1] if len(parti) == 2 and parti[1] in ('AM', 'PM') else None
+    text_ora = parti[0] if sufix else valoare
+    for fmt in ('%H:%M', '%H:%M:%S'):
+        try:
+            ora = datetime.strptime(text_ora, fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        raise RandInvalid(f"oră invalidă: {valoare}")
+    if sufix == 'PM' and ora.hour < 12:
+        ora = ora.replace(hour=ora.hour + 12)
+    elif sufix == 'AM' and ora.hour == 12:
+        ora = ora.replace(hour=0)
+    return ora.strftime('%H:%M')
+
+def _parse_durata(valoare):
+    valoare = valoare.strip().replace(',', '.')
+    if not valoare:
+        return 0
+    try:
+        return int(round(float(valoare)))
+    except ValueError:
+        raise RandInvalid(f"durată invalidă: {valoare}")
+
+def _parse_zi(valoare, data):
+    abreviere = valoare.strip().upper()
+    if abreviere in ZILE_ABREVIERI:
+        return ZILE_ABREVIERI[abreviere]
+    # Zi lipsă sau scrisă altfel: o deducem din dată
+    return ZILE_SAPTAMANA[data.weekday()]
+
+def converteste_rand(rand, serviciu_id, status):
+    """Transformă un rând din CSV în parametrii pentru INSERT; ridică RandInvalid dacă nu se poate."""
+    solicitant = (rand.get('Solicitant') or '').strip()
+    solicitare = (rand.get('Solicitare') or '').strip()
+    if not solicitant and not solicitare:
+        raise RandInvalid("rând fără solicitant și solicitare")
+    if len(solicitare) > 1000:
+        raise RandInvalid("textul solicitării este prea lung (maxim 1000 caractere)")
+
+    data = _parse_data(rand.get('DataInterventie') or '')
+    observatii = (rand.get('Observatii') or '').strip()
+    serviciu = (rand.get('ServiciuID') or '').strip()
+
+    return (
+        data.strftime('%Y-%m-%d'),                     # DataInterventie
+        _parse_zi(rand.get('Zi') or '', data),         # Zi
+        solicitant,                                    # Solicitant
+        solicitare,                                    # Solicitare
+        _parse_ora(rand.get('Ora') or ''),             # Ora
+        _parse_durata(rand.get('DurataInterventie') or ''),  # DurataInterventie
+        (rand.get('PersonalITC') or '').strip() or None,     # PersonalITC
+        observatii or None,                            # Observatii
+        int(serviciu) if serviciu.isdigit() else serviciu_id,  # ServiciuID
+        status                                         # Status
+    )
+
+def _citeste_randuri(file_path, delimiter, encoding):
+    """Generează (număr_linie, rând) din CSV, fără a încărca fișierul în memorie."""
+    with open(file_path, newline='', encoding=encoding, errors='replace') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        coloane = [ALIAS_COLOANE.get(c.strip(), c.strip()) for c in header]
+        for valori in reader:
+            if not any(v.strip() for v in valori):
+                continue
+            yield reader.line_num, dict(zip(coloane, valori))
+
+def _insereaza_lot(conn, cursor, lot, respinse):
+    """
+    Inserează un lot de rânduri într-o singură tranzacție.
+    Dacă lotul eșuează, reîncercăm rând cu rând ca să izolăm rândurile problematice.
+    Returnează numărul de rânduri inserate.
+    """
+    try:
+        cursor.executemany(INSERT_QUERY, [params for _, _, params in lot])
+        conn.commit()
+        return len(lot)
+    except Exception as e:
+        conn.rollback()
+        logging.warning(f"Lotul de {len(lot)} rânduri a eșuat ({str(e)}), reîncercăm rând cu rând")
+
+    inserate = 0
+    for linie, rand, params in lot:
+        try:
+            cursor.execute(INSERT_QUERY, params)
+            conn.commit()
+            inserate += 1
+        except Exception as e:
+            conn.rollback()
+            respinse.append((linie, rand, f"eroare la inserare: {str(e)}"))
+    return inserate
+
+def _scrie_respinse(path, respinse, append):
+    """Adaugă rândurile respinse, cu motivul respingerii, în fișierul separat."""
+    if not respinse:
+        return
+    nou = not append or not path.exists()
+    with open(path, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        if nou:
+            writer.writerow(['Linie', 'Motiv', 'Rand'])
+        for linie, rand, motiv in respinse:
+            writer.writerow([linie, motiv, ';'.join(v or '' for v in rand.values())])
+
+def importa_registru_csv(file_path, batch_size=1000, delimiter=';', encoding='cp1250',
+                         serviciu_id=None, status='In Asteptare', rejected_path=None):
+    """
+    Importă în flux un registru CSV în formatul exportului istoric
+    (`;` ca separator, date `zz.ll.aaaa`, zile prescurtate, DurataInterventiei zecimală).
+
+    Rândurile sunt inserate în loturi de `batch_size`, fiecare lot într-o tranzacție proprie.
+    Rândurile respinse sunt scrise, cu motivul, în `rejected_path`
+    (implicit `<fișier>.respinse.csv`). Returnează raportul importului.
+    """
+    file_path = Path(file_path)
+    rejected_path = Path(rejected_path) if rejected_path else file_path.with_suffix('.respinse.csv')
+    raport = {
+        'citite': 0,
+        'importate': 0,
+        'respinse': 0,
+        'durata_secunde': 0.0,
+        'randuri_pe_secunda': 0.0,
+        'fisier_respinse': None
+    }
+    start = time.perf_counter()
+
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("Nu s-a putut obține conexiunea la baza de date")
+
+        cursor = conn.cursor()
+        get_backend().prepare_bulk_cursor(cursor)
+
+        lot = []
+        respinse = []
+        scris_respinse = False
+        for linie, rand in _citeste_randuri(file_path, delimiter, encoding):
+            raport['citite'] += 1
+            try:
+                lot.append((linie, rand, converteste_rand(rand, serviciu_id, status)))
+            except RandInvalid as e:
+                respinse.append((linie, rand, str(e)))
+
+            if len(lot) >= batch_size:
+                raport['importate'] += _insereaza_lot(conn, cursor, lot, respinse)
+                lot = []
+                raport['respinse'] += len(respinse)
+                _scrie_respinse(rejected_path, respinse, append=scris_respinse)
+                scris_respinse = scris_respinse or bool(respinse)
+                respinse = []
+
+        if lot:
+            raport['importate'] += _insereaza_lot(conn, cursor, lot, respinse)
+        raport['respinse'] += len(respinse)
+        _scrie_respinse(rejected_path, respinse, append=scris_respinse)
+
+    invalidate_statistici()
+    semnaleaza_index_cautare()
+    raport['durata_secunde'] = time.perf_counter() - start
+    if raport['durata_secunde'] > 0:
+        raport['randuri_pe_secunda'] = raport['citite'] / raport['durata_secunde']
+    if raport['respinse']:
+        raport['fisier_respinse'] = str(rejected_path)
+
+    logging.info(
+        f"Import {file_path.name}: {raport['importate']} importate, {raport['respinse']} respinse "
+        f"din {raport['citite']} în {raport['durata_secunde']:.2f}s "
+        f"({raport['randuri_pe_secunda']:.0f} rânduri/s)"
+    )
+    return raport
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importă un registru de intervenții din CSV.")
+    parser.add_argument('file', help="fișierul CSV (de ex. 'Registru de Interventii.csv')")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--delimiter', default=';')
+    parser.add_argument('--encoding', default='cp1250')
+    parser.add_argument('--serviciu-id', type=int, default=None)
+    parser.add_argument('--status', default='In Asteptare')
+    parser.add_argument('--respinse', default=None, help="fișierul pentru rândurile respinse")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    raport = importa_registru_csv(
+        args.file,
+        batch_size=args.batch_size,
+        delimiter=args.delimiter,
+        encoding=args.encoding,
+        serviciu_id=args.serviciu_id,
+        status=args.status,
+        rejected_path=args.respinse
+    )
+    for cheie, valoare in raport.items():
+        print(f"{cheie}: {valoare}")
@@ -0,0 +1,189 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+
+# Directorul și fișierul de log (relativ la aplicație, dacă nu este absolut)
+LOG_DIR = os.getenv('LOG_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'))
+LOG_FILE = os.getenv('LOG_FILE', 'app.log')
+# Interogările lente și erorile SQL (logger-ul 'slow_query' din db_trace) au fișierul lor
+SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE', 'slow_queries.log')
+# Nivelul implicit și nivelurile per modul: "database=WARNING,db_pool=DEBUG,streamlit=ERROR"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+# 'json' (un obiect pe linie) sau 'text', pentru fișier
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+# Rotația: 'size' (după LOG_MAX_BYTES) sau 'time' (la LOG_ROTATION_WHEN, ex. 'midnight')
+LOG_ROTATION = os.getenv('LOG_ROTATION', 'size')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_ROTATION_WHEN = os.getenv('LOG_ROTATION_WHEN', 'midnight')
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '7'))
+# Dacă înregistrările sunt afișate și în consolă
+LOG_CONSOLE = os.getenv('LOG_CONSOLE', '1') == '1'
+# Câte înregistrări pot aștepta scrierea; peste limită sunt pierdute, nu blocăm cererea
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+FORMAT_TEXT = '%(asctime)s - %(levelname)s - %(module)s - %(message)s'
+
+_listener = None
+_lock = threading.Lock()
+
+
+class FormatorJSON(logging.Formatter):
+    """Formatează înregistrarea ca un obiect JSON pe o linie."""
+
+    def format(self, record):
+        date = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        # Câmpurile transmise prin extra={...}
+        campuri = getattr(record, 'campuri', None)
+        if campuri:
+            date.update(campuri)
+        if record.exc_text:
+            date['exc'] = record.exc_text
+        elif record.exc_info:
+            date['exc'] = self.formatException(record.exc_info)
+        return json.dumps(date, ensure_ascii=False, default=str)
+
+
+class FiltruNiveluri(logging.Filter):
+    """
+    Aplică nivelurile per modul. Codul aplicației loghează prin logger-ul rădăcină
+    (`logging.info`), deci nivelul este căutat după numele logger-ului și apoi după
+    modulul care a emis înregistrarea.
+    """
+
+    def __init__(self, implicit, niveluri):
+        super().__init__()
+        self.implicit = implicit
+        self.niveluri = niveluri
+
+    def filter(self, record):
+        nivel = self.niveluri.get(record.name)
+        if nivel is None:
+            nivel = self.niveluri.get(record.module, self.implicit)
+        return record.levelno >= nivel
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler care nu blochează firul cererii când coada este plină."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _nivel(nume):
+    nivel = logging.getLevelName(nume.strip().upper())
+    return nivel if isinstance(nivel, int) else logging.INFO
+
+
+def _parseaza_niveluri(text):
+    """'database=WARNING,db_pool=DEBUG' -> {'database': 30, 'db_pool': 10}"""
+    niveluri = {}
+    for element in text.split(','):
+        if '=' in element:
+            modul, nivel = element.split('=', 1)
+            niveluri[modul.strip()] = _nivel(nivel)
+    return niveluri
+
+
+def _este_slow_query(record):
+    return record.name == 'slow_query'
+
+
+def _nu_este_slow_query(record):
+    return record.name != 'slow_query'
+
+
+def _handler_fisier(nume_fisier, formatter):
+    os.makedirs(LOG_DIR, exist_ok=True)
+    path = os.path.join(LOG_DIR, nume_fisier)
+    if LOG_ROTATION == 'time':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATION_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    handler.setFormatter(formatter)
+    return handler
+
+
+def setup_logging():
+    """
+    Configurează logging-ul aplicației: înregistrările sunt puse într-o coadă de
+    logger-ul rădăcină, iar un QueueListener le scrie în fișier (cu rotație) și în consolă
+    pe un fir separat, deci scrierea pe disc nu întârzie cererea. Poate fi apelată la
+    fiecare rerun; doar primul apel din proces configurează handler-ele.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        implicit = _nivel(LOG_LEVEL)
+        niveluri = _parseaza_niveluri(LOG_LEVELS)
+
+        handlers = []
+        try:
+            formatter = FormatorJSON() if LOG_FORMAT == 'json' else logging.Formatter(FORMAT_TEXT)
+            handlers.append(_handler_fisier(LOG_FILE, formatter))
+            # Interogările lente sunt scrise mereu ca JSON, cu toate câmpurile urmei
+            lente = _handler_fisier(SLOW_QUERY_LOG_FILE, FormatorJSON())
+            lente.addFilter(_este_slow_query)
+        except OSError as e:
+            # Fără drept de scriere în LOG_DIR continuăm doar cu consola
+            logging.getLogger(__name__).warning(f"Nu se poate scrie în {LOG_DIR}: {str(e)}")
+            lente = None
+        if LOG_CONSOLE or not handlers:
+            consola = logging.StreamHandler()
+            consola.setFormatter(logging.Formatter(FORMAT_TEXT))
+            handlers.append(consola)
+        for handler in handlers:
+            handler.addFilter(_nu_este_slow_query)
+        if lente is not None:
+            handlers.append(lente)
+
+        coada = queue.Queue(LOG_QUEUE_SIZE)
+        queue_handler = _QueueHandler(coada)
+        queue_handler.addFilter(FiltruNiveluri(implicit, niveluri))
+
+        root = logging.getLogger()
+        # Înlocuim handler-ele sincrone adăugate anterior (ex. de basicConfig)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        # Înregistrările sub toate nivelurile configurate nu sunt create deloc
+        root.setLevel(min([implicit] + list(niveluri.values())))
+
+        _listener = logging.handlers.QueueListener(coada, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Oprește firul de scriere după ce golește coada."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,14 +1,13 @@
 import streamlit as st
-import extra_streamlit_components as stx
 import logging
-from database import verify_credentials, get_user_service
-from pages._it_page import show_interventii_page
+from logging_config import setup_logging
+from metrics import porneste_export, cronometru, DURATA_RERUN
+from session_tokens import creeaza_token, verifica_token, revoca_token, verifica_configurare
+# database și pages._it_page (cu pandas) sunt importate doar după autentificare,
+# ca pagina de login să fie afișată fără ele
 from security_config import SESSION_TIMEOUT, MAX_LOGIN_ATTEMPTS, LOGIN_COOLDOWN, sanitize_input
 from datetime import datetime, timedelta
-import os
 import uuid
-import base64
-import json
 
 # Configurare pagină
 st.set_page_config(
@@ -40,112 +39,53 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Creăm directorul pentru loguri dacă nu există
-log_dir = os.path.join(os.path.dirname(__file__), 'logs')
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
+# Configurare logging (o singură dată per proces; scrierea în logs/ se face pe un fir separat)
+setup_logging()
+# Expunerea metricilor (METRICS_PORT / METRICS_FILE), pornită o singură dată per proces
+porneste_export()
+# Fără SESSION_SECRET valid aplicația nu pornește (vezi session_tokens.py)
+verifica_configurare()
 
-# Configurare logging
-log_file = os.path.join(log_dir, 'auth.log')
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    encoding='utf-8'
-)
-
-# Adăugăm și logging în consolă
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logging.getLogger('').addHandler(console_handler)
-
-def encode_session_data(data):
-    """Encodează datele sesiunii pentru URL."""
-    json_str = json.dumps(data)
-    return base64.urlsafe_b64encode(json_str.encode()).decode()
-
-def decode_session_data(encoded_data):
-    """Decodează datele sesiunii din URL."""
-    try:
-        json_str = base64.urlsafe_b64decode(encoded_data.encode()).decode()
-        return json.loads(json_str)
-    except:
-        return None
-
-def save_session_to_params(username, persistent=False):
-    """Salvează sesiunea în URL parameters."""
-    print(f"\nDEBUG: === Salvare sesiune pentru {username} ===")
+def save_session_to_params(principal, persistent=False):
+    """Salvează sesiunea în URL parameters, ca token semnat."""
     session_id = str(uuid.uuid4())
     login_time = datetime.now()
     
-    # Creăm datele sesiunii
-    session_data = {
-        'username': username,
-        'session_id': session_id,
-        'login_time': login_time.isoformat(),
-        'persistent': persistent
-    }
-    
-    # Encodăm datele pentru URL
-    encoded_data = encode_session_data(session_data)
+    # Pentru sesiuni persistente, folosim un timeout mai lung
+    timeout = SESSION_TIMEOUT * 3 if persistent else SESSION_TIMEOUT
     
-    # Salvăm în query params
-    st.query_params["session"] = encoded_data
+    # Token-ul conține tot ce trebuie pentru restaurarea sesiunii
+    st.query_params["session"] = creeaza_token(
+        principal, session_id, login_time, login_time + timeout, persistent
+    )
     
     # Actualizăm session state
     st.session_state['session_id'] = session_id
     st.session_state['login_time'] = login_time
     st.session_state['persistent_auth'] = persistent
-    print(f"DEBUG: Sesiune salvată în params: {session_data}")
 
 def init_session_state():
     """Inițializează variabilele de sesiune."""
-    print("\nDEBUG: === Inițializare sesiune ===")
+    # Încercăm să restaurăm sesiunea din query params (fără acces la baza de date)
+    token = st.query_params.get("session", None)
     
-    # Încercăm să restaurăm sesiunea din query params
-    encoded_session = st.query_params.get("session", None)
-    
-    if encoded_session:
-        session_data = decode_session_data(encoded_session)
-        print(f"DEBUG: Sesiune găsită în params: {session_data}")
-        
-        if session_data:
-            username = session_data.get('username')
-            session_id = session_data.get('session_id')
-            login_time_str = session_data.get('login_time')
-            is_persistent = session_data.get('persistent', False)
-            
-            try:
-                login_time = datetime.fromisoformat(login_time_str) if login_time_str else datetime.now()
-                
-                # Verificăm dacă sesiunea este validă
-                if username and session_id:
-                    # Pentru sesiuni persistente, folosim un timeout mai lung
-                    timeout = SESSION_TIMEOUT * 3 if is_persistent else SESSION_TIMEOUT
-                    time_passed = datetime.now() - login_time
-                    
-                    print(f"DEBUG: Timp trecut: {time_passed}, Timeout: {timeout}")
-                    
-                    if time_passed <= timeout:
-                        # Restaurăm sesiunea
-                        st.session_state['authentication_status'] = True
-                        st.session_state['username'] = username
-                        st.session_state['service'] = get_user_service(username)
-                        st.session_state['login_time'] = login_time
-                        st.session_state['session_id'] = session_id
-                        st.session_state['persistent_auth'] = is_persistent
-                        print(f"DEBUG: Sesiune restaurată cu succes pentru {username}")
-                        return
-                    else:
-                        print("DEBUG: Sesiune expirată")
-                        st.query_params.clear()
-            except Exception as e:
-                print(f"DEBUG: Eroare la restaurarea sesiunii: {str(e)}")
-                st.query_params.clear()
+    if token and not st.session_state.get('authentication_status'):
+        sesiune = verifica_token(token)
+        if sesiune:
+            # Restaurăm sesiunea
+            st.session_state['authentication_status'] = True
+            st.session_state['username'] = sesiune['username']
+            st.session_state['service'] = sesiune['serviciu']
+            st.session_state['user_id'] = sesiune['user_id']
+            st.session_state['este_manager'] = sesiune['este_manager']
+            st.session_state['login_time'] = sesiune['login_time']
+            st.session_state['session_id'] = sesiune['session_id']
+            st.session_state['persistent_auth'] = sesiune['persistent']
+            logging.debug(f"Sesiune restaurată pentru {sesiune['username']}")
+        else:
+            logging.info("Token de sesiune invalid, expirat sau revocat")
+            st.query_params.clear()
 
-    print("DEBUG: Inițializare sesiune nouă")
     # Inițializăm o sesiune nouă
     if 'authentication_status' not in st.session_state:
         st.session_state['authentication_status'] = False
@@ -172,6 +112,13 @@ def show_login_page():
         col1, col2 = st.sidebar.columns([3, 1])
         col1.write(f"👤 {st.session_state['username']}")
         if col2.button("Deconectare", key='logout'):
+            # Datele utilizatorului vor fi recitite la următoarea autentificare
+            from database import invalidate_principal
+            invalidate_principal(st.session_state['username'])
+            # Token-ul din URL nu mai poate restaura sesiunea
+            token = st.query_params.get("session", None)
+            if token:
+                revoca_token(token)
             # Ștergem query params
             st.query_params.clear()
             # Ștergem toate variabilele din sesiune
@@ -198,16 +145,20 @@ def show_login_page():
         if submitted and username and password:
             st.session_state['last_attempt_time'] = datetime.now()
             
+            from database import verify_credentials
             result = verify_credentials(username, password)
             if result['success']:
                 st.session_state['authentication_status'] = True
-                st.session_state['username'] = username
-                st.session_state['service'] = get_user_service(username)
+                # Username-ul din baza de date, ca în token: altfel cheile per utilizator diferă după reîncărcare
+                st.session_state['username'] = result['username']
+                st.session_state['service'] = result['serviciu']
+                st.session_state['user_id'] = result['user_id']
+                st.session_state['este_manager'] = result['este_manager']
                 
                 # Salvăm sesiunea în params
-                save_session_to_params(username, persistent=remember_me)
+                save_session_to_params(result, persistent=remember_me)
                 
-                logging.info(f"Autentificare reușită pentru utilizatorul {username}")
+                logging.info(f"Autentificare reușită pentru utilizatorul {result['username']}")
                 st.rerun()
             else:
                 st.session_state['login_attempts'] += 1
@@ -249,16 +200,30 @@ def check_session_timeout():
 
 def main():
     """Funcția principală a aplicației."""
-    # Inițializăm starea sesiunii
-    init_session_state()
-    
-    # Verificăm timeout-ul sesiunii
-    check_session_timeout()
-    
-    # Afișăm pagina de login sau pagina principală
-    if show_login_page():
-        st.title("Aplicație Intervenții")
-        show_interventii_page()
+    with cronometru(DURATA_RERUN, section='total'):
+        # Inițializăm starea sesiunii
+        init_session_state()
+        
+        # Verificăm timeout-ul sesiunii
+        check_session_timeout()
+        
+        # Afișăm pagina de login sau pagina principală
+        with cronometru(DURATA_RERUN, section='login'):
+            autentificat = show_login_page()
+        if autentificat:
+            st.title("Aplicație Intervenții")
+            # Șeful de birou poate deschide și rapoartele
+            pagina = 'Registru'
+            if st.session_state.get('este_manager'):
+                pagina = st.sidebar.radio("Pagina", options=['Registru', 'Rapoarte'], key='pagina_curenta')
+            if pagina == 'Rapoarte':
+                with cronometru(DURATA_RERUN, section='rapoarte'):
+                    from pages._rapoarte_page import show_rapoarte_page
+                    show_rapoarte_page()
+            else:
+                with cronometru(DURATA_RERUN, section='interventii'):
+                    from pages._it_page import show_interventii_page
+                    show_interventii_page()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,310 @@
+import functools
+import logging
+import os
+import threading
+import time
+
+# Portul local pe care sunt expuse metricile (/metrics); gol = dezactivat
+METRICS_PORT = os.getenv('METRICS_PORT', '')
+METRICS_ADDRESS = os.getenv('METRICS_ADDRESS', '127.0.0.1')
+# Fișierul în care metricile sunt scrise periodic (ex. pentru textfile collector-ul
+# node_exporter); gol = dezactivat
+METRICS_FILE = os.getenv('METRICS_FILE', '')
+METRICS_FILE_INTERVAL = float(os.getenv('METRICS_FILE_INTERVAL', '15'))
+
+# Limitele (în secunde) ale histogramelor de durată
+LIMITE_DURATA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = 'appelcen_'
+
+_metrici = {}
+_colectori = []
+_lock = threading.Lock()
+_export_pornit = False
+
+
+def _eticheta(valoare):
+    return str(valoare).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_etichete(nume, valori, extra=None):
+    perechi = list(zip(nume, valori))
+    if extra:
+        perechi.append(extra)
+    if not perechi:
+        return ''
+    return '{' + ','.join(f'{n}="{_eticheta(v)}"' for n, v in perechi) + '}'
+
+
+def _format_numar(valoare):
+    if valoare == float('inf'):
+        return '+Inf'
+    if isinstance(valoare, float) and valoare.is_integer():
+        return str(int(valoare))
+    return repr(valoare) if isinstance(valoare, float) else str(valoare)
+
+
+class Contor:
+    """Contor monoton, cu etichete opționale."""
+
+    tip = 'counter'
+
+    def __init__(self, nume, ajutor, etichete=()):
+        self.nume = nume
+        self.ajutor = ajutor
+        self.etichete = tuple(etichete)
+        self._valori = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valoare=1, **etichete):
+        cheie = tuple(etichete.get(e, '') for e in self.etichete)
+        with self._lock:
+            self._valori[cheie] = self._valori.get(cheie, 0) + valoare
+
+    def linii(self):
+        with self._lock:
+            valori = sorted(self._valori.items())
+        return [
+            f"{self.nume}{_format_etichete(self.etichete, cheie)} {_format_numar(valoare)}"
+            for cheie, valoare in valori
+        ]
+
+
+class Histograma:
+    """Histogramă cu limite fixe (cumulative la expunere, ca în formatul Prometheus)."""
+
+    tip = 'histogram'
+
+    def __init__(self, nume, ajutor, etichete=(), limite=LIMITE_DURATA):
+        self.nume = nume
+        self.ajutor = ajutor
+        self.etichete = tuple(etichete)
+        self.limite = tuple(limite)
+        self._valori = {}  # etichete -> [numărători per interval, sumă, total]
+        self._lock = threading.Lock()
+
+    def observe(self, valoare, **etichete):
+        cheie = tuple(etichete.get(e, '') for e in self.etichete)
+        with self._lock:
+            stare = self._valori.get(cheie)
+            if stare is None:
+                stare = self._valori[cheie] = [[0] * len(self.limite), 0.0, 0]
+            for i, limita in enumerate(self.limite):
+                if valoare <= limita:
+                    stare[0][i] += 1
+                    break
+            stare[1] += valoare
+            stare[2] += 1
+
+    def linii(self):
+        with self._lock:
+            valori = sorted((cheie, (list(s[0]), s[1], s[2])) for cheie, s in self._valori.items())
+        linii = []
+        for cheie, (intervale, suma, total) in valori:
+            cumulat = 0
+            for limita, numar in zip(self.limite, intervale):
+                cumulat += numar
+                etichete = _format_etichete(self.etichete, cheie, ('le', _format_numar(float(limita))))
+                linii.append(f"{self.nume}_bucket{etichete} {cumulat}")
+            etichete = _format_etichete(self.etichete, cheie, ('le', '+Inf'))
+            linii.append(f"{self.nume}_bucket{etichete} {total}")
+            linii.append(f"{self.nume}_sum{_format_etichete(self.etichete, cheie)} {_format_numar(suma)}")
+            linii.append(f"{self.nume}_count{_format_etichete(self.etichete, cheie)} {total}")
+        return linii
+
+
+def _inregistreaza(clasa, nume, ajutor, etichete, **kwargs):
+    nume = PREFIX + nume
+    with _lock:
+        metrica = _metrici.get(nume)
+        if metrica is None:
+            metrica = _metrici[nume] = clasa(nume, ajutor, etichete, **kwargs)
+        return metrica
+
+
+def contor(nume, ajutor, etichete=()):
+    """Returnează contorul `nume` (prefixat cu PREFIX), creându-l la primul apel."""
+    return _inregistreaza(Contor, nume, ajutor, etichete)
+
+
+def histograma(nume, ajutor, etichete=(), limite=LIMITE_DURATA):
+    """Returnează histograma `nume` (prefixată cu PREFIX), creând-o la primul apel."""
+    return _inregistreaza(Histograma, nume, ajutor, etichete, limite=limite)
+
+
+def inregistreaza_colector(functie):
+    """
+    Adaugă o funcție apelată la fiecare expunere, care returnează valori calculate atunci
+    (ex. starea pool-ului): o listă de (nume, tip, ajutor, valoare).
+    """
+    with _lock:
+        if functie not in _colectori:
+            _colectori.append(functie)
+    return functie
+
+
+# --- Metricile aplicației ---
+
+DURATA_DB = histograma('db_call_duration_seconds', "Durata apelurilor database.py", ('function',))
+RANDURI_DB = contor('db_rows_total', "Rânduri returnate de apelurile database.py", ('function',))
+ERORI_DB = contor('db_errors_total', "Excepții propagate din apelurile database.py", ('function',))
+AUTENTIFICARI = contor('login_total', "Încercări de autentificare după rezultat", ('result',))
+DURATA_RERUN = histograma('rerun_duration_seconds', "Durata unui rerun main() sau al unui fragment, pe secțiuni", ('section',))
+
+
+def _numar_randuri(rezultat):
+    """Rândurile dintr-un rezultat: listă, DataFrame sau dicționar cu 'rows'."""
+    if isinstance(rezultat, dict) and 'rows' in rezultat:
+        rezultat = rezultat['rows']
+    if isinstance(rezultat, (list, tuple)) or hasattr(rezultat, 'shape'):
+        return len(rezultat)
+    return None
+
+
+def masoara(functie):
+    """Decorator: durata fiecărui apel și rândurile returnate, etichetate cu numele funcției."""
+    nume = functie.__name__
+
+    @functools.wraps(functie)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            rezultat = functie(*args, **kwargs)
+        except Exception:
+            ERORI_DB.inc(function=nume)
+            raise
+        finally:
+            DURATA_DB.observe(time.perf_counter() - start, function=nume)
+        randuri = _numar_randuri(rezultat)
+        if randuri:
+            RANDURI_DB.inc(randuri, function=nume)
+        return rezultat
+
+    return wrapper
+
+
+class cronometru:
+    """Context manager care adaugă durata blocului în histograma dată."""
+
+    def __init__(self, histograma, **etichete):
+        self.histograma = histograma
+        self.etichete = etichete
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histograma.observe(time.perf_counter() - self.start, **self.etichete)
+        return False
+
+
+@inregistreaza_colector
+def _colector_pool():
+    from db_pool import pool_metrics
+    stare = pool_metrics()
+    if not stare:
+        return []
+    return [
+        ('db_connections_opened_total', 'counter', "Conexiuni deschise de pool", stare['connections_created']),
+        ('db_connections_closed_total', 'counter', "Conexiuni închise de pool", stare['connections_closed']),
+        ('db_pool_checkouts_total', 'counter', "Conexiuni împrumutate din pool", stare['checkouts']),
+        ('db_pool_timeouts_total', 'counter', "Așteptări după o conexiune expirate", stare['timeouts']),
+        ('db_pool_wait_seconds_total', 'counter', "Timpul total de așteptare după o conexiune",
+         stare['wait_time_total']),
+        ('db_pool_connections', 'gauge', "Conexiuni deschise (libere și împrumutate)", stare['size']),
+        ('db_pool_idle_connections', 'gauge', "Conexiuni libere în pool", stare['idle']),
+    ]
+
+
+@inregistreaza_colector
+def _colector_executor():
+    from db_executor import executor_metrics
+    stare = executor_metrics()
+    return [
+        ('db_executor_submitted_total', 'counter', "Citiri trimise executorului", stare['submitted']),
+        ('db_executor_failed_total', 'counter', "Citiri terminate cu eroare", stare['failed']),
+        ('db_executor_timeouts_total', 'counter', "Citiri care au depășit timpul alocat", stare['timeouts']),
+        ('db_executor_rejected_total', 'counter', "Citiri refuzate (executor ocupat)", stare['rejected']),
+    ]
+
+
+def expune():
+    """Toate metricile, în formatul text Prometheus (versiunea 0.0.4)."""
+    with _lock:
+        metrici = list(_metrici.values())
+        colectori = list(_colectori)
+
+    linii = []
+    for metrica in metrici:
+        valori = metrica.linii()
+        if valori:
+            linii.append(f"# HELP {metrica.nume} {metrica.ajutor}")
+            linii.append(f"# TYPE {metrica.nume} {metrica.tip}")
+            linii.extend(valori)
+    for colector in colectori:
+        try:
+            valori = colector()
+        except Exception as e:
+            logging.warning(f"Eroare la colectarea metricilor ({colector.__name__}): {str(e)}")
+            continue
+        for nume, tip, ajutor, valoare in valori:
+            linii.append(f"# HELP {PREFIX}{nume} {ajutor}")
+            linii.append(f"# TYPE {PREFIX}{nume} {tip}")
+            linii.append(f"{PREFIX}{nume} {_format_numar(valoare)}")
+    return '\n'.join(linii) + '\n'
+
+
+def _scrie_fisier():
+    while True:
+        time.sleep(METRICS_FILE_INTERVAL)
+        try:
+            temporar = f"{METRICS_FILE}.tmp"
+            with open(temporar, 'w', encoding='utf-8') as f:
+                f.write(expune())
+            # Înlocuire atomică: cititorul nu vede niciodată un fișier scris pe jumătate
+            os.replace(temporar, METRICS_FILE)
+        except Exception as e:
+            logging.warning(f"Eroare la scrierea metricilor în {METRICS_FILE}: {str(e)}")
+
+
+def porneste_export():
+    """
+    Pornește expunerea metricilor configurată prin METRICS_PORT și/sau METRICS_FILE,
+    pe fire de fundal. Poate fi apelată la fiecare rerun; pornește o singură dată per proces.
+    """
+    global _export_pornit
+    with _lock:
+        if _export_pornit:
+            return
+        _export_pornit = True
+
+    if METRICS_PORT:
+        # http.server este importat doar când serverul este folosit
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class HandlerMetrici(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                continut = expune().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(continut)))
+                self.end_headers()
+                self.wfile.write(continut)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer((METRICS_ADDRESS, int(METRICS_PORT)), HandlerMetrici)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name='metrics_http', daemon=True).start()
+            logging.info(f"Metrici expuse pe http://{METRICS_ADDRESS}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            logging.error(f"Serverul de metrici nu a putut porni pe portul {METRICS_PORT}: {str(e)}")
+    if METRICS_FILE:
+        threading.Thread(target=_scrie_fisier, name='metrics_file', daemon=True).start()
+        logging.info(f"Metrici scrise în {METRICS_FILE} la fiecare {METRICS_FILE_INTERVAL:.0f}s")
@@ -0,0 +1,42 @@
+import logging
+from backends import get_backend
+
+def aplica_migrari_conexiune(conn, backend):
+    """Aplică, în ordine, migrările backend-ului care nu au fost încă aplicate pe conexiunea dată."""
+    cursor = conn.cursor()
+    backend.ensure_migrations_table(cursor)
+    conn.commit()
+    
+    cursor.execute("SELECT Versiune FROM SchemaMigrations")
+    aplicate = {row[0] for row in cursor.fetchall()}
+    
+    noi = []
+    for path in sorted(backend.migrations_dir.glob('*.sql')):
+        if path.stem in aplicate:
+            continue
+        logging.info(f"Aplicăm migrarea {backend.name}/{path.name}")
+        try:
+            backend.execute_script(cursor, path.read_text(encoding='utf-8'), path.stem)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Eroare la aplicarea migrării {path.name}: {str(e)}")
+            raise
+        noi.append(path.stem)
+    
+    return noi
+
+def aplica_migrari():
+    """Aplică migrările din migrations/<backend>/ pe baza de date configurată."""
+    from database import db_connection
+    
+    with db_connection() as conn:
+        if not conn:
+            logging.error("Nu s-a putut obține conexiunea la baza de date pentru migrări")
+            return []
+        return aplica_migrari_conexiune(conn, get_backend())
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    aplicate = aplica_migrari()
+    print(f"Migrări aplicate: {', '.join(aplicate) if aplicate else 'niciuna'}")
@@ -0,0 +1,42 @@
+-- Schema de bază, echivalentă cu tabelele existente în SQL Server.
+CREATE TABLE IF NOT EXISTS Servicii (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Nume TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Utilizatori (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    NumeUtilizator TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    Parola TEXT,
+    ServiciuID INTEGER REFERENCES Servicii (ID),
+    EsteManager INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS RegistruInterventii (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    NrCrt INTEGER,
+    DataInterventie DATE NOT NULL,
+    Zi TEXT,
+    Solicitant TEXT,
+    Solicitare TEXT,
+    Ora TIME,
+    DurataInterventie INTEGER,
+    PersonalITC TEXT,
+    Observatii TEXT,
+    ServiciuID INTEGER REFERENCES Servicii (ID),
+    Status TEXT NOT NULL DEFAULT 'In Asteptare',
+    DataAprobare DATETIME,
+    AprobatDe TEXT
+);
+
+-- NrCrt continuă numerotarea pentru rândurile inserate fără el
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_NrCrt
+AFTER INSERT ON RegistruInterventii
+WHEN NEW.NrCrt IS NULL
+BEGIN
+    UPDATE RegistruInterventii
+    SET NrCrt = (SELECT COALESCE(MAX(NrCrt), 0) + 1 FROM RegistruInterventii)
+    WHERE ID = NEW.ID;
+END;
+
+INSERT OR IGNORE INTO Servicii (Nume) VALUES ('IT');
@@ -0,0 +1,3 @@
+-- Index pentru paginarea keyset a registrului (get_interventii_pagina)
+CREATE INDEX IF NOT EXISTS IX_RegistruInterventii_Paginare
+ON RegistruInterventii (DataInterventie DESC, Ora DESC, NrCrt DESC);
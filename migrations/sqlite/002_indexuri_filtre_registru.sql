@@ -0,0 +1,3 @@
+-- Index pentru filtrul pe Personal ITC, în ordinea paginării
+CREATE INDEX IF NOT EXISTS IX_RegistruInterventii_PersonalITC
+ON RegistruInterventii (PersonalITC, DataInterventie DESC, Ora DESC, NrCrt DESC);
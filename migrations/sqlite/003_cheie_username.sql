@@ -0,0 +1,7 @@
+-- Cheie indexată pentru căutarea username-ului fără puncte
+ALTER TABLE Utilizatori
+ADD COLUMN NumeUtilizatorCheie TEXT
+GENERATED ALWAYS AS (lower(replace(NumeUtilizator, '.', ''))) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS IX_Utilizatori_NumeUtilizatorCheie
+ON Utilizatori (NumeUtilizatorCheie);
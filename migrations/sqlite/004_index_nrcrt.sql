@@ -0,0 +1,3 @@
+-- Index pe NrCrt: triggerul de numerotare (MAX(NrCrt)) și aprobările (WHERE NrCrt IN (...))
+-- nu mai parcurg tot registrul; fără el importul devine pătratic în numărul de rânduri
+CREATE INDEX IF NOT EXISTS IX_RegistruInterventii_NrCrt ON RegistruInterventii (NrCrt);
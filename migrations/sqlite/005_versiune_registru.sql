@@ -0,0 +1,46 @@
+-- Versiunea rândurilor registrului, folosită la actualizarea incrementală a indexului de căutare (cautare.py).
+-- SQLite nu are rowversion: contorul din VersiuneRegistru este incrementat de triggere
+-- la fiecare INSERT/UPDATE/DELETE, iar valoarea lui este copiată în VersiuneRand.
+CREATE TABLE IF NOT EXISTS VersiuneRegistru (
+    ID INTEGER PRIMARY KEY CHECK (ID = 1),
+    Valoare INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO VersiuneRegistru (ID, Valoare) VALUES (1, 0);
+
+ALTER TABLE RegistruInterventii ADD COLUMN VersiuneRand INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS IX_RegistruInterventii_VersiuneRand ON RegistruInterventii (VersiuneRand);
+
+CREATE TABLE IF NOT EXISTS RegistruInterventiiSterse (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    VersiuneRand INTEGER NOT NULL,
+    DataStergere DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS IX_RegistruInterventiiSterse_VersiuneRand ON RegistruInterventiiSterse (VersiuneRand);
+
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_VersiuneInsert
+AFTER INSERT ON RegistruInterventii
+BEGIN
+    UPDATE VersiuneRegistru SET Valoare = Valoare + 1 WHERE ID = 1;
+    UPDATE RegistruInterventii
+    SET VersiuneRand = (SELECT Valoare FROM VersiuneRegistru WHERE ID = 1)
+    WHERE ID = NEW.ID;
+END;
+
+-- Condiția WHEN exclude actualizarea făcută chiar de triggere (care schimbă VersiuneRand)
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_VersiuneUpdate
+AFTER UPDATE ON RegistruInterventii
+WHEN NEW.VersiuneRand = OLD.VersiuneRand
+BEGIN
+    UPDATE VersiuneRegistru SET Valoare = Valoare + 1 WHERE ID = 1;
+    UPDATE RegistruInterventii
+    SET VersiuneRand = (SELECT Valoare FROM VersiuneRegistru WHERE ID = 1)
+    WHERE ID = NEW.ID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_Sterse
+AFTER DELETE ON RegistruInterventii
+BEGIN
+    UPDATE VersiuneRegistru SET Valoare = Valoare + 1 WHERE ID = 1;
+    INSERT OR REPLACE INTO RegistruInterventiiSterse (ID, VersiuneRand)
+    SELECT OLD.ID, Valoare FROM VersiuneRegistru WHERE ID = 1;
+END;
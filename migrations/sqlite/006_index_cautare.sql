@@ -0,0 +1,16 @@
+-- Index inversat pentru căutarea în Solicitant, Solicitare și Observatii (cautare.py).
+-- COLLATE NOCASE permite folosirea cheii primare pentru LIKE 'prefix%'
+CREATE TABLE IF NOT EXISTS IndexCautare (
+    Termen TEXT NOT NULL COLLATE NOCASE,
+    ID INTEGER NOT NULL,
+    Pondere INTEGER NOT NULL,
+    PRIMARY KEY (Termen, ID)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS IX_IndexCautare_ID ON IndexCautare (ID);
+
+-- Versiunea registrului (VersiuneRand) până la care indexul este actualizat
+CREATE TABLE IF NOT EXISTS IndexCautareStare (
+    ID INTEGER PRIMARY KEY CHECK (ID = 1),
+    Versiune INTEGER
+);
+INSERT OR IGNORE INTO IndexCautareStare (ID, Versiune) VALUES (1, NULL);
@@ -0,0 +1,53 @@
+-- Alocarea NrCrt la inserare, dintr-un contor (în locul MAX(NrCrt) + 1).
+-- Ultimul: ultimul NrCrt alocat; UltimaData: cea mai recentă DataInterventie înregistrată;
+-- RenumerotareDeLa: data de la care numerotarea trebuie refăcută după o inserare cu dată
+-- în trecut, o ștergere sau o schimbare de dată (NULL dacă numerotarea este la zi).
+CREATE TABLE IF NOT EXISTS AlocareNrCrt (
+    ID INTEGER PRIMARY KEY CHECK (ID = 1),
+    Ultimul INTEGER NOT NULL,
+    UltimaData DATE,
+    RenumerotareDeLa DATE
+);
+INSERT OR IGNORE INTO AlocareNrCrt (ID, Ultimul, UltimaData, RenumerotareDeLa)
+SELECT 1, COALESCE(MAX(NrCrt), 0), MAX(DataInterventie), NULL FROM RegistruInterventii;
+
+-- Scrierile în SQLite sunt serializate, deci contorul nu poate fi alocat de două ori;
+-- o tranzacție anulată anulează și incrementarea, așa că numerotarea rămâne fără goluri.
+DROP TRIGGER IF EXISTS TR_RegistruInterventii_NrCrt;
+CREATE TRIGGER TR_RegistruInterventii_NrCrt
+AFTER INSERT ON RegistruInterventii
+BEGIN
+    UPDATE AlocareNrCrt
+    SET RenumerotareDeLa = CASE
+            WHEN NEW.DataInterventie < UltimaData
+            THEN MIN(COALESCE(RenumerotareDeLa, NEW.DataInterventie), NEW.DataInterventie)
+            ELSE RenumerotareDeLa
+        END,
+        UltimaData = MAX(COALESCE(UltimaData, NEW.DataInterventie), NEW.DataInterventie),
+        Ultimul = CASE WHEN NEW.NrCrt IS NULL THEN Ultimul + 1 ELSE MAX(Ultimul, NEW.NrCrt) END
+    WHERE ID = 1;
+
+    UPDATE RegistruInterventii
+    SET NrCrt = (SELECT Ultimul FROM AlocareNrCrt WHERE ID = 1)
+    WHERE ID = NEW.ID AND NEW.NrCrt IS NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_NrCrtSterse
+AFTER DELETE ON RegistruInterventii
+BEGIN
+    UPDATE AlocareNrCrt
+    SET RenumerotareDeLa = MIN(COALESCE(RenumerotareDeLa, OLD.DataInterventie), OLD.DataInterventie)
+    WHERE ID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_NrCrtData
+AFTER UPDATE OF DataInterventie ON RegistruInterventii
+WHEN NEW.DataInterventie <> OLD.DataInterventie
+BEGIN
+    UPDATE AlocareNrCrt
+    SET RenumerotareDeLa = MIN(
+            COALESCE(RenumerotareDeLa, OLD.DataInterventie), OLD.DataInterventie, NEW.DataInterventie
+        ),
+        UltimaData = MAX(COALESCE(UltimaData, NEW.DataInterventie), NEW.DataInterventie)
+    WHERE ID = 1;
+END;
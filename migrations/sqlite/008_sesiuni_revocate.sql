@@ -0,0 +1,8 @@
+-- Sesiunile revocate înainte de expirare (deconectare); un rând este util doar până la
+-- expirarea token-ului, după care este șters.
+CREATE TABLE IF NOT EXISTS SesiuniRevocate (
+    SessionID TEXT NOT NULL PRIMARY KEY,
+    Expira DATETIME NOT NULL,
+    DataRevocare DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS IX_SesiuniRevocate_Expira ON SesiuniRevocate (Expira);
@@ -0,0 +1,142 @@
+-- Agregatele rapoartelor (rapoarte.py), ținute la zi de triggere la fiecare inserare,
+-- aprobare, modificare sau ștergere, în aceeași tranzacție cu scrierea în registru.
+-- RaportLunar: intervențiile și durata lor pe lună (AAAA-LL), personal IT și status;
+-- PersonalITC lipsă este păstrat ca ''.
+CREATE TABLE IF NOT EXISTS RaportLunar (
+    Luna TEXT NOT NULL,
+    PersonalITC TEXT NOT NULL,
+    Status TEXT NOT NULL,
+    NrInterventii INTEGER NOT NULL,
+    DurataTotala INTEGER NOT NULL,
+    PRIMARY KEY (Luna, PersonalITC, Status)
+) WITHOUT ROWID;
+
+-- RaportOrar: intervențiile și durata lor pe zi a săptămânii (1 = luni ... 7 = duminică)
+-- și oră (0-23); intervențiile fără oră nu sunt incluse.
+CREATE TABLE IF NOT EXISTS RaportOrar (
+    ZiSaptamana INTEGER NOT NULL,
+    Ora INTEGER NOT NULL,
+    NrInterventii INTEGER NOT NULL,
+    DurataTotala INTEGER NOT NULL,
+    PRIMARY KEY (ZiSaptamana, Ora)
+) WITHOUT ROWID;
+
+DELETE FROM RaportLunar;
+INSERT INTO RaportLunar (Luna, PersonalITC, Status, NrInterventii, DurataTotala)
+SELECT strftime('%Y-%m', DataInterventie), COALESCE(PersonalITC, ''), Status,
+       COUNT(*), SUM(COALESCE(DurataInterventie, 0))
+FROM RegistruInterventii
+GROUP BY strftime('%Y-%m', DataInterventie), COALESCE(PersonalITC, ''), Status;
+
+DELETE FROM RaportOrar;
+INSERT INTO RaportOrar (ZiSaptamana, Ora, NrInterventii, DurataTotala)
+SELECT (CAST(strftime('%w', DataInterventie) AS INTEGER) + 6) % 7 + 1,
+       CAST(strftime('%H', Ora) AS INTEGER),
+       COUNT(*), SUM(COALESCE(DurataInterventie, 0))
+FROM RegistruInterventii
+WHERE strftime('%H', Ora) IS NOT NULL
+GROUP BY (CAST(strftime('%w', DataInterventie) AS INTEGER) + 6) % 7 + 1,
+         CAST(strftime('%H', Ora) AS INTEGER);
+
+-- WHERE true evită ambiguitatea INSERT ... SELECT ... ON CONFLICT din SQLite
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_RapoarteInsert
+AFTER INSERT ON RegistruInterventii
+BEGIN
+    INSERT INTO RaportLunar (Luna, PersonalITC, Status, NrInterventii, DurataTotala)
+    SELECT strftime('%Y-%m', NEW.DataInterventie), COALESCE(NEW.PersonalITC, ''), NEW.Status,
+           1, COALESCE(NEW.DurataInterventie, 0)
+    WHERE true
+    ON CONFLICT (Luna, PersonalITC, Status) DO UPDATE
+    SET NrInterventii = NrInterventii + 1,
+        DurataTotala = DurataTotala + excluded.DurataTotala;
+
+    INSERT INTO RaportOrar (ZiSaptamana, Ora, NrInterventii, DurataTotala)
+    SELECT (CAST(strftime('%w', NEW.DataInterventie) AS INTEGER) + 6) % 7 + 1,
+           CAST(strftime('%H', NEW.Ora) AS INTEGER),
+           1, COALESCE(NEW.DurataInterventie, 0)
+    WHERE strftime('%H', NEW.Ora) IS NOT NULL
+    ON CONFLICT (ZiSaptamana, Ora) DO UPDATE
+    SET NrInterventii = NrInterventii + 1,
+        DurataTotala = DurataTotala + excluded.DurataTotala;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_RapoarteDelete
+AFTER DELETE ON RegistruInterventii
+BEGIN
+    UPDATE RaportLunar
+    SET NrInterventii = NrInterventii - 1,
+        DurataTotala = DurataTotala - COALESCE(OLD.DurataInterventie, 0)
+    WHERE Luna = strftime('%Y-%m', OLD.DataInterventie)
+      AND PersonalITC = COALESCE(OLD.PersonalITC, '')
+      AND Status = OLD.Status;
+    DELETE FROM RaportLunar
+    WHERE Luna = strftime('%Y-%m', OLD.DataInterventie)
+      AND PersonalITC = COALESCE(OLD.PersonalITC, '')
+      AND Status = OLD.Status
+      AND NrInterventii <= 0;
+
+    UPDATE RaportOrar
+    SET NrInterventii = NrInterventii - 1,
+        DurataTotala = DurataTotala - COALESCE(OLD.DurataInterventie, 0)
+    WHERE ZiSaptamana = (CAST(strftime('%w', OLD.DataInterventie) AS INTEGER) + 6) % 7 + 1
+      AND Ora = CAST(strftime('%H', OLD.Ora) AS INTEGER);
+    DELETE FROM RaportOrar
+    WHERE ZiSaptamana = (CAST(strftime('%w', OLD.DataInterventie) AS INTEGER) + 6) % 7 + 1
+      AND Ora = CAST(strftime('%H', OLD.Ora) AS INTEGER)
+      AND NrInterventii <= 0;
+END;
+
+-- Aprobarea schimbă doar Status: se actualizează RaportLunar, nu și RaportOrar
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_RapoarteLunarUpdate
+AFTER UPDATE OF DataInterventie, PersonalITC, Status, DurataInterventie ON RegistruInterventii
+WHEN NEW.DataInterventie IS NOT OLD.DataInterventie
+  OR NEW.PersonalITC IS NOT OLD.PersonalITC
+  OR NEW.Status IS NOT OLD.Status
+  OR NEW.DurataInterventie IS NOT OLD.DurataInterventie
+BEGIN
+    UPDATE RaportLunar
+    SET NrInterventii = NrInterventii - 1,
+        DurataTotala = DurataTotala - COALESCE(OLD.DurataInterventie, 0)
+    WHERE Luna = strftime('%Y-%m', OLD.DataInterventie)
+      AND PersonalITC = COALESCE(OLD.PersonalITC, '')
+      AND Status = OLD.Status;
+    DELETE FROM RaportLunar
+    WHERE Luna = strftime('%Y-%m', OLD.DataInterventie)
+      AND PersonalITC = COALESCE(OLD.PersonalITC, '')
+      AND Status = OLD.Status
+      AND NrInterventii <= 0;
+
+    INSERT INTO RaportLunar (Luna, PersonalITC, Status, NrInterventii, DurataTotala)
+    SELECT strftime('%Y-%m', NEW.DataInterventie), COALESCE(NEW.PersonalITC, ''), NEW.Status,
+           1, COALESCE(NEW.DurataInterventie, 0)
+    WHERE true
+    ON CONFLICT (Luna, PersonalITC, Status) DO UPDATE
+    SET NrInterventii = NrInterventii + 1,
+        DurataTotala = DurataTotala + excluded.DurataTotala;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_RegistruInterventii_RapoarteOrarUpdate
+AFTER UPDATE OF DataInterventie, Ora, DurataInterventie ON RegistruInterventii
+WHEN NEW.DataInterventie IS NOT OLD.DataInterventie
+  OR NEW.Ora IS NOT OLD.Ora
+  OR NEW.DurataInterventie IS NOT OLD.DurataInterventie
+BEGIN
+    UPDATE RaportOrar
+    SET NrInterventii = NrInterventii - 1,
+        DurataTotala = DurataTotala - COALESCE(OLD.DurataInterventie, 0)
+    WHERE ZiSaptamana = (CAST(strftime('%w', OLD.DataInterventie) AS INTEGER) + 6) % 7 + 1
+      AND Ora = CAST(strftime('%H', OLD.Ora) AS INTEGER);
+    DELETE FROM RaportOrar
+    WHERE ZiSaptamana = (CAST(strftime('%w', OLD.DataInterventie) AS INTEGER) + 6) % 7 + 1
+      AND Ora = CAST(strftime('%H', OLD.Ora) AS INTEGER)
+      AND NrInterventii <= 0;
+
+    INSERT INTO RaportOrar (ZiSaptamana, Ora, NrInterventii, DurataTotala)
+    SELECT (CAST(strftime('%w', NEW.DataInterventie) AS INTEGER) + 6) % 7 + 1,
+           CAST(strftime('%H', NEW.Ora) AS INTEGER),
+           1, COALESCE(NEW.DurataInterventie, 0)
+    WHERE strftime('%H', NEW.Ora) IS NOT NULL
+    ON CONFLICT (ZiSaptamana, Ora) DO UPDATE
+    SET NrInterventii = NrInterventii + 1,
+        DurataTotala = DurataTotala + excluded.DurataTotala;
+END;
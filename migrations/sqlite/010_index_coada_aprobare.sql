@@ -0,0 +1,7 @@
+-- Coada de aprobare (get_interventii_in_asteptare): intervențiile în așteptare, cele mai
+-- vechi primele. Indexul parțial conține doar rândurile în așteptare, deci o pagină este
+-- citită direct din index, oricât de mare ar fi registrul. Condiția trebuie să fie identică
+-- cu cea din interogare (database._CONDITIE_IN_ASTEPTARE).
+CREATE INDEX IF NOT EXISTS IX_RegistruInterventii_InAsteptare
+ON RegistruInterventii (DataInterventie, ID)
+WHERE Status IN ('In Asteptare', 'In asteptare', 'in asteptare');
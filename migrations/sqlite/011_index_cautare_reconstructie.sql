@@ -0,0 +1,10 @@
+-- Tabel de lucru pentru reconstruirea indexului de căutare (cautare.py): indexul nou este
+-- construit aici, apoi înlocuiește IndexCautare într-o singură tranzacție, deci căutările
+-- nu văd niciodată un index gol sau incomplet. Structura este identică cu IndexCautare.
+CREATE TABLE IF NOT EXISTS IndexCautareNou (
+    Termen TEXT NOT NULL COLLATE NOCASE,
+    ID INTEGER NOT NULL,
+    Pondere INTEGER NOT NULL,
+    PRIMARY KEY (Termen, ID)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS IX_IndexCautareNou_ID ON IndexCautareNou (ID);
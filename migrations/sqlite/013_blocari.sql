@@ -0,0 +1,9 @@
+-- Blocări comune proceselor care folosesc aceeași bază (SqliteBackend.obtine_blocare),
+-- de exemplu pentru actualizarea indexului de căutare. Pe SQL Server rolul lor îl are
+-- sp_getapplock. Un rând este blocarea deținută de `Detinator` până la `ExpiraLa`
+-- (julianday), prelungită cât timp procesul lucrează.
+CREATE TABLE IF NOT EXISTS Blocari (
+    Resursa TEXT PRIMARY KEY,
+    Detinator TEXT NOT NULL,
+    ExpiraLa REAL NOT NULL
+);
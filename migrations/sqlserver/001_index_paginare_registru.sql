@@ -0,0 +1,12 @@
+-- Index pentru paginarea keyset a registrului (get_interventii_pagina):
+-- ORDER BY DataInterventie DESC, Ora DESC, NrCrt DESC
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_RegistruInterventii_Paginare'
+      AND object_id = OBJECT_ID('RegistruInterventii')
+)
+BEGIN
+    CREATE INDEX IX_RegistruInterventii_Paginare
+    ON RegistruInterventii (DataInterventie DESC, Ora DESC, NrCrt DESC);
+END
+GO
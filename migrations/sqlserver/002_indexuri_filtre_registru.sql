@@ -0,0 +1,25 @@
+-- Indexuri pentru filtrele registrului (get_interventii_pagina cu `filtre`).
+-- Filtrul pe perioadă folosește IX_RegistruInterventii_Paginare, care începe cu DataInterventie.
+-- Filtrul pe Personal ITC păstrează ordinea paginării după egalitatea pe PersonalITC.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_RegistruInterventii_PersonalITC'
+      AND object_id = OBJECT_ID('RegistruInterventii')
+)
+BEGIN
+    CREATE INDEX IX_RegistruInterventii_PersonalITC
+    ON RegistruInterventii (PersonalITC, DataInterventie DESC, Ora DESC, NrCrt DESC);
+END
+GO
+
+-- Statisticile pe coloanele text ajută optimizatorul să estimeze selectivitatea
+-- căutării LIKE; un index nu poate fi folosit pentru '%text%'.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.stats
+    WHERE name = 'ST_RegistruInterventii_Solicitant'
+      AND object_id = OBJECT_ID('RegistruInterventii')
+)
+BEGIN
+    CREATE STATISTICS ST_RegistruInterventii_Solicitant ON RegistruInterventii (Solicitant);
+END
+GO
@@ -0,0 +1,20 @@
+-- Cheie persistată și indexată pentru căutarea username-ului fără puncte
+-- (înlocuiește filtrul REPLACE(NumeUtilizator, '.', '') = ?, care scana tot tabelul).
+IF COL_LENGTH('Utilizatori', 'NumeUtilizatorCheie') IS NULL
+BEGIN
+    ALTER TABLE Utilizatori
+    ADD NumeUtilizatorCheie AS LOWER(REPLACE(NumeUtilizator, '.', '')) PERSISTED;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Utilizatori_NumeUtilizatorCheie'
+      AND object_id = OBJECT_ID('Utilizatori')
+)
+BEGIN
+    CREATE INDEX IX_Utilizatori_NumeUtilizatorCheie
+    ON Utilizatori (NumeUtilizatorCheie)
+    INCLUDE (NumeUtilizator);
+END
+GO
@@ -0,0 +1,11 @@
+-- Index pe NrCrt: aprobările (WHERE NrCrt IN (...)) și alocarea numărului
+-- următor (MAX(NrCrt)) nu mai parcurg tot registrul.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_RegistruInterventii_NrCrt'
+      AND object_id = OBJECT_ID('RegistruInterventii')
+)
+BEGIN
+    CREATE INDEX IX_RegistruInterventii_NrCrt ON RegistruInterventii (NrCrt);
+END
+GO
@@ -0,0 +1,41 @@
+-- Versiunea rândurilor registrului, folosită la actualizarea incrementală a indexului de căutare (cautare.py).
+-- VersiuneRand (rowversion) crește automat la fiecare INSERT/UPDATE al rândului;
+-- rândurile șterse sunt păstrate ca ID-uri în RegistruInterventiiSterse, cu propria versiune.
+IF COL_LENGTH('RegistruInterventii', 'VersiuneRand') IS NULL
+BEGIN
+    ALTER TABLE RegistruInterventii ADD VersiuneRand ROWVERSION;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_RegistruInterventii_VersiuneRand'
+      AND object_id = OBJECT_ID('RegistruInterventii')
+)
+BEGIN
+    CREATE INDEX IX_RegistruInterventii_VersiuneRand ON RegistruInterventii (VersiuneRand);
+END
+GO
+
+IF OBJECT_ID('RegistruInterventiiSterse') IS NULL
+BEGIN
+    CREATE TABLE RegistruInterventiiSterse (
+        ID INT NOT NULL PRIMARY KEY,
+        VersiuneRand ROWVERSION NOT NULL,
+        DataStergere DATETIME NOT NULL DEFAULT GETDATE()
+    );
+    CREATE INDEX IX_RegistruInterventiiSterse_VersiuneRand ON RegistruInterventiiSterse (VersiuneRand);
+END
+GO
+
+CREATE OR ALTER TRIGGER TR_RegistruInterventii_Sterse
+ON RegistruInterventii
+AFTER DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO RegistruInterventiiSterse (ID)
+    SELECT d.ID FROM deleted d
+    WHERE NOT EXISTS (SELECT 1 FROM RegistruInterventiiSterse s WHERE s.ID = d.ID);
+END
+GO
@@ -0,0 +1,25 @@
+-- Index inversat pentru căutarea în Solicitant, Solicitare și Observatii (cautare.py).
+-- Termenii sunt normalizați (fără diacritice, litere mici); Pondere însumează
+-- aparițiile termenului în rând, ponderate după coloană.
+IF OBJECT_ID('IndexCautare') IS NULL
+BEGIN
+    CREATE TABLE IndexCautare (
+        Termen NVARCHAR(64) NOT NULL,
+        ID INT NOT NULL,
+        Pondere SMALLINT NOT NULL,
+        CONSTRAINT PK_IndexCautare PRIMARY KEY (Termen, ID)
+    );
+    CREATE INDEX IX_IndexCautare_ID ON IndexCautare (ID);
+END
+GO
+
+-- Versiunea registrului (VersiuneRand) până la care indexul este actualizat
+IF OBJECT_ID('IndexCautareStare') IS NULL
+BEGIN
+    CREATE TABLE IndexCautareStare (
+        ID INT NOT NULL PRIMARY KEY CHECK (ID = 1),
+        Versiune BIGINT NULL
+    );
+    INSERT INTO IndexCautareStare (ID, Versiune) VALUES (1, NULL);
+END
+GO
@@ -0,0 +1,110 @@
+-- Alocarea NrCrt la inserare, dintr-un contor (în locul MAX(NrCrt) + 1).
+-- Ultimul: ultimul NrCrt alocat; UltimaData: cea mai recentă DataInterventie înregistrată;
+-- RenumerotareDeLa: data de la care numerotarea trebuie refăcută după o inserare cu dată
+-- în trecut, o ștergere sau o schimbare de dată (NULL dacă numerotarea este la zi).
+IF OBJECT_ID('AlocareNrCrt') IS NULL
+BEGIN
+    CREATE TABLE AlocareNrCrt (
+        ID INT NOT NULL PRIMARY KEY CHECK (ID = 1),
+        Ultimul INT NOT NULL,
+        UltimaData DATE NULL,
+        RenumerotareDeLa DATE NULL
+    );
+    INSERT INTO AlocareNrCrt (ID, Ultimul, UltimaData, RenumerotareDeLa)
+    SELECT 1, COALESCE(MAX(NrCrt), 0), MAX(DataInterventie), NULL
+    FROM RegistruInterventii WITH (TABLOCKX, HOLDLOCK);
+END
+GO
+
+-- UPDATE-ul pe singurul rând al contorului ține un lock exclusiv până la sfârșitul
+-- tranzacției inserării: alocările concurente sunt serializate, iar o tranzacție anulată
+-- anulează și incrementarea, așa că numerotarea rămâne fără goluri.
+CREATE OR ALTER TRIGGER TR_RegistruInterventii_NrCrt
+ON RegistruInterventii
+AFTER INSERT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @noi INT, @min_data DATE, @max_data DATE, @max_nrcrt INT, @ultimul INT;
+    SELECT @noi = SUM(CASE WHEN NrCrt IS NULL THEN 1 ELSE 0 END),
+           @min_data = MIN(DataInterventie),
+           @max_data = MAX(DataInterventie),
+           @max_nrcrt = MAX(NrCrt)
+    FROM inserted;
+
+    IF @noi IS NULL
+        RETURN;
+
+    UPDATE AlocareNrCrt
+    SET @ultimul = Ultimul,
+        Ultimul = CASE
+            WHEN ISNULL(@max_nrcrt, 0) > Ultimul + @noi THEN @max_nrcrt
+            ELSE Ultimul + @noi
+        END,
+        RenumerotareDeLa = CASE
+            WHEN @min_data < UltimaData AND (RenumerotareDeLa IS NULL OR @min_data < RenumerotareDeLa)
+            THEN @min_data
+            ELSE RenumerotareDeLa
+        END,
+        UltimaData = CASE
+            WHEN UltimaData IS NULL OR @max_data > UltimaData THEN @max_data
+            ELSE UltimaData
+        END
+    WHERE ID = 1;
+
+    IF @noi > 0
+    BEGIN
+        WITH Noi AS (
+            SELECT r.NrCrt,
+                   ROW_NUMBER() OVER (ORDER BY r.DataInterventie, r.ID) AS Pozitie
+            FROM RegistruInterventii r
+            JOIN inserted i ON i.ID = r.ID
+            WHERE r.NrCrt IS NULL
+        )
+        UPDATE Noi SET NrCrt = @ultimul + Pozitie;
+    END
+END
+GO
+
+CREATE OR ALTER TRIGGER TR_RegistruInterventii_NrCrtModificate
+ON RegistruInterventii
+AFTER UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Renumerotarea (care schimbă doar NrCrt) nu marchează nimic
+    IF EXISTS (SELECT 1 FROM inserted) AND NOT UPDATE(DataInterventie)
+        RETURN;
+
+    DECLARE @de_la DATE, @max_data DATE;
+    SELECT @de_la = MIN(Data)
+    FROM (
+        SELECT d.DataInterventie AS Data
+        FROM deleted d
+        LEFT JOIN inserted i ON i.ID = d.ID
+        WHERE i.ID IS NULL OR i.DataInterventie <> d.DataInterventie
+        UNION ALL
+        SELECT i.DataInterventie
+        FROM inserted i
+        JOIN deleted d ON d.ID = i.ID
+        WHERE i.DataInterventie <> d.DataInterventie
+    ) Modificate;
+    SELECT @max_data = MAX(DataInterventie) FROM inserted;
+
+    IF @de_la IS NULL
+        RETURN;
+
+    UPDATE AlocareNrCrt
+    SET RenumerotareDeLa = CASE
+            WHEN RenumerotareDeLa IS NULL OR @de_la < RenumerotareDeLa THEN @de_la
+            ELSE RenumerotareDeLa
+        END,
+        UltimaData = CASE
+            WHEN @max_data > UltimaData THEN @max_data
+            ELSE UltimaData
+        END
+    WHERE ID = 1;
+END
+GO
@@ -0,0 +1,12 @@
+-- Sesiunile revocate înainte de expirare (deconectare); un rând este util doar până la
+-- expirarea token-ului, după care este șters.
+IF OBJECT_ID('SesiuniRevocate') IS NULL
+BEGIN
+    CREATE TABLE SesiuniRevocate (
+        SessionID NVARCHAR(64) NOT NULL PRIMARY KEY,
+        Expira DATETIME NOT NULL,
+        DataRevocare DATETIME NOT NULL DEFAULT GETDATE()
+    );
+    CREATE INDEX IX_SesiuniRevocate_Expira ON SesiuniRevocate (Expira);
+END
+GO
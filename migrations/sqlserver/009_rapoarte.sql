@@ -0,0 +1,117 @@
+-- Agregatele rapoartelor (rapoarte.py), ținute la zi de trigger la fiecare inserare,
+-- aprobare, modificare sau ștergere, în aceeași tranzacție cu scrierea în registru.
+-- RaportLunar: intervențiile și durata lor pe lună (AAAA-LL), personal IT și status;
+-- PersonalITC lipsă este păstrat ca ''.
+-- RaportOrar: intervențiile și durata lor pe zi a săptămânii (1 = luni ... 7 = duminică)
+-- și oră (0-23); intervențiile fără oră nu sunt incluse.
+IF OBJECT_ID('RaportLunar') IS NULL
+BEGIN
+    CREATE TABLE RaportLunar (
+        Luna CHAR(7) NOT NULL,
+        PersonalITC NVARCHAR(200) NOT NULL,
+        Status NVARCHAR(50) NOT NULL,
+        NrInterventii INT NOT NULL,
+        DurataTotala INT NOT NULL,
+        CONSTRAINT PK_RaportLunar PRIMARY KEY (Luna, PersonalITC, Status)
+    );
+    INSERT INTO RaportLunar (Luna, PersonalITC, Status, NrInterventii, DurataTotala)
+    SELECT CONVERT(CHAR(7), DataInterventie, 126), ISNULL(PersonalITC, N''), Status,
+           COUNT(*), SUM(ISNULL(DurataInterventie, 0))
+    FROM RegistruInterventii WITH (TABLOCK, HOLDLOCK)
+    GROUP BY CONVERT(CHAR(7), DataInterventie, 126), ISNULL(PersonalITC, N''), Status;
+END
+GO
+
+-- DATEDIFF față de 1900-01-01 (o zi de luni) nu depinde de SET DATEFIRST
+IF OBJECT_ID('RaportOrar') IS NULL
+BEGIN
+    CREATE TABLE RaportOrar (
+        ZiSaptamana TINYINT NOT NULL,
+        Ora TINYINT NOT NULL,
+        NrInterventii INT NOT NULL,
+        DurataTotala INT NOT NULL,
+        CONSTRAINT PK_RaportOrar PRIMARY KEY (ZiSaptamana, Ora)
+    );
+    INSERT INTO RaportOrar (ZiSaptamana, Ora, NrInterventii, DurataTotala)
+    SELECT DATEDIFF(day, '19000101', DataInterventie) % 7 + 1, DATEPART(hour, Ora),
+           COUNT(*), SUM(ISNULL(DurataInterventie, 0))
+    FROM RegistruInterventii WITH (TABLOCK, HOLDLOCK)
+    WHERE Ora IS NOT NULL
+    GROUP BY DATEDIFF(day, '19000101', DataInterventie) % 7 + 1, DATEPART(hour, Ora);
+END
+GO
+
+CREATE OR ALTER TRIGGER TR_RegistruInterventii_Rapoarte
+ON RegistruInterventii
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Renumerotarea NrCrt și celelalte actualizări care nu ating coloanele agregate
+    IF EXISTS (SELECT 1 FROM inserted)
+       AND NOT (UPDATE(DataInterventie) OR UPDATE(PersonalITC) OR UPDATE(Status)
+                OR UPDATE(DurataInterventie) OR UPDATE(Ora))
+        RETURN;
+
+    -- Rândurile noi se adună, cele vechi se scad; aprobarea unui lot devine câte o
+    -- diferență per (lună, personal, status)
+    WITH Diferente AS (
+        SELECT CONVERT(CHAR(7), DataInterventie, 126) AS Luna, ISNULL(PersonalITC, N'') AS PersonalITC,
+               Status, 1 AS Numar, ISNULL(DurataInterventie, 0) AS Durata
+        FROM inserted
+        UNION ALL
+        SELECT CONVERT(CHAR(7), DataInterventie, 126), ISNULL(PersonalITC, N''),
+               Status, -1, -ISNULL(DurataInterventie, 0)
+        FROM deleted
+    ), Agregat AS (
+        SELECT Luna, PersonalITC, Status, SUM(Numar) AS Numar, SUM(Durata) AS Durata
+        FROM Diferente
+        GROUP BY Luna, PersonalITC, Status
+        HAVING SUM(Numar) <> 0 OR SUM(Durata) <> 0
+    )
+    MERGE RaportLunar WITH (HOLDLOCK) AS t
+    USING Agregat AS s
+        ON t.Luna = s.Luna AND t.PersonalITC = s.PersonalITC AND t.Status = s.Status
+    WHEN MATCHED AND t.NrInterventii + s.Numar <= 0 THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET NrInterventii = t.NrInterventii + s.Numar,
+                   DurataTotala = t.DurataTotala + s.Durata
+    WHEN NOT MATCHED AND s.Numar > 0 THEN
+        INSERT (Luna, PersonalITC, Status, NrInterventii, DurataTotala)
+        VALUES (s.Luna, s.PersonalITC, s.Status, s.Numar, s.Durata);
+
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted)
+       AND NOT (UPDATE(DataInterventie) OR UPDATE(DurataInterventie) OR UPDATE(Ora))
+        RETURN;
+
+    WITH Diferente AS (
+        SELECT DATEDIFF(day, '19000101', DataInterventie) % 7 + 1 AS ZiSaptamana,
+               DATEPART(hour, Ora) AS Ora, 1 AS Numar, ISNULL(DurataInterventie, 0) AS Durata
+        FROM inserted
+        WHERE Ora IS NOT NULL
+        UNION ALL
+        SELECT DATEDIFF(day, '19000101', DataInterventie) % 7 + 1,
+               DATEPART(hour, Ora), -1, -ISNULL(DurataInterventie, 0)
+        FROM deleted
+        WHERE Ora IS NOT NULL
+    ), Agregat AS (
+        SELECT ZiSaptamana, Ora, SUM(Numar) AS Numar, SUM(Durata) AS Durata
+        FROM Diferente
+        GROUP BY ZiSaptamana, Ora
+        HAVING SUM(Numar) <> 0 OR SUM(Durata) <> 0
+    )
+    MERGE RaportOrar WITH (HOLDLOCK) AS t
+    USING Agregat AS s
+        ON t.ZiSaptamana = s.ZiSaptamana AND t.Ora = s.Ora
+    WHEN MATCHED AND t.NrInterventii + s.Numar <= 0 THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET NrInterventii = t.NrInterventii + s.Numar,
+                   DurataTotala = t.DurataTotala + s.Durata
+    WHEN NOT MATCHED AND s.Numar > 0 THEN
+        INSERT (ZiSaptamana, Ora, NrInterventii, DurataTotala)
+        VALUES (s.ZiSaptamana, s.Ora, s.Numar, s.Durata);
+END
+GO
@@ -0,0 +1,16 @@
+-- Coada de aprobare (get_interventii_in_asteptare): intervențiile în așteptare, cele mai
+-- vechi primele. Indexul filtrat conține doar rândurile în așteptare, deci o pagină este
+-- citită direct din index, oricât de mare ar fi registrul. Interogarea folosește aceleași
+-- valori ca literali (database._CONDITIE_IN_ASTEPTARE): cu parametri, optimizatorul nu
+-- poate alege un index filtrat.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_RegistruInterventii_InAsteptare'
+      AND object_id = OBJECT_ID('RegistruInterventii')
+)
+BEGIN
+    CREATE INDEX IX_RegistruInterventii_InAsteptare
+    ON RegistruInterventii (DataInterventie, ID)
+    WHERE Status IN ('In Asteptare', 'In asteptare', 'in asteptare');
+END
+GO
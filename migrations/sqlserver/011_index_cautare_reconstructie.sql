@@ -0,0 +1,16 @@
+-- Tabel de lucru pentru reconstruirea indexului de căutare (cautare.py): indexul nou este
+-- construit aici, apoi IndexCautare și IndexCautareNou își schimbă numele (sp_rename, doar
+-- metadate) într-o tranzacție scurtă, deci căutările nu văd niciodată un index gol sau
+-- incomplet. Structura este identică cu IndexCautare; după o înlocuire, cheile și
+-- indexurile celor două tabele își schimbă și ele locul.
+IF OBJECT_ID('IndexCautareNou') IS NULL
+BEGIN
+    CREATE TABLE IndexCautareNou (
+        Termen NVARCHAR(64) NOT NULL,
+        ID INT NOT NULL,
+        Pondere SMALLINT NOT NULL,
+        CONSTRAINT PK_IndexCautareNou PRIMARY KEY (Termen, ID)
+    );
+    CREATE INDEX IX_IndexCautare_ID ON IndexCautareNou (ID);
+END
+GO
@@ -0,0 +1,50 @@
+-- Corectează TR_RegistruInterventii_NrCrt (007) pentru loturile care amestecă NrCrt explicit
+-- cu rânduri fără NrCrt: rândurile fără NrCrt erau numerotate de la vechiul Ultimul și
+-- puteau primi valorile explicite din același lot. Acum sunt numerotate după cel mai mare
+-- dintre Ultimul și NrCrt-ul explicit maxim (CASE în loc de GREATEST, pentru versiunile
+-- anterioare SQL Server 2022), iar Ultimul devine cel mai mare număr alocat efectiv.
+CREATE OR ALTER TRIGGER TR_RegistruInterventii_NrCrt
+ON RegistruInterventii
+AFTER INSERT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @noi INT, @min_data DATE, @max_data DATE, @max_nrcrt INT, @ultimul INT;
+    SELECT @noi = SUM(CASE WHEN NrCrt IS NULL THEN 1 ELSE 0 END),
+           @min_data = MIN(DataInterventie),
+           @max_data = MAX(DataInterventie),
+           @max_nrcrt = MAX(NrCrt)
+    FROM inserted;
+
+    IF @noi IS NULL
+        RETURN;
+
+    -- @ultimul: numărul după care sunt alocate rândurile fără NrCrt din lot
+    UPDATE AlocareNrCrt
+    SET @ultimul = CASE WHEN ISNULL(@max_nrcrt, 0) > Ultimul THEN @max_nrcrt ELSE Ultimul END,
+        Ultimul = CASE WHEN ISNULL(@max_nrcrt, 0) > Ultimul THEN @max_nrcrt ELSE Ultimul END + @noi,
+        RenumerotareDeLa = CASE
+            WHEN @min_data < UltimaData AND (RenumerotareDeLa IS NULL OR @min_data < RenumerotareDeLa)
+            THEN @min_data
+            ELSE RenumerotareDeLa
+        END,
+        UltimaData = CASE
+            WHEN UltimaData IS NULL OR @max_data > UltimaData THEN @max_data
+            ELSE UltimaData
+        END
+    WHERE ID = 1;
+
+    IF @noi > 0
+    BEGIN
+        WITH Noi AS (
+            SELECT r.NrCrt,
+                   ROW_NUMBER() OVER (ORDER BY r.DataInterventie, r.ID) AS Pozitie
+            FROM RegistruInterventii r
+            JOIN inserted i ON i.ID = r.ID
+            WHERE r.NrCrt IS NULL
+        )
+        UPDATE Noi SET NrCrt = @ultimul + Pozitie;
+    END
+END
+GO
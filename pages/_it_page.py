@@ -1,8 +1,13 @@
 import streamlit as st
-import pandas as pd
+import math
+import os
+import tempfile
 from datetime import datetime, timedelta
+from functools import partial
 from database import (
-    get_interventii, 
+    get_interventii_pagina,
+    get_interventii_in_asteptare,
+    get_statistici,
     adauga_interventie, 
     is_sef_birou,
     is_it_personal, 
@@ -10,9 +15,610 @@ from database import (
     get_personal_it,
     normalize_username
 )
+from db_executor import run_concurrent
+from cautare import porneste_indexare
+from export import exporta, TIPURI_MIME
+from metrics import cronometru, DURATA_RERUN
 
-# Lista personal IT
-PERSONAL_IT = get_personal_it()
+# Coloanele afișate în tabel și denumirile lor
+COLOANE_TABEL = {
+    'NrCrt': 'Nr.',
+    'DataInterventie': 'Data',
+    'Zi': 'Zi',
+    'Solicitant': 'Solicitant',
+    'Solicitare': 'Solicitare',
+    'Ora': 'Ora',
+    'DurataInterventie': 'Durata (min)',
+    'PersonalITC': 'Personal IT',
+    'Observatii': 'Observații',
+    'Status': 'Status'
+}
+
+# Opțiunile pentru numărul de rânduri pe pagină
+DIMENSIUNI_PAGINA = [25, 50, 100]
+# Opțiunile pentru numărul de intervenții pe pagină în coada de aprobare
+DIMENSIUNI_COADA = [10, 25, 50]
+# Dimensiunea maximă a unui export descărcat din pagină: Streamlit servește fișierul din
+# memorie, deci exporturile mai mari se fac din linia de comandă (export.py)
+EXPORT_MAX_BYTES = int(os.getenv('EXPORT_MAX_BYTES', str(50 * 1024 * 1024)))
+
+def style_status(val):
+    """Stilizarea coloanei Status în funcție de valoare."""
+    if val == 'Aprobat':
+        return 'color: green; font-weight: bold'
+    elif val == 'In Asteptare':
+        return 'color: orange; font-weight: bold'
+    elif val == 'Respins':
+        return 'color: red; font-weight: bold'
+    return ''
+
+def pregateste_tabel(interventii):
+    """
+    Transformă o pagină din registru (DataFrame-ul tipizat din `database.cadru_registru`)
+    în DataFrame-ul afișat în tabel.
+    """
+    # Reordonăm și redenumim coloanele pentru afișare
+    df = interventii.rename(columns=COLOANE_TABEL)
+    
+    # Ora este text 'HH:MM:SS' (categorial); afișăm doar HH:MM, fără a parcurge rândurile în Python
+    df['Ora'] = df['Ora'].str.slice(0, 5).fillna('')
+    
+    return df[list(COLOANE_TABEL.values())]
+
+def _reseteaza_paginarea():
+    """Revine la prima pagină a registrului."""
+    st.session_state['pagina_cursoare'] = [None]
+
+def afiseaza_filtre(personal_it):
+    """Afișează filtrele registrului și returnează valorile lor pentru interogare."""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        # Filtru pentru Personal IT
+        personal_it_options = ["Toți"] + personal_it
+        personal_filter = st.selectbox(
+            "Filtrare după Personal ITC",
+            options=personal_it_options,
+            index=0,
+            key="personal_filter",
+            on_change=_reseteaza_paginarea
+        )
+    
+    with col2:
+        # Filtru pentru perioadă (se poate alege și o singură zi)
+        data_filter = st.date_input(
+            "Data Intervenție",
+            value=(),
+            key="data_filter",
+            on_change=_reseteaza_paginarea
+        )
+    
+    with col3:
+        # Filtru pentru căutare text în solicitant și solicitare
+        search_text = st.text_input(
+            "Caută în solicitant/solicitare/observații",
+            "",
+            key="search_filter",
+            on_change=_reseteaza_paginarea
+        )
+    
+    data_start = data_filter[0] if len(data_filter) > 0 else None
+    data_end = data_filter[1] if len(data_filter) > 1 else data_start
+    
+    return {
+        'personal_itc': personal_filter if personal_filter != 'Toți' else None,
+        'data_start': data_start,
+        'data_end': data_end,
+        'text': search_text.strip() or None
+    }
+
+def _stare_paginare():
+    """Returnează cursoarele paginilor vizitate și dimensiunea paginii din sesiune."""
+    if 'pagina_cursoare' not in st.session_state:
+        _reseteaza_paginarea()
+    if 'dimensiune_pagina' not in st.session_state:
+        st.session_state['dimensiune_pagina'] = DIMENSIUNI_PAGINA[1]
+    
+    # Păstrăm cursorul fiecărei pagini vizitate, ca să putem reveni înapoi
+    return st.session_state['pagina_cursoare'], st.session_state['dimensiune_pagina']
+
+def afiseaza_pagina_registru(pagina, filtre=None):
+    """Afișează pagina curentă a registrului, citită cu get_interventii_pagina."""
+    cursoare, page_size = _stare_paginare()
+    
+    if pagina['rows'].empty:
+        if filtre and any(filtre.values()):
+            st.info("Nu există intervenții care să corespundă filtrelor.")
+        else:
+            st.info("Nu există intervenții înregistrate.")
+        return
+    
+    st.dataframe(
+        pregateste_tabel(pagina['rows']).style.map(style_status, subset=['Status']),
+        use_container_width=True,
+        hide_index=True,
+        column_config={'Data': st.column_config.DateColumn("Data", format="YYYY-MM-DD")}
+    )
+    
+    total = pagina['total'] or 0
+    total_pagini = max(1, math.ceil(total / page_size))
+    
+    # Butoanele schimbă pagina în callback, înainte ca fragmentul să fie rulat din nou
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
+    with col1:
+        st.button(
+            "⬅️ Anterioară",
+            disabled=len(cursoare) == 1,
+            key="pagina_anterioara",
+            on_click=cursoare.pop
+        )
+    with col2:
+        st.caption(f"Pagina {len(cursoare)} din {total_pagini} ({total} intervenții)")
+    with col3:
+        st.button(
+            "Următoare ➡️",
+            disabled=pagina['next_cursor'] is None,
+            key="pagina_urmatoare",
+            on_click=cursoare.append,
+            args=(pagina['next_cursor'],)
+        )
+    with col4:
+        st.selectbox(
+            "Rânduri pe pagină",
+            options=DIMENSIUNI_PAGINA,
+            key="dimensiune_pagina",
+            on_change=_reseteaza_paginarea,
+            label_visibility="collapsed"
+        )
+
+def _sterge_export():
+    """Șterge fișierul exportului pregătit anterior în sesiune."""
+    export = st.session_state.pop('export_fisier', None)
+    if export and os.path.exists(export['path']):
+        os.remove(export['path'])
+
+def afiseaza_export(filtre=None):
+    """Exportă intervențiile care corespund filtrelor, citite din baza de date pe loturi."""
+    with st.expander("📥 Export"):
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            format = st.selectbox(
+                "Format",
+                options=list(TIPURI_MIME),
+                format_func=str.upper,
+                key="export_format"
+            )
+        with col2:
+            st.caption("Exportul conține toate intervențiile care corespund filtrelor, nu doar pagina afișată.")
+        
+        # Fișierul pregătit rămâne pe disc între rerun-uri (inclusiv cel declanșat de
+        # descărcare), cât timp filtrele și formatul sunt aceleași
+        export = st.session_state.get('export_fisier')
+        if export and (export['filtre'] != filtre or export['format'] != format):
+            _sterge_export()
+            export = None
+        
+        if st.button("Pregătește exportul", key="export_pregateste"):
+            _sterge_export()
+            export = None
+            # Fișierul este scris pe disc pe măsură ce loturile sunt citite
+            fd, path = tempfile.mkstemp(suffix=f".{format}")
+            os.close(fd)
+            try:
+                with st.spinner("Se exportă registrul..."):
+                    randuri = exporta(format, path, filtre)
+                dimensiune = os.path.getsize(path)
+            except Exception as e:
+                os.remove(path)
+                st.error(f"Eroare la export: {str(e)}")
+                return
+            
+            if dimensiune > EXPORT_MAX_BYTES:
+                os.remove(path)
+                st.error(
+                    f"Exportul are {dimensiune / 2**20:.1f} MB, peste limita de "
+                    f"{EXPORT_MAX_BYTES / 2**20:.0f} MB. Restrânge filtrele sau folosește export.py."
+                )
+                return
+            
+            export = {'path': path, 'randuri': randuri, 'format': format, 'filtre': filtre}
+            st.session_state['export_fisier'] = export
+        
+        if export and os.path.exists(export['path']):
+            with open(export['path'], 'rb') as f:
+                st.download_button(
+                    f"Descarcă ({export['randuri']} intervenții)",
+                    data=f,
+                    file_name=f"Registru de Interventii {datetime.now():%Y-%m-%d}.{format}",
+                    mime=TIPURI_MIME[format],
+                    key="export_descarca"
+                )
+
+# Mesajele afișate după procesarea unui lot de aprobări
+MESAJE_APROBARE = {
+    'actualizat': "procesate",
+    'deja_procesat': "deja procesate de altcineva",
+    'negasit': "negăsite",
+    'eroare': "neprocesate din cauza unei erori"
+}
+
+def _reseteaza_coada():
+    """Revine la prima pagină a cozii de aprobare."""
+    st.session_state['coada_cursoare'] = [None]
+
+def _stare_coada():
+    """Returnează cursoarele paginilor vizitate din coada de aprobare și dimensiunea paginii."""
+    if 'coada_cursoare' not in st.session_state:
+        _reseteaza_coada()
+    if 'dimensiune_coada' not in st.session_state:
+        st.session_state['dimensiune_coada'] = DIMENSIUNI_COADA[1]
+    return st.session_state['coada_cursoare'], st.session_state['dimensiune_coada']
+
+def _proceseaza_selectate(selectate, action):
+    """Aprobă sau respinge lotul selectat și păstrează rezultatul pentru afișare."""
+    rezultate = aproba_interventie(selectate, st.session_state['username'], action)
+    
+    numar = {}
+    for rezultat in rezultate.values():
+        numar[rezultat] = numar.get(rezultat, 0) + 1
+    detalii = ", ".join(f"{n} {MESAJE_APROBARE[r]}" for r, n in numar.items())
+    st.session_state['mesaj_aprobare'] = f"{action}: {detalii}."
+    
+    # Pagina va conține alte intervenții: selecția de până acum nu mai este valabilă
+    st.session_state['coada_versiune'] = st.session_state.get('coada_versiune', 0) + 1
+    st.session_state['aprobare_toate'] = False
+
+def afiseaza_aprobare(coada):
+    """
+    Afișează pagina curentă a cozii de aprobare (citită cu get_interventii_in_asteptare)
+    ca tabel cu selecție multiplă, acțiuni pe lot și navigare între pagini. Numărul de
+    widget-uri nu depinde de numărul intervențiilor în așteptare.
+    """
+    cursoare, page_size = _stare_coada()
+    
+    # Rezultatul ultimei acțiuni, setat de _proceseaza_selectate
+    mesaj = st.session_state.pop('mesaj_aprobare', None)
+    if mesaj:
+        st.info(mesaj)
+    
+    if coada['rows'].empty:
+        st.info("Nu există intervenții în așteptare de aprobare.")
+        return
+    
+    st.markdown("Selectați intervențiile pe care doriți să le procesați (cele mai vechi primele):")
+    selecteaza_toate = st.checkbox("Selectează toate de pe pagină", key="aprobare_toate")
+    
+    tabel = pregateste_tabel(coada['rows'])[['Nr.', 'Data', 'Ora', 'Solicitant', 'Personal IT', 'Solicitare']]
+    tabel.insert(0, 'Selectat', selecteaza_toate)
+    
+    # Cheia se schimbă cu pagina și după fiecare lot procesat, ca selecția să nu treacă
+    # pe alte rânduri
+    versiune = st.session_state.get('coada_versiune', 0)
+    editat = st.data_editor(
+        tabel,
+        hide_index=True,
+        use_container_width=True,
+        disabled=[col for col in tabel.columns if col != 'Selectat'],
+        column_config={
+            'Selectat': st.column_config.CheckboxColumn("✔", default=False),
+            'Data': st.column_config.DateColumn("Data", format="YYYY-MM-DD")
+        },
+        key=f"aprobare_editor_{len(cursoare)}_{page_size}_{versiune}_{selecteaza_toate}"
+    )
+    selectate = [int(nr) for nr in editat.loc[editat['Selectat'], 'Nr.']]
+    
+    # Lotul este procesat în callback; fragmentul rulat apoi recitește coada și contoarele
+    col1, col2, _ = st.columns([1, 1, 2])
+    with col1:
+        st.button(
+            f"✅ Aprobă selectate ({len(selectate)})",
+            disabled=not selectate,
+            key="aproba_selectate",
+            on_click=_proceseaza_selectate,
+            args=(selectate, 'Aprobat')
+        )
+    with col2:
+        st.button(
+            f"❌ Respinge selectate ({len(selectate)})",
+            disabled=not selectate,
+            key="respinge_selectate",
+            on_click=_proceseaza_selectate,
+            args=(selectate, 'Respins')
+        )
+    
+    total = coada['total'] or 0
+    total_pagini = max(1, math.ceil(total / page_size))
+    
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
+    with col1:
+        st.button(
+            "⬅️ Anterioară",
+            disabled=len(cursoare) == 1,
+            key="coada_anterioara",
+            on_click=cursoare.pop
+        )
+    with col2:
+        st.caption(f"Pagina {len(cursoare)} din {total_pagini} ({total} în așteptare)")
+    with col3:
+        st.button(
+            "Următoare ➡️",
+            disabled=coada['next_cursor'] is None,
+            key="coada_urmatoare",
+            on_click=cursoare.append,
+            args=(coada['next_cursor'],)
+        )
+    with col4:
+        st.selectbox(
+            "Intervenții pe pagină",
+            options=DIMENSIUNI_COADA,
+            key="dimensiune_coada",
+            on_change=_reseteaza_coada,
+            label_visibility="collapsed"
+        )
+
+# Secțiunile paginii sunt fragmente: o interacțiune din interiorul unei secțiuni
+# (filtre, paginare, aprobare, validarea formularului) rulează din nou doar acea
+# secțiune, nu tot scriptul (autentificarea, verificările de rol, celelalte citiri).
+
+@st.fragment
+def fragment_adaugare(personal_it):
+    """Formularul de adăugare a unei intervenții."""
+    with cronometru(DURATA_RERUN, section='fragment_adaugare'):
+        _formular_adaugare(personal_it)
+
+def _formular_adaugare(personal_it):
+    with st.form("add_intervention_form"):
+        st.subheader("📝 Adaugă Intervenție Nouă")
+        st.markdown("---")
+        
+        # Prima linie: Data și Ora
+        col1, col2 = st.columns(2)
+        with col1:
+            data = st.date_input(
+                "📅 Data",
+                value=datetime.now().date(),
+                key="data_interventie"
+            )
+        with col2:
+            # Generăm opțiunile pentru oră pornind de la ora curentă
+            now = datetime.now()
+            current_time = now.replace(minute=(now.minute // 15) * 15, second=0, microsecond=0)
+            time_options = []
+            
+            # Adăugăm opțiuni pentru următoarele 24 de ore, la fiecare 15 minute
+            for i in range(96):  # 24 ore * 4 (15 minute intervale)
+                time = current_time + timedelta(minutes=15 * i)
+                time_str = time.strftime("%H:%M")
+                time_options.append(time_str)
+            
+            # Găsim indexul orei curente în lista de opțiuni
+            current_time_str = current_time.strftime("%H:%M")
+            default_time_index = time_options.index(current_time_str)
+            
+            ora = st.selectbox(
+                "🕐 Ora",
+                options=time_options,
+                index=default_time_index,
+                key="ora_interventie"
+            )
+        
+        # A doua linie: Solicitant și Personal IT
+        col1, col2 = st.columns(2)
+        with col1:
+            solicitant = st.text_input(
+                "👤 Solicitant",
+                placeholder="Numele solicitantului",
+                key="solicitant_interventie"
+            )
+        with col2:
+            # Obținem lista personalului IT din baza de date
+            personal_it_list = personal_it
+            if not personal_it_list:
+                st.error("Nu s-a putut obține lista personalului IT")
+                return
+            
+            # Obținem username-ul normalizat al utilizatorului curent
+            current_user = st.session_state.get('username', '')
+            normalized_user = normalize_username(current_user)
+            
+            # Găsim indexul utilizatorului curent în lista
+            try:
+                default_index = personal_it_list.index(normalized_user)
+            except ValueError:
+                default_index = 0
+                
+            personal = st.selectbox(
+                "👨‍💻 Personal ITC",
+                options=personal_it_list,
+                index=default_index,
+                key="personal_interventie"
+            )
+        
+        # A treia linie: Durata
+        st.markdown("""
+            <style>
+            /* Stilizare pentru butoanele de number input */
+            .stNumberInput button {
+                width: 4rem !important;
+                height: 2.5rem !important;
+                font-size: 1.5rem !important;
+            }
+            
+            /* Stilizare pentru câmpul de input */
+            .stNumberInput input {
+                height: 2.5rem !important;
+                width: 8rem !important;
+                text-align: center !important;
+                font-size: 1.2rem !important;
+            }
+            
+            /* Container pentru number input */
+            .stNumberInput > div {
+                display: flex !important;
+                align-items: center !important;
+                gap: 0.5rem !important;
+            }
+            </style>
+        """, unsafe_allow_html=True)
+        
+        durata = st.number_input(
+            "⏱️ Durata (minute)",
+            min_value=5,
+            max_value=480,  # 8 ore
+            value=30,
+            step=5,
+            key="durata_interventie"
+        )
+        
+        # Convertim data în zi
+        zile = {
+            0: "Luni",
+            1: "Marți",
+            2: "Miercuri",
+            3: "Joi",
+            4: "Vineri",
+            5: "Sâmbătă",
+            6: "Duminică"
+        }
+        zi = zile[data.weekday()]
+        
+        # A patra linie: Solicitare și Observații
+        solicitare = st.text_area(
+            "📋 Solicitare",
+            placeholder="Descrierea detaliată a solicitării...",
+            key="solicitare_interventie",
+            height=120
+        )
+        
+        observatii = st.text_area(
+            "📝 Observații",
+            placeholder="Observații adiționale (opțional)...",
+            key="observatii_interventie",
+            height=100
+        )
+        
+        st.markdown("---")
+        # Butonul de submit
+        submitted = st.form_submit_button(
+            "💾 Salvează Intervenția",
+            type="primary",
+            use_container_width=True
+        )
+        
+        if submitted:
+            try:
+                if not solicitant or not personal:
+                    st.error("❌ Te rog completează toate câmpurile obligatorii!")
+                    return
+                
+                # Adăugăm intervenția în baza de date
+                success = adauga_interventie(
+                    data_interventie=data,
+                    zi=zi,
+                    solicitant=solicitant,
+                    solicitare=solicitare,
+                    ora=ora,
+                    durata=durata,
+                    personal_itc=personal,
+                    observatii=observatii,
+                    serviciu_id=1  # Presupunem că avem un serviciu implicit
+                )
+                
+                if success:
+                    st.success("✅ Intervenția a fost adăugată cu succes!")
+                    st.session_state['show_add_form'] = False
+                    # Formularul se închide și registrul trebuie recitit: rulăm toată pagina
+                    st.rerun()
+                else:
+                    st.error("❌ A apărut o eroare la adăugarea intervenției!")
+            except Exception as e:
+                st.error(f"Eroare la adăugarea intervenției: {str(e)}")
+
+@st.fragment
+def fragment_registru(personal_it, este_sef):
+    """
+    Filtrele, tabelul paginat și exportul registrului, urmate de fragmentul cu
+    statisticile și coada de aprobare, care primește aceleași filtre.
+    """
+    with cronometru(DURATA_RERUN, section='fragment_registru'):
+        st.subheader("Lista Intervențiilor")
+        
+        # Adăugăm secțiunea de filtre
+        st.markdown("### 🔍 Filtre")
+        filtre = afiseaza_filtre(personal_it)
+        
+        # Filtrele sunt aplicate direct în interogare; citim doar pagina afișată
+        cursoare, page_size = _stare_paginare()
+        pagina = run_concurrent({
+            'pagina': partial(
+                get_interventii_pagina,
+                page_size=page_size,
+                cursor=cursoare[-1],
+                include_total=True,
+                filtre=filtre
+            )
+        })['pagina']
+        
+        if pagina is None:
+            st.warning("Registrul nu a putut fi încărcat la timp. Reîncarcă pagina.")
+        else:
+            afiseaza_pagina_registru(pagina, filtre)
+            afiseaza_export(filtre)
+        
+        # Fragment în fragment: o schimbare de filtre îl rulează din nou cu filtrele noi,
+        # o aprobare îl rulează singur, cu filtrele primite la ultima rulare a registrului
+        fragment_aprobare(este_sef, filtre)
+
+@st.fragment
+def fragment_aprobare(este_sef, filtre):
+    """
+    Statisticile registrului pentru filtrele tabelului și, pentru șeful de birou, coada
+    de aprobare. O aprobare rulează din nou doar acest fragment: coada și contoarele sunt
+    recitite, tabelul registrului rămâne cel afișat până la următoarea lui interacțiune.
+    """
+    with cronometru(DURATA_RERUN, section='fragment_aprobare'):
+        # Statisticile sunt calculate cu aceleași filtre ca tabelul (fără filtre, din
+        # agregatele registrului); din coada de aprobare citim doar pagina afișată
+        cereri = {'statistici': partial(get_statistici, filtre)}
+        if este_sef:
+            cursoare, page_size = _stare_coada()
+            cereri['coada'] = partial(
+                get_interventii_in_asteptare,
+                page_size=page_size,
+                cursor=cursoare[-1],
+                include_total=True
+            )
+        citiri = run_concurrent(cereri)
+        
+        statistici = citiri['statistici']
+        if statistici:
+            st.markdown("### 📊 Statistici")
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("📝 Total Intervenții", statistici['total'])
+            
+            with col2:
+                st.metric("✅ Intervenții Aprobate", statistici['aprobate'])
+            
+            with col3:
+                st.metric("⏳ Intervenții în Așteptare", statistici['in_asteptare'])
+        
+        # Dacă este șef de birou, afișăm secțiunea de aprobare
+        if este_sef:
+            st.markdown("---")
+            st.markdown("### 📋 Aprobare Intervenții")
+            
+            coada = citiri['coada']
+            if coada is not None and coada['rows'].empty and len(cursoare) > 1:
+                # Ultima pagină a fost procesată în întregime; revenim la începutul cozii
+                _reseteaza_coada()
+                coada = get_interventii_in_asteptare(page_size=page_size, include_total=True)
+            
+            if coada is None:
+                st.warning("Intervențiile în așteptare nu au putut fi încărcate la timp.")
+            else:
+                afiseaza_aprobare(coada)
 
 def show_interventii_page():
     # Verificăm dacă utilizatorul este autentificat
@@ -23,11 +629,27 @@ def show_interventii_page():
 
     # Verificăm dacă utilizatorul face parte din serviciul IT
     current_user = st.session_state.get('username', '')
-    if not is_it_personal(current_user):
+    # Verificările de rol și lista personalului IT sunt independente; le citim în paralel
+    context = run_concurrent(
+        {
+            'este_it': partial(is_it_personal, current_user),
+            'este_sef': partial(is_sef_birou, current_user),
+            'personal_it': get_personal_it
+        },
+        implicite={'personal_it': []}
+    )
+    if context['este_it'] is None:
+        st.error("Baza de date nu răspunde. Încearcă din nou în câteva momente.")
+        st.stop()
+        return
+    if not context['este_it']:
         st.error("Acces interzis! Doar personalul IT poate accesa această pagină.")
         st.stop()
         return
 
+    # Indexul de căutare este ținut la zi de un fir de fundal, pornit o singură dată per proces
+    porneste_indexare()
+
     st.title("Registrul Intervențiilor IT")
     
     # CSS pentru formularul de intervenție
@@ -122,341 +744,8 @@ def show_interventii_page():
             st.session_state['show_add_form'] = False
             st.rerun()
     
-    # Formular pentru adăugare intervenție
+    # Formularul și registrul nu sunt afișate simultan; comutarea rulează toată pagina
     if st.session_state['show_add_form']:
-        with st.form("add_intervention_form"):
-            st.subheader("📝 Adaugă Intervenție Nouă")
-            st.markdown("---")
-            
-            # Prima linie: Data și Ora
-            col1, col2 = st.columns(2)
-            with col1:
-                data = st.date_input(
-                    "📅 Data",
-                    value=datetime.now().date(),
-                    key="data_interventie"
-                )
-            with col2:
-                # Generăm opțiunile pentru oră pornind de la ora curentă
-                now = datetime.now()
-                current_time = now.replace(minute=(now.minute // 15) * 15, second=0, microsecond=0)
-                time_options = []
-                
-                # Adăugăm opțiuni pentru următoarele 24 de ore, la fiecare 15 minute
-                for i in range(96):  # 24 ore * 4 (15 minute intervale)
-                    time = current_time + timedelta(minutes=15 * i)
-                    time_str = time.strftime("%H:%M")
-                    time_options.append(time_str)
-                
-                # Găsim indexul orei curente în lista de opțiuni
-                current_time_str = current_time.strftime("%H:%M")
-                default_time_index = time_options.index(current_time_str)
-                
-                ora = st.selectbox(
-                    "🕐 Ora",
-                    options=time_options,
-                    index=default_time_index,
-                    key="ora_interventie"
-                )
-            
-            # A doua linie: Solicitant și Personal IT
-            col1, col2 = st.columns(2)
-            with col1:
-                solicitant = st.text_input(
-                    "👤 Solicitant",
-                    placeholder="Numele solicitantului",
-                    key="solicitant_interventie"
-                )
-            with col2:
-                # Obținem lista personalului IT din baza de date
-                personal_it_list = get_personal_it()
-                if not personal_it_list:
-                    st.error("Nu s-a putut obține lista personalului IT")
-                    return
-                
-                # Obținem username-ul normalizat al utilizatorului curent
-                current_user = st.session_state.get('username', '')
-                normalized_user = normalize_username(current_user)
-                
-                # Găsim indexul utilizatorului curent în lista
-                try:
-                    default_index = personal_it_list.index(normalized_user)
-                except ValueError:
-                    default_index = 0
-                    
-                personal = st.selectbox(
-                    "👨‍💻 Personal ITC",
-                    options=personal_it_list,
-                    index=default_index,
-                    key="personal_interventie"
-                )
-            
-            # A treia linie: Durata
-            st.markdown("""
-                <style>
-                /* Stilizare pentru butoanele de number input */
-                .stNumberInput button {
-                    width: 4rem !important;
-                    height: 2.5rem !important;
-                    font-size: 1.5rem !important;
-                }
-                
-                /* Stilizare pentru câmpul de input */
-                .stNumberInput input {
-                    height: 2.5rem !important;
-                    width: 8rem !important;
-                    text-align: center !important;
-                    font-size: 1.2rem !important;
-                }
-                
-                /* Container pentru number input */
-                .stNumberInput > div {
-                    display: flex !important;
-                    align-items: center !important;
-                    gap: 0.5rem !important;
-                }
-                </style>
-            """, unsafe_allow_html=True)
-            
-            durata = st.number_input(
-                "⏱️ Durata (minute)",
-                min_value=5,
-                max_value=480,  # 8 ore
-                value=30,
-                step=5,
-                key="durata_interventie"
-            )
-            
-            # Convertim data în zi
-            zile = {
-                0: "Luni",
-                1: "Marți",
-                2: "Miercuri",
-                3: "Joi",
-                4: "Vineri",
-                5: "Sâmbătă",
-                6: "Duminică"
-            }
-            zi = zile[data.weekday()]
-            
-            # A patra linie: Solicitare și Observații
-            solicitare = st.text_area(
-                "📋 Solicitare",
-                placeholder="Descrierea detaliată a solicitării...",
-                key="solicitare_interventie",
-                height=120
-            )
-            
-            observatii = st.text_area(
-                "📝 Observații",
-                placeholder="Observații adiționale (opțional)...",
-                key="observatii_interventie",
-                height=100
-            )
-            
-            st.markdown("---")
-            # Butonul de submit
-            submitted = st.form_submit_button(
-                "💾 Salvează Intervenția",
-                type="primary",
-                use_container_width=True
-            )
-            
-            if submitted:
-                try:
-                    if not solicitant or not personal:
-                        st.error("❌ Te rog completează toate câmpurile obligatorii!")
-                        return
-                    
-                    # Adăugăm intervenția în baza de date
-                    success = adauga_interventie(
-                        data_interventie=data,
-                        zi=zi,
-                        solicitant=solicitant,
-                        solicitare=solicitare,
-                        ora=ora,
-                        durata=durata,
-                        personal_itc=personal,
-                        observatii=observatii,
-                        serviciu_id=1  # Presupunem că avem un serviciu implicit
-                    )
-                    
-                    if success:
-                        st.success("✅ Intervenția a fost adăugată cu succes!")
-                        st.session_state['show_add_form'] = False
-                        st.rerun()
-                    else:
-                        st.error("❌ A apărut o eroare la adăugarea intervenției!")
-                except Exception as e:
-                    st.error(f"Eroare la adăugarea intervenției: {str(e)}")
-    
-    # Afișare tabel cu intervenții doar dacă nu suntem în modul de adăugare
-    if not st.session_state['show_add_form']:
-        # Afișare tabel intervenții
-        st.subheader("Lista Intervențiilor")
-        
-        # Obținem intervențiile
-        interventii = get_interventii()
-        
-        if interventii:
-            # Convertim la DataFrame pentru afișare mai frumoasă
-            df = pd.DataFrame(interventii)
-            
-            # Reordonăm și redenumim coloanele pentru afișare
-            columns_order = {
-                'NrCrt': 'Nr.',
-                'DataInterventie': 'Data',
-                'Zi': 'Zi',
-                'Solicitant': 'Solicitant',
-                'Solicitare': 'Solicitare',
-                'Ora': 'Ora',
-                'DurataInterventie': 'Durata (min)',
-                'PersonalITC': 'Personal IT',
-                'Observatii': 'Observații',
-                'Status': 'Status'
-            }
-            
-            df = df.rename(columns=columns_order)
-            
-            # Formatăm ora pentru a afișa doar HH:MM
-            df['Ora'] = df['Ora'].apply(lambda x: x.strftime('%H:%M') if pd.notnull(x) else '')
-            
-            df = df[list(columns_order.values())]
-            
-            # Adăugăm stilizare pentru status
-            def style_status(val):
-                if val == 'Aprobat':
-                    return 'color: green; font-weight: bold'
-                elif val == 'In Asteptare':
-                    return 'color: orange; font-weight: bold'
-                elif val == 'Respins':
-                    return 'color: red; font-weight: bold'
-                return ''
-            
-            # Adăugăm tooltip pentru data aprobării și cine a aprobat/respins
-            if 'DataAprobare' in df.columns and 'AprobatDe' in df.columns:
-                def format_approval_info(row):
-                    if row['Status'] in ['Aprobat', 'Respins'] and pd.notnull(row['DataAprobare']):
-                        data_aprobare = pd.to_datetime(row['DataAprobare']).strftime('%d/%m/%Y %H:%M')
-                        action = "aprobat" if row['Status'] == 'Aprobat' else "respins"
-                        return f"{action} de {row['AprobatDe']} la {data_aprobare}"
-                    return row['Status']
-                
-                df['Status_Info'] = df.apply(format_approval_info, axis=1)
-                styled_df = df.style.set_properties(**{'title': df['Status_Info']}, subset=['Status'])
-            else:
-                styled_df = df.style
-            
-            # Adăugăm secțiunea de filtre
-            st.markdown("### 🔍 Filtre")
-            
-            # Verificăm și afișăm numele coloanelor pentru debug
-            print("Coloane disponibile:", df.columns.tolist())
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                # Filtru pentru Personal IT
-                personal_it_options = ["Toți"] + get_personal_it()
-                personal_filter = st.selectbox(
-                    "Filtrare după Personal ITC",
-                    options=personal_it_options,
-                    index=0,
-                    key="personal_filter"
-                )
-            
-            with col2:
-                # Filtru pentru data
-                data_filter = st.date_input(
-                    "Data Intervenție",
-                    value=None,
-                    min_value=pd.to_datetime(df['Data'].min()).date(),
-                    max_value=pd.to_datetime(df['Data'].max()).date()
-                )
-            
-            with col3:
-                # Filtru pentru căutare text în solicitant și solicitare
-                search_text = st.text_input("Caută în solicitant/solicitare", "")
-            
-            # Aplicăm filtrele
-            # 1. Filtru personal IT
-            if personal_filter != 'Toți':
-                df = df[df['Personal IT'] == personal_filter]
-            
-            # 2. Filtru dată
-            if data_filter is not None:
-                df = df[pd.to_datetime(df['Data']).dt.date == data_filter]
-            
-            # 3. Filtru text
-            if search_text:
-                search_mask = (
-                    df['Solicitant'].str.contains(search_text, case=False, na=False) |
-                    df['Solicitare'].str.contains(search_text, case=False, na=False)
-                )
-                df = df[search_mask]
-            
-            # Sortăm dataframe-ul descrescător după Nr.
-            df = df.sort_values(by='Nr.', ascending=False)
-            
-            # Adăugăm stilizarea și adăugăm tooltip pentru status
-            styled_df = df.style.map(style_status, subset=['Status'])
-            
-            # Afișăm tabelul
-            st.dataframe(
-                styled_df,
-                use_container_width=True,
-                hide_index=True  # Dezactivăm indexul automat
-            )
-            
-            # Adăugăm statistici
-            st.markdown("### 📊 Statistici")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                total_interventii = len(df)
-                st.metric("📝 Total Intervenții", total_interventii)
-            
-            with col2:
-                total_aprobate = len(df[df['Status'] == 'Aprobat'])
-                st.metric("✅ Intervenții Aprobate", total_aprobate)
-            
-            with col3:
-                total_asteptare = len(df[df['Status'] == 'In Asteptare'])
-                st.metric("⏳ Intervenții în Așteptare", total_asteptare)
-            
-            # Dacă este șef de birou, afișăm secțiunea de aprobare
-            if is_sef_birou(st.session_state.get('username', '')):
-                print(f"DEBUG: Utilizator {st.session_state.get('username')} este șef de birou")
-                st.markdown("---")
-                st.markdown("### 📋 Aprobare Intervenții")
-                st.markdown("Selectați intervențiile pe care doriți să le procesați:")
-                
-                interventii_asteptare = df[df['Status'].isin(['In Asteptare', 'In asteptare', 'in asteptare'])]
-                
-                if not interventii_asteptare.empty:
-                    for idx, row in interventii_asteptare.iterrows():
-                        with st.container():
-                            col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
-                            with col1:
-                                st.write(f"**Data:** {row['Data']} | **Ora:** {row['Ora']}")
-                                st.write(f"**Solicitant:** {row['Solicitant']}")
-                            with col2:
-                                st.write(f"**Personal IT:** {row['Personal IT']}")
-                                st.write(f"**Solicitare:** {row['Solicitare']}")
-                            # Afișăm butoanele de aprobare/respingere doar pentru șefii de birou
-                            if is_sef_birou(st.session_state.get('username', '')):
-                                with col3:
-                                    if st.button('✅ Aprobă', key=f'approve_{row["Nr."]}'):
-                                        if aproba_interventie(row['Nr.'], st.session_state['username'], 'Aprobat'):
-                                            st.success(f"Intervenția #{row['Nr.']} a fost aprobată!")
-                                            st.rerun()
-                                with col4:
-                                    if st.button('❌ Respinge', key=f'reject_{row["Nr."]}'):
-                                        if aproba_interventie(row['Nr.'], st.session_state['username'], 'Respins'):
-                                            st.error(f"Intervenția #{row['Nr.']} a fost respinsă!")
-                                            st.rerun()
-                            st.markdown("---")
-                else:
-                    st.info("Nu există intervenții în așteptare de aprobare.")
-        else:
-            st.info("Nu există intervenții înregistrate.")
+        fragment_adaugare(context['personal_it'])
+    else:
+        fragment_registru(context['personal_it'], context['este_sef'])
@@ -0,0 +1,152 @@
+import streamlit as st
+import pandas as pd
+from database import is_sef_birou, STATUSURI_IN_ASTEPTARE
+from import_csv import ZILE_SAPTAMANA
+from rapoarte import get_luni_raport, get_raport_lunar, get_raport_orar
+
+# Câte luni (cele mai recente) sunt selectate implicit
+LUNI_IMPLICITE = 12
+
+# Eticheta intervențiilor fără personal IT
+FARA_PERSONAL = "(nealocat)"
+
+def _categorie_status(status):
+    """Grupează variantele de status în categoriile raportului."""
+    if status == 'Aprobat':
+        return 'Aprobate'
+    if status == 'Respins':
+        return 'Respinse'
+    if status in STATUSURI_IN_ASTEPTARE:
+        return 'În așteptare'
+    return 'Altele'
+
+def pregateste_raport_lunar(randuri):
+    """DataFrame-ul raportului lunar, cu personalul lipsă etichetat și statusurile grupate."""
+    df = pd.DataFrame(randuri, columns=['Luna', 'PersonalITC', 'Status', 'NrInterventii', 'DurataTotala'])
+    df['PersonalITC'] = df['PersonalITC'].fillna(FARA_PERSONAL)
+    df['Categorie'] = df['Status'].map(_categorie_status)
+    return df
+
+def tabel_personal(df):
+    """Totalurile perioadei pe personal IT: intervenții, ore, statusuri și rata de aprobare."""
+    numar = df.pivot_table(
+        index='PersonalITC', columns='Categorie', values='NrInterventii', aggfunc='sum', fill_value=0
+    )
+    for categorie in ('Aprobate', 'Respinse', 'În așteptare'):
+        if categorie not in numar:
+            numar[categorie] = 0
+
+    tabel = pd.DataFrame({
+        'Intervenții': df.groupby('PersonalITC')['NrInterventii'].sum(),
+        'Ore': (df.groupby('PersonalITC')['DurataTotala'].sum() / 60).round(1),
+        'Aprobate': numar['Aprobate'],
+        'Respinse': numar['Respinse'],
+        'În așteptare': numar['În așteptare'],
+    })
+    # Rata de aprobare dintre intervențiile deja procesate
+    procesate = tabel['Aprobate'] + tabel['Respinse']
+    tabel['Rata aprobare (%)'] = (tabel['Aprobate'] * 100 / procesate.where(procesate > 0)).round(1)
+
+    tabel = tabel.sort_values('Intervenții', ascending=False)
+    tabel.index.name = 'Personal IT'
+    return tabel.reset_index()
+
+def harta_orara(randuri, valoare):
+    """Tabelul oră x zi a săptămânii pentru `valoare` ('NrInterventii' sau 'DurataTotala')."""
+    df = pd.DataFrame(randuri, columns=['ZiSaptamana', 'Ora', 'NrInterventii', 'DurataTotala'])
+    harta = df.pivot_table(index='Ora', columns='ZiSaptamana', values=valoare, aggfunc='sum', fill_value=0)
+    harta = harta.reindex(columns=range(1, 8), fill_value=0)
+    harta.columns = ZILE_SAPTAMANA
+    harta.index = [f"{ora:02d}:00" for ora in harta.index]
+    return harta
+
+def _culoare_harta(maxim):
+    def culoare(valoare):
+        if not maxim or not valoare:
+            return ''
+        return f'background-color: rgba(255, 75, 75, {0.15 + 0.85 * valoare / maxim:.2f})'
+    return culoare
+
+def show_rapoarte_page():
+    # Rapoartele sunt destinate conducerii
+    if not st.session_state.get('authentication_status'):
+        st.warning("Trebuie să te autentifici pentru a accesa această pagină.")
+        st.stop()
+        return
+    if not is_sef_birou(st.session_state.get('username', '')):
+        st.error("Acces interzis! Doar șeful de birou poate accesa rapoartele.")
+        st.stop()
+        return
+
+    st.title("Rapoarte Intervenții IT")
+
+    luni = get_luni_raport()
+    if not luni:
+        st.info("Nu există intervenții înregistrate.")
+        return
+
+    if len(luni) > 1:
+        luna_start, luna_end = st.select_slider(
+            "Perioada",
+            options=luni,
+            value=(luni[max(0, len(luni) - LUNI_IMPLICITE)], luni[-1]),
+            key="rapoarte_perioada"
+        )
+    else:
+        luna_start = luna_end = luni[0]
+
+    df = pregateste_raport_lunar(get_raport_lunar(luna_start, luna_end))
+
+    st.markdown("### 👨‍💻 Personal IT")
+    if df.empty:
+        st.info("Nu există intervenții în perioada selectată.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("📝 Intervenții", int(df['NrInterventii'].sum()))
+        with col2:
+            st.metric("⏱️ Ore lucrate", round(df['DurataTotala'].sum() / 60, 1))
+        with col3:
+            aprobate = int(df.loc[df['Categorie'] == 'Aprobate', 'NrInterventii'].sum())
+            respinse = int(df.loc[df['Categorie'] == 'Respinse', 'NrInterventii'].sum())
+            rata = f"{aprobate * 100 / (aprobate + respinse):.1f}%" if aprobate + respinse else "-"
+            st.metric("✅ Rata de aprobare", rata)
+
+        st.dataframe(tabel_personal(df), use_container_width=True, hide_index=True)
+
+        st.markdown("### 📅 Volum lunar")
+        valoare_lunara = st.radio(
+            "Indicator",
+            options=['Intervenții', 'Ore'],
+            horizontal=True,
+            key="rapoarte_indicator_lunar",
+            label_visibility="collapsed"
+        )
+        lunar = df.pivot_table(
+            index='Luna', columns='PersonalITC',
+            values='NrInterventii' if valoare_lunara == 'Intervenții' else 'DurataTotala',
+            aggfunc='sum', fill_value=0
+        )
+        if valoare_lunara == 'Ore':
+            lunar = (lunar / 60).round(1)
+        st.bar_chart(lunar)
+        st.dataframe(lunar, use_container_width=True)
+
+    st.markdown("### 🕐 Distribuție pe zile și ore")
+    st.caption("Pentru tot registrul; intervențiile fără oră nu sunt incluse.")
+    valoare_orara = st.radio(
+        "Indicator",
+        options=['Intervenții', 'Durata (min)'],
+        horizontal=True,
+        key="rapoarte_indicator_orar",
+        label_visibility="collapsed"
+    )
+    orar = get_raport_orar()
+    if not orar:
+        st.info("Nu există intervenții cu oră înregistrată.")
+        return
+    harta = harta_orara(orar, 'NrInterventii' if valoare_orara == 'Intervenții' else 'DurataTotala')
+    st.dataframe(
+        harta.style.map(_culoare_harta(harta.values.max())),
+        use_container_width=True
+    )
@@ -0,0 +1,160 @@
+import argparse
+import logging
+import time
+from backends import get_backend
+from database import db_connection
+
+# Agregatele sunt ținute la zi de triggerele din migrarea 009_rapoarte: fiecare inserare
+# (adauga_interventie, importul CSV), aprobare sau ștergere actualizează în aceeași
+# tranzacție rândurile afectate din RaportLunar și RaportOrar. Rapoartele citesc doar
+# aceste tabele, niciodată registrul.
+
+
+def reconstruieste_rapoarte():
+    """
+    Recalculează RaportLunar și RaportOrar din tot registrul (după aplicarea migrărilor
+    pe un registru existent sau dacă agregatele au fost modificate din afara triggerelor).
+    Returnează numărul de rânduri scrise în fiecare tabel sau None la eroare.
+    """
+    backend = get_backend()
+    luna = backend.sql_luna('DataInterventie')
+    zi = backend.sql_zi_saptamana('DataInterventie')
+    ora = backend.sql_ora('Ora')
+
+    with db_connection() as conn:
+        if not conn:
+            return None
+
+        cursor = conn.cursor()
+        try:
+            # Blocăm contorul NrCrt: inserările așteaptă până la sfârșitul reconstrucției
+            cursor.execute("UPDATE AlocareNrCrt SET Ultimul = Ultimul WHERE ID = 1")
+
+            cursor.execute("DELETE FROM RaportLunar")
+            cursor.execute(f"""
+                INSERT INTO RaportLunar (Luna, PersonalITC, Status, NrInterventii, DurataTotala)
+                SELECT {luna}, COALESCE(PersonalITC, ''), Status,
+                       COUNT(*), SUM(COALESCE(DurataInterventie, 0))
+                FROM RegistruInterventii
+                GROUP BY {luna}, COALESCE(PersonalITC, ''), Status
+            """)
+            lunar = cursor.rowcount
+
+            cursor.execute("DELETE FROM RaportOrar")
+            cursor.execute(f"""
+                INSERT INTO RaportOrar (ZiSaptamana, Ora, NrInterventii, DurataTotala)
+                SELECT {zi}, {ora}, COUNT(*), SUM(COALESCE(DurataInterventie, 0))
+                FROM RegistruInterventii
+                WHERE Ora IS NOT NULL
+                GROUP BY {zi}, {ora}
+            """)
+            orar = cursor.rowcount
+            conn.commit()
+
+        except Exception as e:
+            logging.error(f"Eroare la reconstruirea rapoartelor: {str(e)}")
+            conn.rollback()
+            return None
+
+    logging.info(f"Rapoarte reconstruite: {lunar} rânduri lunare, {orar} rânduri orare")
+    return {'lunar': lunar, 'orar': orar}
+
+
+def get_luni_raport():
+    """Lunile (AAAA-LL) care au intervenții, în ordine cronologică."""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return []
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT Luna FROM RaportLunar ORDER BY Luna")
+            return [row[0] for row in cursor.fetchall()]
+
+    except Exception as e:
+        logging.error(f"Eroare la citirea lunilor din rapoarte: {str(e)}")
+        return []
+
+
+def get_raport_lunar(luna_start=None, luna_end=None):
+    """
+    Intervențiile și durata lor pe lună, personal IT și status, pentru lunile
+    dintre `luna_start` și `luna_end` (AAAA-LL, inclusiv). PersonalITC lipsă este None.
+    """
+    conditii = []
+    params = []
+    if luna_start:
+        conditii.append("Luna >= ?")
+        params.append(luna_start)
+    if luna_end:
+        conditii.append("Luna <= ?")
+        params.append(luna_end)
+    where = f"WHERE {' AND '.join(conditii)}" if conditii else ""
+
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return []
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT Luna, PersonalITC, Status, NrInterventii, DurataTotala
+                FROM RaportLunar
+                {where}
+                ORDER BY Luna, PersonalITC, Status
+            """, params)
+            return [
+                {
+                    'Luna': luna,
+                    'PersonalITC': personal_itc or None,
+                    'Status': status,
+                    'NrInterventii': numar,
+                    'DurataTotala': durata
+                }
+                for luna, personal_itc, status, numar, durata in cursor.fetchall()
+            ]
+
+    except Exception as e:
+        logging.error(f"Eroare la citirea raportului lunar: {str(e)}")
+        return []
+
+
+def get_raport_orar():
+    """Intervențiile și durata lor pe zi a săptămânii (1 = luni) și oră, pentru tot registrul."""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return []
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT ZiSaptamana, Ora, NrInterventii, DurataTotala
+                FROM RaportOrar
+                ORDER BY ZiSaptamana, Ora
+            """)
+            return [
+                {'ZiSaptamana': zi, 'Ora': ora, 'NrInterventii': numar, 'DurataTotala': durata}
+                for zi, ora, numar, durata in cursor.fetchall()
+            ]
+
+    except Exception as e:
+        logging.error(f"Eroare la citirea raportului orar: {str(e)}")
+        return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agregatele rapoartelor registrului de intervenții.")
+    parser.add_argument('--rebuild', action='store_true', help="recalculează agregatele din tot registrul")
+    parser.add_argument('--de-la', default=None, help="prima lună afișată (AAAA-LL)")
+    parser.add_argument('--pana-la', default=None, help="ultima lună afișată (AAAA-LL)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.rebuild:
+        start = time.perf_counter()
+        scrise = reconstruieste_rapoarte()
+        if scrise is None:
+            raise SystemExit("Reconstruirea rapoartelor a eșuat")
+        print(f"{scrise['lunar']} rânduri lunare și {scrise['orar']} rânduri orare "
+              f"în {time.perf_counter() - start:.2f}s")
+    else:
+        for rand in get_raport_lunar(args.de_la, args.pana_la):
+            print(f"{rand['Luna']}  {rand['PersonalITC'] or '-':<30} {rand['Status']:<15} "
+                  f"{rand['NrInterventii']:6d} intervenții  {rand['DurataTotala']:8d} min")
@@ -0,0 +1,124 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+
+# Cheia de semnare a token-urilor; trebuie să fie aceeași pentru toate procesele aplicației
+SESSION_SECRET = os.getenv('SESSION_SECRET', '')
+# Lungimea minimă acceptată pentru SESSION_SECRET
+SESSION_SECRET_MIN_LENGTH = 32
+# Doar pentru dezvoltare: fără SESSION_SECRET, folosește o cheie generată per proces
+# (sesiunile nu supraviețuiesc repornirii și nu sunt recunoscute de alte instanțe)
+SESSION_SECRET_DEV = os.getenv('SESSION_SECRET_DEV', '0') == '1'
+# Dacă token-urile sunt verificate și în lista sesiunilor revocate (la deconectare)
+SESSION_REVOCATION = os.getenv('SESSION_REVOCATION', '1') == '1'
+
+_cheie = None
+_cheie_lock = threading.Lock()
+
+
+def _cheie_semnare():
+    global _cheie
+    if _cheie is None:
+        with _cheie_lock:
+            if _cheie is None:
+                if len(SESSION_SECRET) >= SESSION_SECRET_MIN_LENGTH:
+                    _cheie = SESSION_SECRET.encode()
+                elif not SESSION_SECRET and SESSION_SECRET_DEV:
+                    logging.warning("SESSION_SECRET nu este setat; SESSION_SECRET_DEV=1, folosim o cheie generată pentru acest proces")
+                    _cheie = secrets.token_bytes(32)
+                elif not SESSION_SECRET:
+                    raise RuntimeError(
+                        "SESSION_SECRET nu este setat (pentru dezvoltare locală se poate folosi SESSION_SECRET_DEV=1)"
+                    )
+                else:
+                    raise RuntimeError(
+                        f"SESSION_SECRET are {len(SESSION_SECRET)} caractere; minimul este {SESSION_SECRET_MIN_LENGTH}"
+                    )
+    return _cheie
+
+
+def verifica_configurare():
+    """Verifică la pornire cheia de semnare; ridică RuntimeError dacă lipsește sau este prea scurtă."""
+    _cheie_semnare()
+
+
+def _b64(date):
+    return base64.urlsafe_b64encode(date).rstrip(b'=').decode()
+
+
+def _din_b64(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _semnatura(continut):
+    return hmac.new(_cheie_semnare(), continut.encode(), hashlib.sha256).digest()
+
+
+def creeaza_token(principal, session_id, login_time, expira, persistent=False):
+    """
+    Creează token-ul de sesiune: datele utilizatorului (ID, username, serviciu, rol de șef),
+    ID-ul sesiunii și momentele autentificării și expirării, semnate cu HMAC-SHA256.
+    """
+    date = {
+        'i': principal['user_id'],
+        'u': principal['username'],
+        's': principal['serviciu'],
+        'm': 1 if principal['este_manager'] else 0,
+        'sid': session_id,
+        'iat': int(login_time.timestamp()),
+        'exp': int(expira.timestamp()),
+        'p': 1 if persistent else 0,
+    }
+    continut = _b64(json.dumps(date, separators=(',', ':'), ensure_ascii=False).encode())
+    return f"{continut}.{_b64(_semnatura(continut))}"
+
+
+def verifica_token(token):
+    """
+    Verifică semnătura și expirarea token-ului, fără acces la baza de date (doar lista
+    sesiunilor revocate, citită periodic). Returnează dicționarul sesiunii sau None.
+    """
+    try:
+        continut, semnatura = token.split('.')
+        if not hmac.compare_digest(_din_b64(semnatura), _semnatura(continut)):
+            logging.warning("Token de sesiune cu semnătură invalidă")
+            return None
+        date = json.loads(_din_b64(continut))
+    except Exception:
+        return None
+
+    if date['exp'] <= time.time():
+        return None
+    if SESSION_REVOCATION:
+        from database import get_sesiuni_revocate
+        if date['sid'] in get_sesiuni_revocate():
+            return None
+
+    return {
+        'user_id': date['i'],
+        'username': date['u'],
+        'serviciu': date['s'],
+        'este_manager': bool(date['m']),
+        'session_id': date['sid'],
+        'login_time': datetime.fromtimestamp(date['iat']),
+        'expira': datetime.fromtimestamp(date['exp']),
+        'persistent': bool(date['p']),
+    }
+
+
+def revoca_token(token):
+    """Revocă sesiunea token-ului (la deconectare), până la expirarea lui."""
+    if not SESSION_REVOCATION:
+        return False
+    sesiune = verifica_token(token)
+    if not sesiune:
+        return False
+    from database import revoca_sesiune
+    return revoca_sesiune(sesiune['session_id'], sesiune['expira'])
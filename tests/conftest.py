@@ -0,0 +1,56 @@
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# Cheia de semnare este citită la importul session_tokens
+os.environ.setdefault('SESSION_SECRET', 'cheie-de-test-' + 'x' * 32)
+
+import cautare
+import database
+from backends import SqliteBackend, set_backend
+
+
+@pytest.fixture
+def registru():
+    """Un registru gol într-o bază SQLite din memorie, cu toate migrările aplicate."""
+    set_backend(SqliteBackend(':memory:'))
+    database.invalidate_statistici()
+    database.invalidate_principal()
+    database.invalidate_username_map()
+    database._sesiuni_revocate_cache.invalidate()
+    cautare._stare_index_cache.invalidate()
+    yield
+    set_backend(None)
+
+
+def adauga(data, ora='10:00', personal_itc='ana.pop', solicitare='Verificare imprimantă',
+           status='In Asteptare', durata=15, nr_crt=None, solicitant='Contabilitate', observatii=None):
+    """Inserează o intervenție direct în registru și returnează ID-ul ei."""
+    if isinstance(data, str):
+        data = date.fromisoformat(data)
+    with database.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO RegistruInterventii
+            (NrCrt, DataInterventie, Zi, Solicitant, Solicitare, Ora, DurataInterventie,
+             PersonalITC, Observatii, ServiciuID, Status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+            """,
+            (nr_crt, data.isoformat(), 'Luni', solicitant, solicitare, ora, durata,
+             personal_itc, observatii, status)
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+
+def interogheaza(query, params=()):
+    with database.db_connection() as conn:
+        return conn.execute(query, params).fetchall()
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+
+import database
+from conftest import adauga, interogheaza
+
+
+def _nr_crt(id_interventie):
+    return interogheaza("SELECT NrCrt FROM RegistruInterventii WHERE ID = ?", (id_interventie,))[0][0]
+
+
+def test_rezultatele_per_nrcrt(registru):
+    in_asteptare = _nr_crt(adauga('2024-01-10'))
+    scris_mic = _nr_crt(adauga('2024-01-11', status='in asteptare'))
+    aprobat = _nr_crt(adauga('2024-01-12', status='Aprobat'))
+    respins = _nr_crt(adauga('2024-01-13', status='Respins'))
+
+    rezultate = database.aproba_interventie(
+        [in_asteptare, scris_mic, aprobat, respins, 999, in_asteptare], 'sef.birou', 'Aprobat'
+    )
+
+    assert rezultate == {
+        in_asteptare: 'actualizat',
+        scris_mic: 'actualizat',
+        aprobat: 'deja_procesat',
+        respins: 'deja_procesat',
+        999: 'negasit',
+    }
+    randuri = interogheaza(
+        "SELECT NrCrt, Status, AprobatDe, DataAprobare IS NOT NULL FROM RegistruInterventii ORDER BY NrCrt"
+    )
+    assert randuri == [
+        (in_asteptare, 'Aprobat', 'sef.birou', 1),
+        (scris_mic, 'Aprobat', 'sef.birou', 1),
+        (aprobat, 'Aprobat', None, 0),
+        (respins, 'Respins', None, 0),
+    ]
+
+
+def test_a_doua_procesare_nu_suprascrie_decizia(registru):
+    nr_crt = _nr_crt(adauga('2024-01-10'))
+
+    assert database.aproba_interventie([nr_crt], 'sef.birou', 'Respins') == {nr_crt: 'actualizat'}
+    assert database.aproba_interventie([nr_crt], 'alt.sef', 'Aprobat') == {nr_crt: 'deja_procesat'}
+    assert interogheaza("SELECT Status, AprobatDe FROM RegistruInterventii") == [('Respins', 'sef.birou')]
+
+
+def test_loturi_mai_mari_decat_o_interogare(registru, monkeypatch):
+    monkeypatch.setattr(database, '_LOT_APROBARE', 3)
+    nr_crts = [_nr_crt(adauga('2024-02-01')) for _ in range(8)]
+    database.aproba_interventie(nr_crts[:2], 'sef.birou', 'Aprobat')
+
+    rezultate = database.aproba_interventie(nr_crts, 'sef.birou', 'Aprobat')
+
+    assert [rezultate[nr] for nr in nr_crts] == ['deja_procesat'] * 2 + ['actualizat'] * 6
+
+
+def test_lista_goala(registru):
+    assert database.aproba_interventie([], 'sef.birou', 'Aprobat') == {}
+
+
+def test_fara_conexiune_toate_sunt_eroare(registru, monkeypatch):
+    nr_crt = _nr_crt(adauga('2024-01-10'))
+
+    @contextmanager
+    def fara_conexiune():
+        yield None
+
+    monkeypatch.setattr(database, 'db_connection', fara_conexiune)
+    assert database.aproba_interventie([nr_crt, 5], 'sef.birou', 'Aprobat') == {nr_crt: 'eroare', 5: 'eroare'}
+
+
+def test_eroarea_anuleaza_tot_lotul(registru, monkeypatch):
+    monkeypatch.setattr(database, '_LOT_APROBARE', 1)
+    nr_crts = [_nr_crt(adauga('2024-01-10')) for _ in range(2)]
+    # Al doilea lot eșuează după ce primul a fost deja actualizat în tranzacție
+    with database.db_connection() as conn:
+        conn.execute("CREATE TRIGGER EsecAprobare BEFORE UPDATE ON RegistruInterventii "
+                     f"WHEN OLD.NrCrt = {nr_crts[1]} BEGIN SELECT RAISE(ABORT, 'esec'); END")
+        conn.commit()
+
+    rezultate = database.aproba_interventie(nr_crts, 'sef.birou', 'Aprobat')
+
+    assert rezultate == {nr: 'eroare' for nr in nr_crts}
+    assert interogheaza("SELECT DISTINCT Status FROM RegistruInterventii") == [('In Asteptare',)]
+
+
+def test_statisticile_sunt_recalculate_dupa_aprobare(registru):
+    nr_crts = [_nr_crt(adauga('2024-01-10')) for _ in range(3)]
+    assert database.get_statistici()['in_asteptare'] == 3
+
+    database.aproba_interventie(nr_crts[:2], 'sef.birou', 'Aprobat')
+
+    statistici = database.get_statistici()
+    assert (statistici['aprobate'], statistici['in_asteptare']) == (2, 1)
@@ -0,0 +1,29 @@
+import export
+from conftest import adauga
+
+
+def test_exportul_csv_pastreaza_formatul_istoric(registru, tmp_path):
+    adauga('2024-01-15', ora='09:05', solicitant='Secretariat', solicitare='Schimbare toner; etaj 2',
+           durata=30, observatii='țeavă')
+    adauga('2024-01-15', ora=None, personal_itc=None, solicitare='Fără oră', durata=None)
+    adauga('2024-01-16', solicitare='Lot următor')
+    path = tmp_path / 'registru.csv'
+
+    assert export.exporta('csv', path, chunk_size=2) == 3
+
+    assert path.read_bytes().decode('cp1250').split('\r\n') == [
+        'NrCrt;DataInterventie;Zi;Solicitant;Solicitare;Ora;DurataInterventiei;PersonalITC;Observatii',
+        '1;15.01.2024;L;Secretariat;"Schimbare toner; etaj 2";09:05;30.0;ana.pop;ţeavă',
+        '2;15.01.2024;L;Contabilitate;Fără oră;;;;',
+        '3;16.01.2024;L;Contabilitate;Lot următor;10:00;15.0;ana.pop;',
+        '',
+    ]
+
+
+def test_exportul_cu_filtre(registru, tmp_path):
+    adauga('2024-01-15', personal_itc='ana.pop')
+    adauga('2024-01-16', personal_itc='dan.ionescu')
+    path = tmp_path / 'registru.csv'
+
+    assert export.exporta('csv', path, filtre={'personal_itc': 'dan.ionescu'}) == 1
+    assert path.read_text(encoding='cp1250').count('dan.ionescu') == 1
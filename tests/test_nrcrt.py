@@ -0,0 +1,88 @@
+from datetime import date
+
+import database
+from conftest import adauga, interogheaza
+
+
+def _numerotare():
+    """NrCrt-urile în ordinea (DataInterventie, ID)."""
+    return [row[0] for row in interogheaza("SELECT NrCrt FROM RegistruInterventii ORDER BY DataInterventie, ID")]
+
+
+def _contor():
+    return interogheaza("SELECT Ultimul, UltimaData, RenumerotareDeLa FROM AlocareNrCrt WHERE ID = 1")[0]
+
+
+def test_inserarile_primesc_numere_consecutive(registru):
+    for zi in range(1, 6):
+        assert database.adauga_interventie(
+            date(2024, 4, zi), 'Luni', 'Secretariat', 'Resetare parolă', '11:00', 10, 'ana.pop', '', 1
+        )
+
+    assert _numerotare() == [1, 2, 3, 4, 5]
+    assert _contor() == (5, date(2024, 4, 5), None)
+
+
+def test_nrcrt_explicit_mai_mare_muta_contorul(registru):
+    adauga('2024-04-01')
+    adauga('2024-04-02', nr_crt=10)
+    adauga('2024-04-03')
+
+    assert _numerotare() == [1, 10, 11]
+    assert _contor()[0] == 11
+
+
+def test_tranzactia_anulata_nu_consuma_numarul(registru):
+    adauga('2024-04-01')
+    with database.db_connection() as conn:
+        conn.execute(
+            "INSERT INTO RegistruInterventii (DataInterventie, Solicitare, Status) VALUES (?, ?, ?)",
+            ('2024-04-02', 'Anulată', 'In Asteptare')
+        )
+        conn.rollback()
+    adauga('2024-04-03')
+
+    assert _numerotare() == [1, 2]
+
+
+def test_inserarea_in_trecut_marcheaza_renumerotarea(registru):
+    for zi in (1, 2, 3, 4):
+        adauga(date(2024, 4, zi))
+    adauga('2024-04-02')
+
+    # Noua intervenție primește numărul următor, dar numerotarea nu mai urmează data
+    assert _numerotare() == [1, 2, 5, 3, 4]
+    assert _contor() == (5, date(2024, 4, 4), date(2024, 4, 2))
+
+    # Este renumerotată doar coada de la 2024-04-02; scrise doar rândurile care se schimbă
+    assert database.reorder_nrcrt() == 3
+    assert _numerotare() == [1, 2, 3, 4, 5]
+    assert _contor() == (5, date(2024, 4, 4), None)
+    assert database.reorder_nrcrt() == 0
+
+
+def test_stergerea_si_schimbarea_datei_sunt_reparate(registru):
+    ids = [adauga(date(2024, 4, zi)) for zi in range(1, 7)]
+    with database.db_connection() as conn:
+        conn.execute("DELETE FROM RegistruInterventii WHERE ID = ?", (ids[1],))
+        conn.execute("UPDATE RegistruInterventii SET DataInterventie = ? WHERE ID = ?", ('2024-04-10', ids[3]))
+        conn.commit()
+
+    assert _contor()[2] == date(2024, 4, 2)
+    database.reorder_nrcrt()
+
+    assert _numerotare() == [1, 2, 3, 4, 5]
+    assert interogheaza("SELECT NrCrt FROM RegistruInterventii WHERE ID = ?", (ids[3],)) == [(5,)]
+    assert _contor() == (5, date(2024, 4, 10), None)
+
+
+def test_renumerotarea_completa(registru):
+    for zi in (5, 3, 1):
+        adauga(date(2024, 4, zi))
+    with database.db_connection() as conn:
+        conn.execute("UPDATE AlocareNrCrt SET RenumerotareDeLa = NULL")
+        conn.commit()
+
+    assert database.reorder_nrcrt() == 0
+    assert database.reorder_nrcrt(complet=True) == 2
+    assert _numerotare() == [1, 2, 3]
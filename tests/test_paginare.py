@@ -0,0 +1,200 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import cautare
+import database
+from conftest import adauga, interogheaza
+
+
+def _randuri(cadru):
+    """Rândurile unei pagini ca dicționare: DataInterventie ca dată, valorile lipsă ca None."""
+    randuri = cadru.astype(object).where(cadru.notna(), None).to_dict('records')
+    for rand in randuri:
+        rand['DataInterventie'] = rand['DataInterventie'].date()
+    return randuri
+
+
+def _ordine_registru(rand):
+    # DataInterventie DESC, Ora DESC (rândurile fără oră la sfârșitul zilei), NrCrt DESC
+    return (rand['DataInterventie'], rand['Ora'] is not None, rand['Ora'] or '', rand['NrCrt'])
+
+
+def _toate_paginile(page_size, filtre=None):
+    pagini = []
+    cursor = None
+    while True:
+        pagina = database.get_interventii_pagina(page_size=page_size, cursor=cursor, filtre=filtre)
+        pagini.append(_randuri(pagina['rows']))
+        cursor = pagina['next_cursor']
+        if cursor is None:
+            return pagini
+
+
+@pytest.fixture
+def registru_populat(registru):
+    # Zile cu mai multe intervenții la aceeași oră și intervenții fără oră
+    for zi in range(1, 8):
+        for ora in ('09:00', '09:00', '14:30', None):
+            adauga(date(2024, 3, zi), ora=ora, personal_itc='ana.pop' if zi % 2 else 'dan.ionescu')
+    adauga('2024-03-04', ora=None, solicitare='Configurare rețea', observatii='switch etaj 2')
+    adauga('2024-02-28', ora='08:15', solicitare='Instalare imprimantă Lexmark')
+
+
+@pytest.mark.parametrize('page_size', [1, 3, 5, 30, 100])
+def test_paginarea_parcurge_registrul_o_singura_data_in_ordine(registru_populat, page_size):
+    pagini = _toate_paginile(page_size)
+    randuri = [rand for pagina in pagini for rand in pagina]
+
+    assert all(len(pagina) <= page_size for pagina in pagini)
+    assert len(randuri) == 30
+    assert len({rand['NrCrt'] for rand in randuri}) == 30
+    assert randuri == sorted(randuri, key=_ordine_registru, reverse=True)
+
+
+def test_ultima_pagina_nu_are_cursor(registru_populat):
+    pagina = database.get_interventii_pagina(page_size=30, include_total=True)
+    assert len(pagina['rows']) == 30
+    assert pagina['next_cursor'] is None
+    assert pagina['total'] == 30
+
+
+def test_registru_gol(registru):
+    pagina = database.get_interventii_pagina(page_size=10, include_total=True)
+    assert pagina['rows'].empty
+    assert (pagina['next_cursor'], pagina['total']) == (None, 0)
+
+
+def test_pagina_este_un_cadru_tipizat(registru_populat):
+    adauga('2024-03-08', ora='11:05', durata=None)
+    rows = database.get_interventii_pagina(page_size=3)['rows']
+
+    assert str(rows['DataInterventie'].dtype).startswith('datetime64')
+    for coloana in ('Zi', 'PersonalITC', 'Status', 'Ora'):
+        assert rows[coloana].dtype == 'category'
+    assert rows['DurataInterventie'].dtype == 'Int32'
+    assert rows['DurataInterventie'].tolist() == [pd.NA, 15, 15]
+    assert rows['Ora'].tolist() == ['11:05:00', '14:30:00', '09:00:00']
+
+
+@pytest.mark.parametrize('filtre, asteptate', [
+    ({'personal_itc': 'dan.ionescu'}, 12),
+    ({'data_start': date(2024, 3, 3), 'data_end': date(2024, 3, 4)}, 9),
+    ({'data_start': date(2024, 3, 7)}, 4),
+    ({'data_end': date(2024, 2, 29)}, 1),
+    ({'personal_itc': 'ana.pop', 'data_start': date(2024, 3, 1), 'data_end': date(2024, 3, 3)}, 8),
+])
+def test_filtrele_se_aplica_pe_toate_paginile(registru_populat, filtre, asteptate):
+    randuri = [rand for pagina in _toate_paginile(2, filtre) for rand in pagina]
+    total = database.get_interventii_pagina(page_size=2, include_total=True, filtre=filtre)['total']
+
+    assert len(randuri) == total == asteptate
+    if 'personal_itc' in filtre:
+        assert {rand['PersonalITC'] for rand in randuri} == {filtre['personal_itc']}
+    if 'data_start' in filtre:
+        assert min(rand['DataInterventie'] for rand in randuri) >= filtre['data_start']
+    if 'data_end' in filtre:
+        assert max(rand['DataInterventie'] for rand in randuri) <= filtre['data_end']
+    assert randuri == sorted(randuri, key=_ordine_registru, reverse=True)
+
+
+def test_cautarea_foloseste_indexul_dupa_construire(registru_populat):
+    # Până la prima construire a indexului, căutarea se face cu LIKE (cu diacritice exacte)
+    assert database.get_interventii_pagina(include_total=True, filtre={'text': 'retea'})['total'] == 0
+    assert database.get_interventii_pagina(include_total=True, filtre={'text': 'rețea'})['total'] == 1
+
+    cautare.actualizeaza_index()
+    # Indexul ignoră diacriticele și potrivește prefixe de cuvânt
+    assert database.get_interventii_pagina(include_total=True, filtre={'text': 'retea'})['total'] == 1
+    assert database.get_interventii_pagina(include_total=True, filtre={'text': 'imprim lexm'})['total'] == 1
+    assert database.get_interventii_pagina(include_total=True, filtre={'text': 'imprimanta'})['total'] == 29
+
+
+def test_cautarea_fara_termeni_indexabili_cauta_si_in_observatii(registru_populat):
+    cautare.actualizeaza_index()
+    # Un singur caracter nu este indexat: se folosește LIKE, inclusiv pe Observatii
+    rezultat = database.get_interventii_pagina(include_total=True, filtre={'text': '2'})
+    assert rezultat['total'] == 1
+    assert rezultat['rows']['Observatii'].tolist() == ['switch etaj 2']
+
+
+def test_indexul_preia_modificarile_incremental(registru_populat):
+    cautare.actualizeaza_index()
+    nou = adauga('2024-03-08', solicitare='Schimbare toner Samsung')
+    assert cautare.cauta('toner') == []
+
+    assert cautare.actualizeaza_index() == 1
+    assert [r['ID'] for r in cautare.cauta('toner samsung')] == [nou]
+
+    with database.db_connection() as conn:
+        conn.execute("DELETE FROM RegistruInterventii WHERE ID = ?", (nou,))
+        conn.commit()
+    cautare.actualizeaza_index()
+    assert cautare.cauta('toner') == []
+
+
+def test_reconstruirea_indexului_inlocuieste_indexul_vechi(registru_populat):
+    cautare.actualizeaza_index()
+    inainte = cautare.cauta('imprimanta', limit=None)
+
+    assert cautare.actualizeaza_index(complet=True) == 30
+    assert cautare.cauta('imprimanta', limit=None) == inainte
+    with database.db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM IndexCautareNou").fetchone()[0] == 0
+
+
+def test_indexul_nu_este_actualizat_cat_timp_alt_proces_detine_blocarea(registru_populat):
+    with database.db_connection() as conn:
+        conn.execute(
+            "INSERT INTO Blocari (Resursa, Detinator, ExpiraLa) VALUES (?, 'alt-proces', julianday('now') + 1)",
+            (cautare.BLOCARE_INDEX,)
+        )
+        conn.commit()
+    assert cautare.actualizeaza_index() is None
+    assert interogheaza("SELECT Versiune FROM IndexCautareStare") == [(None,)]
+
+    # Blocarea unui proces oprit expiră și poate fi preluată
+    with database.db_connection() as conn:
+        conn.execute("UPDATE Blocari SET ExpiraLa = julianday('now') - 1")
+        conn.commit()
+    assert cautare.actualizeaza_index() == 30
+    assert interogheaza("SELECT COUNT(*) FROM Blocari") == [(0,)]
+
+
+def test_starea_indexului_este_recitita_dupa_expirarea_cacheului(registru_populat):
+    cautare.actualizeaza_index()
+    assert cautare.index_disponibil()
+
+    # Alt proces sau o migrare resetează indexul
+    with database.db_connection() as conn:
+        conn.execute("UPDATE IndexCautareStare SET Versiune = NULL")
+        conn.execute("DELETE FROM IndexCautare")
+        conn.commit()
+    assert cautare.index_disponibil()
+
+    cautare._stare_index_cache.invalidate()
+    assert not cautare.index_disponibil()
+    assert database.get_interventii_pagina(include_total=True, filtre={'text': 'rețea'})['total'] == 1
+
+
+def test_coada_de_aprobare_pagineaza_doar_interventiile_in_asteptare(registru):
+    for zi in range(1, 11):
+        adauga(date(2024, 5, zi), status='In Asteptare')
+        adauga(date(2024, 5, zi), status='Aprobat')
+    adauga('2024-05-03', status='in asteptare')
+
+    cursor = None
+    randuri = []
+    while True:
+        pagina = database.get_interventii_in_asteptare(page_size=4, cursor=cursor, include_total=True)
+        assert pagina['total'] == 11
+        randuri.extend(_randuri(pagina['rows']))
+        cursor = pagina['next_cursor']
+        if cursor is None:
+            break
+
+    assert len(randuri) == 11
+    assert all(rand['Status'] in database.STATUSURI_IN_ASTEPTARE for rand in randuri)
+    chei = [(rand['DataInterventie'], rand['ID']) for rand in randuri]
+    assert chei == sorted(chei)
@@ -0,0 +1,120 @@
+import database
+import rapoarte
+from conftest import adauga, interogheaza
+
+
+def _agregate():
+    return (
+        interogheaza("SELECT * FROM RaportLunar ORDER BY Luna, PersonalITC, Status"),
+        interogheaza("SELECT * FROM RaportOrar ORDER BY ZiSaptamana, Ora"),
+    )
+
+
+def _agregate_din_registru():
+    """Agregatele calculate direct din registru, ca în reconstruieste_rapoarte."""
+    lunar = interogheaza("""
+        SELECT strftime('%Y-%m', DataInterventie), COALESCE(PersonalITC, ''), Status,
+               COUNT(*), SUM(COALESCE(DurataInterventie, 0))
+        FROM RegistruInterventii
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+    """)
+    orar = interogheaza("""
+        SELECT (CAST(strftime('%w', DataInterventie) AS INTEGER) + 6) % 7 + 1,
+               CAST(strftime('%H', Ora) AS INTEGER), COUNT(*), SUM(COALESCE(DurataInterventie, 0))
+        FROM RegistruInterventii
+        WHERE Ora IS NOT NULL
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """)
+    return lunar, orar
+
+
+def _populeaza():
+    adauga('2024-01-15', ora='09:10', personal_itc='ana.pop', durata=30)    # luni
+    adauga('2024-01-15', ora='09:45', personal_itc='ana.pop', durata=15)
+    adauga('2024-01-20', ora='14:00', personal_itc='dan.ionescu', durata=60)  # sâmbătă
+    adauga('2024-02-01', ora=None, personal_itc=None, durata=None)
+    return adauga('2024-02-05', ora='16:20', personal_itc='dan.ionescu', durata=45, status='Aprobat')
+
+
+def test_inserarile_actualizeaza_agregatele(registru):
+    _populeaza()
+
+    lunar, orar = _agregate()
+    assert lunar == [
+        ('2024-01', 'ana.pop', 'In Asteptare', 2, 45),
+        ('2024-01', 'dan.ionescu', 'In Asteptare', 1, 60),
+        ('2024-02', '', 'In Asteptare', 1, 0),
+        ('2024-02', 'dan.ionescu', 'Aprobat', 1, 45),
+    ]
+    assert orar == [(1, 9, 2, 45), (1, 16, 1, 45), (6, 14, 1, 60)]
+
+
+def test_aprobarea_muta_interventiile_intre_statusuri(registru):
+    _populeaza()
+    nr_crts = [row[0] for row in interogheaza(
+        "SELECT NrCrt FROM RegistruInterventii WHERE PersonalITC = 'ana.pop' ORDER BY NrCrt"
+    )]
+    orar_inainte = _agregate()[1]
+
+    database.aproba_interventie(nr_crts[:1], 'sef.birou', 'Aprobat')
+    database.aproba_interventie(nr_crts[1:], 'sef.birou', 'Respins')
+
+    lunar, orar = _agregate()
+    assert [rand for rand in lunar if rand[1] == 'ana.pop'] == [
+        ('2024-01', 'ana.pop', 'Aprobat', 1, 30),
+        ('2024-01', 'ana.pop', 'Respins', 1, 15),
+    ]
+    assert orar == orar_inainte
+    assert _agregate() == _agregate_din_registru()
+
+
+def test_modificarile_si_stergerile_raman_consistente(registru):
+    ultimul = _populeaza()
+    with database.db_connection() as conn:
+        conn.execute(
+            "UPDATE RegistruInterventii SET DataInterventie = ?, Ora = ?, DurataInterventie = ?, "
+            "PersonalITC = ? WHERE ID = ?",
+            ('2024-03-03', '08:00', 5, 'ana.pop', ultimul)
+        )
+        conn.execute("DELETE FROM RegistruInterventii WHERE PersonalITC = 'dan.ionescu'")
+        conn.commit()
+
+    assert _agregate() == _agregate_din_registru()
+    # Grupurile golite sunt eliminate, nu păstrate cu zero
+    assert all(rand[3] > 0 for rand in _agregate()[0])
+    assert all(rand[2] > 0 for rand in _agregate()[1])
+
+
+def test_reconstruirea_da_aceleasi_agregate(registru):
+    _populeaza()
+    inainte = _agregate()
+    with database.db_connection() as conn:
+        conn.execute("DELETE FROM RaportLunar")
+        conn.execute("UPDATE RaportOrar SET NrInterventii = 99")
+        conn.commit()
+
+    assert rapoarte.reconstruieste_rapoarte() == {'lunar': 4, 'orar': 3}
+    assert _agregate() == inainte
+
+
+def test_citirea_rapoartelor(registru):
+    _populeaza()
+
+    assert rapoarte.get_luni_raport() == ['2024-01', '2024-02']
+    lunar = rapoarte.get_raport_lunar('2024-02', '2024-02')
+    assert {(rand['PersonalITC'], rand['Status']) for rand in lunar} == {
+        (None, 'In Asteptare'), ('dan.ionescu', 'Aprobat')
+    }
+    assert sum(rand['NrInterventii'] for rand in rapoarte.get_raport_orar()) == 4
+
+
+def test_statisticile_fara_filtre_vin_din_agregate(registru):
+    _populeaza()
+    fara_filtre = database.get_statistici()
+    cu_filtru = database.get_statistici({'data_start': '2000-01-01'})
+
+    assert fara_filtre['total'] == cu_filtru['total'] == 5
+    for cheie in ('aprobate', 'in_asteptare', 'respinse', 'durata_totala'):
+        assert fara_filtre[cheie] == cu_filtru[cheie]
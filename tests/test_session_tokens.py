@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import session_tokens
+from session_tokens import creeaza_token, verifica_token, revoca_token, _b64, _din_b64
+
+PRINCIPAL = {'user_id': 7, 'username': 'ana.pop', 'serviciu': 'IT', 'este_manager': True}
+
+
+def _token(expira_peste=timedelta(hours=1), **kwargs):
+    acum = datetime.now().replace(microsecond=0)
+    return creeaza_token(PRINCIPAL, kwargs.pop('session_id', 'sesiune-1'), acum, acum + expira_peste, **kwargs)
+
+
+@pytest.fixture
+def cheie(monkeypatch):
+    """Resetează cheia procesului, ca testul să poată schimba configurarea."""
+    monkeypatch.setattr(session_tokens, '_cheie', None)
+    return monkeypatch
+
+
+def test_token_valid_restaureaza_sesiunea(registru):
+    sesiune = verifica_token(_token(persistent=True))
+
+    assert sesiune['user_id'] == 7
+    assert sesiune['username'] == 'ana.pop'
+    assert sesiune['serviciu'] == 'IT'
+    assert sesiune['este_manager'] is True
+    assert sesiune['session_id'] == 'sesiune-1'
+    assert sesiune['persistent'] is True
+    assert sesiune['expira'] - sesiune['login_time'] == timedelta(hours=1)
+
+
+def test_continutul_modificat_este_respins(registru):
+    continut, semnatura = _token().split('.')
+    date = json.loads(_din_b64(continut))
+    date['m'] = 1
+    date['u'] = 'altcineva'
+    falsificat = _b64(json.dumps(date, separators=(',', ':')).encode())
+
+    assert verifica_token(f"{falsificat}.{semnatura}") is None
+
+
+@pytest.mark.parametrize('token', ['', 'fara-punct', 'a.b.c', '!!!.???'])
+def test_token_invalid(registru, token):
+    assert verifica_token(token) is None
+
+
+def test_semnatura_altei_chei_este_respinsa(registru, cheie):
+    token = _token()
+    cheie.setattr(session_tokens, '_cheie', None)
+    cheie.setattr(session_tokens, 'SESSION_SECRET', 'alta-cheie-' + 'y' * 32)
+
+    assert verifica_token(token) is None
+
+
+def test_token_expirat(registru):
+    assert verifica_token(_token(expira_peste=timedelta(seconds=-1))) is None
+
+
+def test_token_revocat(registru):
+    token = _token(session_id='sesiune-revocata')
+    alt_token = _token(session_id='sesiune-activa')
+
+    assert revoca_token(token) is True
+    assert verifica_token(token) is None
+    assert verifica_token(alt_token) is not None
+
+
+def test_fara_verificarea_revocarii(registru, monkeypatch):
+    monkeypatch.setattr(session_tokens, 'SESSION_REVOCATION', False)
+    token = _token()
+
+    assert revoca_token(token) is False
+    assert verifica_token(token) is not None
+
+
+def test_cheia_lipsa_opreste_pornirea(cheie):
+    cheie.setattr(session_tokens, 'SESSION_SECRET', '')
+    cheie.setattr(session_tokens, 'SESSION_SECRET_DEV', False)
+
+    with pytest.raises(RuntimeError, match='SESSION_SECRET nu este setat'):
+        session_tokens.verifica_configurare()
+
+
+def test_cheia_prea_scurta_opreste_pornirea(cheie):
+    cheie.setattr(session_tokens, 'SESSION_SECRET', 'scurta')
+    # Modul de dezvoltare nu acceptă o cheie setată greșit
+    cheie.setattr(session_tokens, 'SESSION_SECRET_DEV', True)
+
+    with pytest.raises(RuntimeError, match='minimul este 32'):
+        session_tokens.verifica_configurare()
+
+
+def test_cheia_generata_doar_in_modul_de_dezvoltare(cheie):
+    cheie.setattr(session_tokens, 'SESSION_SECRET', '')
+    cheie.setattr(session_tokens, 'SESSION_SECRET_DEV', True)
+
+    session_tokens.verifica_configurare()
+    assert len(session_tokens._cheie) == 32
@@ -1,24 +1,12 @@
 import logging
-import os
 from datetime import datetime
 import re
 
 # Configurare logging
 def setup_logging():
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    log_file = os.path.join(log_dir, f"app_{datetime.now().strftime('%Y%m%d')}.log")
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
+    """Configurează logging-ul aplicației (vezi logging_config.setup_logging)."""
+    from logging_config import setup_logging as configureaza
+    configureaza()
     return logging.getLogger(__name__)
 
 # Funcții pentru validarea input-ului
@@ -69,42 +57,12 @@ def normalize_username(username):
     if '.' in username:
         return [username, username.replace('.', '')]
     
-    # Dacă username-ul nu conține punct, încercăm să găsim locul unde ar trebui să fie
-    # Verificăm dacă există în baza de date cu punct
-    import pyodbc
-    import configparser
-    from pathlib import Path
+    # Dacă username-ul nu conține punct, căutăm forma lui din baza de date
+    # (rezolvarea se face din harta username-urilor păstrată în memorie)
+    from database import resolve_username
     
-    try:
-        config = configparser.ConfigParser()
-        config_path = Path(__file__).parent / 'config.ini'
-        config.read(config_path)
-        
-        conn_str = (
-            "DRIVER={SQL Server};"
-            f"SERVER={config['MySQL']['host']},{config['MySQL']['port']};"
-            f"DATABASE={config['MySQL']['database']};"
-            f"UID={config['MySQL']['user']};"
-            f"PWD={config['MySQL']['password']};"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-        
-        # Căutăm username-ul în baza de date
-        cursor.execute("SELECT NumeUtilizator FROM Utilizatori WHERE NumeUtilizator LIKE ?", (f"%{username}%",))
-        result = cursor.fetchone()
-        
-        if result:
-            db_username = result[0]
-            return [username, db_username]
-        
-        return [username]
-        
-    except Exception as e:
-        print(f"Eroare la verificarea username-ului: {str(e)}")
-        return [username]
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
+    db_username = resolve_username(username)
+    if db_username:
+        return [username, db_username]
+    
+    return [username]